@@ -1,74 +1,295 @@
-﻿import networkx as nx
-import matplotlib.pyplot as plt
-from networkx.classes.graph import Graph
+﻿import contextlib
+import gc
+import heapq
+import itertools
+import sys
+from collections import OrderedDict
+from datetime import date, timedelta
+
+# networkx, matplotlib and argparse are imported where they are used: together they take
+# most of a second to load, which importing the module should not have to pay for
+from compact_graph import CompactDiGraph, CompactTaskDetails
+from deadlines import DeadlineIndex, format_deadline, to_date
+from errors import CycleError
+from instrumentation import Metrics, profile_call
+from loaders import load_tasks
+from persistence import checkpoint, open_journaled
+from reachability import REACHABILITY_LIMIT, ReachabilityIndex
+
+SNAPSHOT_PATH = "tasks.snapshot"
+JOURNAL_PATH = "tasks.journal"
+_KEEP = object()  # update_task: leave this field as it is
+_MISSING = object()  # _cached: nothing memoized for this key yet
+PRUNE_SEARCH_LIMIT = 32  # delete_task: dependencies looked at for each task's reassigned edges
+QUERY_CACHE_SIZE = 256  # memoized answers to queries with arguments (ancestors, due_before, ...)
+
+
+def check_deadline(year, month, day, today=None):
+    # For deadlines typed in by hand: a real calendar date, and not one that has already passed
+    if not (str(year).isdigit() and str(month).isdigit() and str(day).isdigit()):
+        raise ValueError("Deadline year, month and day must be numbers.")
+    try:
+        deadline = date(int(year), int(month), int(day))
+    except ValueError:
+        raise ValueError(f"{year}-{month}-{day} is not a valid date.") from None
+    today = today or date.today()
+    if deadline < today:
+        raise ValueError(f"Current date is {today:%d/%m/%Y}, a deadline cannot be before it.")
+    return deadline
+
+
+def ask_priority(task):
+    while True:
+        priority = input(f"Enter a new priority for task '{task}' [0, 10]: ").strip()
+        if priority.isdigit() and 0 <= int(priority) <= 10:
+            return int(priority)
+        print("Error: Priority must be a number between 0 and 10. Please enter a valid value.")
 
 
-class TaskScheduler:
-    def __init__(self):
-        self.graph = nx.DiGraph()
-        self.task_details = {}
+def ask_deadline(task):
+    while True:
+        year = input(f"{task} [year] deadline is: ").strip()
+        month = input(f"{task} [month] deadline is: ").strip()
+        day = input(f"{task} [day] deadline is: ").strip()
+        try:
+            return check_deadline(year, month, day)
+        except ValueError as e:
+            print(f"Error: {e} Enter a valid deadline.")
 
-    def add_task(self, task, dependencies=None, priority=None, deadline=None, description=None):
+
+class TaskScheduler:
+    def __init__(self, backend="networkx"):
+        if backend == "networkx":
+            import networkx as nx
+            self.graph = nx.DiGraph()
+            self.task_details = {}
+        elif backend == "compact":
+            # Interned ids + CSR arrays + typed columns, for graphs too big for dict-of-dicts
+            self.graph = CompactDiGraph()
+            self.task_details = CompactTaskDetails(self.graph)
+        else:
+            raise ValueError(f"Unknown backend '{backend}', expected 'networkx' or 'compact'.")
+        # Topological order kept up to date by every mutation (Pearce-Kelly).
+        # None means unknown; it is rebuilt lazily from the graph on next read.
+        self._order = None
+        self._position = {}
+        self._holes = 0
+        # Transitive closure for depends_on & co, built on first query (see reachability.py)
+        self._reachability = None
+        # Tasks sorted by deadline for due_before & co, built on first query (see deadlines.py)
+        self._deadlines = None
+        # Write-ahead journal (persistence.Journal); every successful mutation is appended to it
+        self.journal = None
+        # Set while a transaction() is open: undo steps, and journal records held back until commit
+        self._undo = None
+        self._pending_log = None
+        # instrumentation.Metrics while enable_metrics() is on; off, nothing is wrapped or counted
+        self.metrics = None
+        # Bumped by every mutation. Derived results (orders, rankings, query answers) are memoized
+        # against it, so repeated reads of an unchanged graph skip the work; see _cached.
+        self.version = 0
+        self._cache_version = 0
+        self._results = {}
+        self._queries = OrderedDict()  # least recently used first
+
+    def enable_metrics(self, methods=None):
+        # Counts and times calls to the public methods (see instrumentation.py); returns the Metrics
+        if self.metrics is None:
+            self.metrics = (Metrics() if methods is None else Metrics(methods)).attach(self)
+        return self.metrics
+
+    def disable_metrics(self):
+        if self.metrics is not None:
+            self.metrics.detach()
+            self.metrics = None
+
+    def _log(self, *record):
+        self.version += 1
+        if self._pending_log is not None:
+            self._pending_log.append(record)
+        elif self.journal is not None:
+            self.journal.append(record)
+
+    def _cached(self, name, compute, *args):
+        # compute(*args), memoized until the next mutation bumps self.version. Whole-graph
+        # results are kept by name; answers to queries with arguments share a bounded LRU.
+        # compute returns something immutable (tuple, frozenset) and the public methods hand
+        # out copies, so no caller can change what the next one gets.
+        if self._cache_version != self.version:
+            self._results.clear()
+            self._queries.clear()
+            self._cache_version = self.version
+        if not args:
+            result = self._results.get(name, _MISSING)
+            if result is _MISSING:
+                result = self._results[name] = compute()
+            return result
+        key = (name,) + args
+        result = self._queries.get(key, _MISSING)
+        if result is _MISSING:
+            result = self._queries[key] = compute(*args)
+            if len(self._queries) > QUERY_CACHE_SIZE:
+                self._queries.popitem(last=False)
+        else:
+            self._queries.move_to_end(key)
+        return result
+
+    def _remember(self, undo):
+        if self._undo is not None:
+            self._undo.append(undo)
+
+    def transaction(self):
+        # Applies a batch of edits atomically. Cycle checks are deferred to one pass at commit;
+        # if that pass, or the block itself, fails, every edit made inside it is undone.
+        return self._atomic(defer_cycle_checks=True)
+
+    @contextlib.contextmanager
+    def _atomic(self, defer_cycle_checks):
+        # transaction(); without defer_cycle_checks the maintained order is kept and each edit
+        # is checked as it is made, for single edits made of several journal records
+        if self._undo is not None:
+            yield self  # nested: becomes part of the outer transaction
+            return
+        self._undo = []
+        self._pending_log = []
+        if defer_cycle_checks:
+            self.invalidate_order()
+        try:
+            yield self
+            cycle = self._ensure_order()
+            if cycle:
+                raise CycleError(f"Transaction would create a cycle: {cycle}", cycle)
+        except BaseException:
+            if self._undo:
+                for undo in reversed(self._undo):
+                    undo()
+                self.invalidate_order()  # the undo steps bypass the order and the indexes
+            raise
+        else:
+            if self.journal is not None and self._pending_log:
+                self.journal.append(("begin",))
+                for record in self._pending_log:
+                    self.journal.append(record)
+                self.journal.append(("commit",))
+        finally:
+            self._undo = None
+            self._pending_log = None
+
+    def add_task(self, task, dependencies=None, priority=None, deadline=None, description=None, action=None, duration=None):
+        # deadline is a datetime.date, a "YYYY-MM-DD" string or None
+        self._insert_task(task, dependencies, priority, deadline, description, action, duration)
+        self._log("add_task", task, dependencies, priority, self.task_details[task]["deadline"], description, duration)
+
+    def _insert_task(self, task, dependencies, priority, deadline, description, action, duration):
+        self._check_name(task)
         if task in self.graph:
             raise ValueError(f"Task '{task}' already exists.")
+        self._check_dependencies(dependencies)
+        for dep in dependencies or []:
+            if dep not in self.graph:
+                raise ValueError(f"Dependency '{dep}' does not exist.")
+        # Every check before the first change, so a rejected task leaves nothing behind
+        self._check_priority(priority)
+        self._check_description(description)
+        self._check_duration(duration)
+        deadline = to_date(deadline)
         self.graph.add_node(task)
+        if self._order is not None:
+            # A new task only gains edges from existing tasks, so the end of the order is always valid.
+            self._position[task] = len(self._order)
+            self._order.append(task)
         self.task_details[task] = {
-            "dependencies": dependencies,
+            "dependencies": list(dict.fromkeys(dependencies or [])),  # kept equal to the graph's predecessors
             "priority": priority,
             "deadline": deadline,
-            "description": description
+            "description": description,
+            "action": action,  # optional zero-argument callable run by executor.TaskExecutor
+            "duration": duration  # estimated days, used by critical_path
         }
         if dependencies:
             for dep in dependencies:
-                if dep not in self.graph:
-                    raise ValueError(f"Dependency '{dep}' does not exist.")
                 self.graph.add_edge(dep, task)
+        if self._reachability is not None:
+            self._reachability.add_task(task)
+            for dep in dependencies or []:
+                self._reachability.add_edge(dep, task)
+        if self._deadlines is not None:
+            self._deadlines.add(task, deadline)
+        self._remember(lambda: self._drop_task(task))
+
+    def _drop_task(self, task):
+        self.graph.remove_node(task)
+        del self.task_details[task]
+
+    def bulk_add(self, tasks):
+        # tasks is any iterable of dicts with a "task" key plus add_task's keyword names.
+        # Dependencies may name tasks that appear later; they are resolved, and the graph is
+        # checked for cycles, once after everything has been read. All or nothing is added.
+        added = []
+        pending = []  # (dependency, task) edges waiting for the whole batch
+        collecting = gc.isenabled()
+        gc.disable()  # millions of fresh dicts, none of them cyclic garbage
+        try:
+            for record in tasks:
+                task = record["task"]
+                self._check_name(task)
+                if task in self.graph:
+                    raise ValueError(f"Task '{task}' already exists.")
+                self._check_dependencies(record.get("dependencies"))
+                dependencies = list(record.get("dependencies") or [])
+                deadline = to_date(record.get("deadline"))
+                self._check_priority(record.get("priority"))
+                self._check_description(record.get("description"))
+                self._check_duration(record.get("duration"))
+                self.graph.add_node(task)
+                added.append(task)
+                self.task_details[task] = {
+                    "dependencies": list(dict.fromkeys(dependencies)),
+                    "priority": record.get("priority"),
+                    "deadline": deadline,
+                    "description": record.get("description"),
+                    "action": record.get("action"),
+                    "duration": record.get("duration")
+                }
+                pending.extend((dep, task) for dep in dependencies)
+                self._log("bulk_task", task, dependencies, record.get("priority"), deadline,
+                          record.get("description"), record.get("duration"))
+            for dep, task in pending:
+                if dep not in self.graph:
+                    raise ValueError(f"Dependency '{dep}' of task '{task}' does not exist.")
+            self.graph.add_edges_from(pending)
+            self.invalidate_order()
+            cycle = self._ensure_order()
+            if cycle:
+                raise CycleError(f"Imported tasks contain a cycle: {cycle}", cycle)
+        except Exception:
+            for task in added:
+                self._drop_task(task)
+            self.invalidate_order()
+            self._log("bulk_abort")
+            raise
+        finally:
+            if collecting:
+                gc.enable()
+        self._remember(lambda: [self._drop_task(task) for task in added])
+        self._log("bulk_commit")
+        return len(added)
 
     def edit_task(self, old_task_name):  # make it edit the whole task and handle it in the main
+        if old_task_name not in self.graph:
+            raise ValueError(f"Task '{old_task_name}' does not exist.")
         print(f"Old task details are: {self.task_details[old_task_name]}")
-        tasks_depends_on = []  # Collect every task that depends on the old task name
-        for i in self.graph:
-            if old_task_name in self.task_details[i]['dependencies']:
-                tasks_depends_on.append(i)
-
-        old_task_dependencies = [self.task_details[old_task_name]['dependencies']]
 
         new_task_name = input(f"Enter the new task name: ").strip()
         if new_task_name in self.graph and new_task_name != old_task_name:
             raise ValueError(f"Task '{new_task_name}' already exists.")
 
-        new_priority = ""
-        while True:
-            new_priority = input(f"Enter a new priority for task {new_task_name} [0, 10]: ")
-            if new_priority.isdigit() and 0 <= int(new_priority) <= 10:
-                new_priority = int(new_priority)
-                break
-            else:
-                print("Error: Priority must be a number [0, 10]. Please enter a valid number.")
+        new_priority = ask_priority(new_task_name)
 
-        new_deadline = {
-            'year': '----',
-            'month': '--',
-            'day': '--',
-        }
+        new_deadline = None
         answer = input(f"Does {new_task_name} have a deadline? [yes, no]: ")
         if answer == "yes":
-            while True:
-                year = input(f"{new_task_name} [year] deadline is: ").strip()
-                month = input(f"{new_task_name} [month] deadline is: ").strip()
-                day = input(f"{new_task_name} [day] deadline is: ").strip()
-                if not (year.isdigit() and month.isdigit() and day.isdigit()):
-                    print("Error, renter a valid deadline")
-                elif not ((int(year) > 2024 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31) or (int(year) == 2024 and 12 <= int(month) <= 12 and 29 <= int(day) <= 31)):
-                    print(f"Error, current date is 29/12/2024 don't enter deadline before this one, enter a valid deadline")
-                elif (year.isdigit() and month.isdigit() and day.isdigit()):
-                    year = int(year)
-                    month = int(month)
-                    day = int(day)
-                    new_deadline['year'] = year
-                    new_deadline['month'] = month
-                    new_deadline['day'] = day
-                    break
+            new_deadline = ask_deadline(new_task_name)
         elif answer == "no":
             print(f"The deadline will remain blank for the task {new_task_name}")
 
@@ -76,151 +297,677 @@ class TaskScheduler:
         new_dependencies = input(
             f"Enter the dependencies for task {new_task_name} (comma-separated, leave blank if none): ").strip()
         new_dependencies = [dep.strip() for dep in new_dependencies.split(",")] if new_dependencies else []
-        for i in new_dependencies:
-            if i not in self.graph:
-                raise ValueError(f"Dependency '{i}' does not exist.")
-            # self.graph.add_edge(i, new_task_name)
 
-        # Add the new task
-        self.add_task(new_task_name, new_dependencies, new_priority, new_deadline, new_description)
+        self.update_task(old_task_name, new_task_name, new_dependencies, new_priority, new_deadline, new_description)
+
+    def update_task(self, task, new_name=_KEEP, dependencies=_KEEP, priority=_KEEP, deadline=_KEEP,
+                    description=_KEEP, duration=_KEEP):
+        # Non-interactive edit_task: fields left as _KEEP are not touched. The task is edited in
+        # place, so tasks depending on it keep their edges and it keeps its action.
+        if task not in self.graph:
+            raise ValueError(f"Task '{task}' does not exist.")
+        if new_name is not _KEEP and new_name != task:
+            self._check_new_name(new_name)
+        if priority is not _KEEP:
+            self._check_priority(priority)
+        if deadline is not _KEEP:
+            deadline = self._check_deadline(deadline)
+        if description is not _KEEP:
+            self._check_description(description)
+        if duration is not _KEEP:
+            self._check_duration(duration)
+
+        # Everything that can still fail (missing dependency, cycle) happens first. The edit is
+        # journaled as one begin..commit block, so a replay never applies half of it.
+        if dependencies is not _KEEP and self._undo is None:
+            self._ensure_order()  # checks the new dependencies as they are added
+        with self._atomic(defer_cycle_checks=False):
+            if dependencies is not _KEEP:
+                self.edit_dependencies(task, dependencies)
+            if priority is not _KEEP:
+                self._set_field(task, "priority", priority)
+            if deadline is not _KEEP:
+                self._set_field(task, "deadline", deadline)
+            if description is not _KEEP:
+                self._set_field(task, "description", description)
+            if duration is not _KEEP:
+                self._set_field(task, "duration", duration)
+            if new_name is not _KEEP and new_name != task:
+                self.ETN(task, new_name)
+
+    def _check_name(self, task):
+        # Snapshots store task names as NUL-separated text
+        if not isinstance(task, str) or "\0" in task:
+            raise ValueError(f"Task name must be a string without NUL characters, got {task!r}.")
+
+    def _check_new_name(self, new_task_name):
+        self._check_name(new_task_name)
+        if new_task_name.strip() == "":
+            raise ValueError("New task name cannot be empty.")
+        if new_task_name in self.graph:
+            raise ValueError(f"Task '{new_task_name}' already exists.")
+
+    def _check_dependencies(self, dependencies):
+        # A bare string would otherwise be taken one character per dependency
+        if dependencies is not None and not (isinstance(dependencies, (list, tuple))
+                                             and all(isinstance(dep, str) for dep in dependencies)):
+            raise ValueError(f"Dependencies must be a list of task names, got {dependencies!r}.")
+
+    def _check_priority(self, priority):
+        if priority is not None and not (isinstance(priority, int) and not isinstance(priority, bool)
+                                         and 0 <= priority <= 10):
+            raise ValueError("Priority must be a number [0, 10].")
+
+    def _check_description(self, description):
+        if description is not None and not (isinstance(description, str) and "\0" not in description):
+            raise ValueError("Description must be text without NUL characters.")
+
+    def _check_deadline(self, deadline):
+        return to_date(deadline)
+
+    def _check_duration(self, duration):
+        if duration is not None and not (isinstance(duration, (int, float)) and not isinstance(duration, bool)
+                                         and duration >= 0):
+            raise ValueError("Duration must be a non-negative number.")
+
+    def _set_field(self, task, field, value):
+        old_value = self.task_details[task][field]
+        self.task_details[task][field] = value
+        if field == "deadline" and self._deadlines is not None:
+            self._deadlines.move(task, value)
+        self._remember(lambda: self.task_details[task].__setitem__(field, old_value))
+        self._log("set", task, field, value)
+
+    def set_priority(self, task, priority):
+        if task not in self.graph:
+            raise ValueError(f"Task '{task}' does not exist.")
+        self._check_priority(priority)
+        self._set_field(task, "priority", priority)
+
+    def set_description(self, task, description):
+        if task not in self.graph:
+            raise ValueError(f"Task '{task}' does not exist.")
+        self._check_description(description)
+        self._set_field(task, "description", description)
 
-        # Edit each task that depends on the old task
-        for task in tasks_depends_on:
-            self.graph.add_edge(new_task_name, task)
+    def set_deadline(self, task, deadline):
+        # deadline is a datetime.date or "YYYY-MM-DD" string, or None to remove it
+        if task not in self.graph:
+            raise ValueError(f"Task '{task}' does not exist.")
+        self._set_field(task, "deadline", self._check_deadline(deadline))
 
-        # Delete the old task from the graph
-        # self.delete_task(old_task_name)
-        self.graph.remove_node(old_task_name)
-        del self.task_details[old_task_name]
+    def set_duration(self, task, duration):
+        if task not in self.graph:
+            raise ValueError(f"Task '{task}' does not exist.")
+        self._check_duration(duration)
+        self._set_field(task, "duration", duration)
 
     def delete_task(self, task_name):
+        self._delete_task(task_name, None)
+
+    def _delete_task(self, task_name, pruned):
+        # pruned: the redundant reassigned edges to drop, as journaled; None searches for them
         if task_name not in self.graph:
             raise ValueError(f"Task '{task_name}' does not exist.")
+        if pruned is None and self._undo is None:
+            self._ensure_order()  # bounds the search for redundant edges below
 
         # Get predecessors (dependencies) and successors (dependent tasks) of the target task
         predecessors = list(self.graph.predecessors(task_name))
         successors = list(self.graph.successors(task_name))
 
         # Reassign dependencies: Make each successor of the target task depend on its predecessors
+        reassigned = []
         for successor in successors:
             for predecessor in predecessors:
-                self.graph.add_edge(predecessor, successor)
+                if not self.graph.has_edge(predecessor, successor):
+                    self.graph.add_edge(predecessor, successor)
+                    reassigned.append((predecessor, successor))
 
         # Remove the task from the graph and its details
+        details = dict(self.task_details[task_name])
         self.graph.remove_node(task_name)
+        self._forget_position(task_name)
         del self.task_details[task_name]
-
-        print(f"Task '{task_name}' has been successfully deleted. Its dependencies have been reassigned.")
+        if self._reachability is not None:
+            self._reachability.remove_task(task_name)
+        if self._deadlines is not None:
+            self._deadlines.remove(task_name)
+
+        # A reassigned edge is redundant when the successor is still reachable from the
+        # predecessor some other way; keeping those would only clutter the graph. Only the
+        # reassigned edges are checked, and only while the order is known to bound the search;
+        # anything else is left to transitive_reduction(). What was pruned is journaled, so a
+        # replay drops the same edges without searching.
+        if pruned is None:
+            pruned = []
+            if reassigned and self._order is not None:
+                targets = {}
+                for predecessor, successor in reassigned:
+                    targets.setdefault(predecessor, []).append(successor)
+                for predecessor, candidates in targets.items():
+                    implied = self._implied(predecessor, candidates)
+                    pruned.extend((predecessor, successor) for successor in candidates if successor in implied)
+        else:
+            added = set(reassigned)
+            pruned = [edge for edge in pruned if edge in added]
+        for predecessor, successor in pruned:
+            self.graph.remove_edge(predecessor, successor)
+        if pruned:
+            dropped = set(pruned)
+            reassigned = [edge for edge in reassigned if edge not in dropped]
+        self._refresh_dependencies(successor for successor in successors if successor != task_name)
+        self._remember(lambda: self._restore_task(task_name, details, predecessors, successors, reassigned))
+        self._log("delete_task", task_name, pruned)
+
+    def _restore_task(self, task_name, details, predecessors, successors, reassigned):
+        for predecessor, successor in reassigned:
+            self.graph.remove_edge(predecessor, successor)
+        self.graph.add_node(task_name)
+        self.task_details[task_name] = details
+        for predecessor in predecessors:
+            self.graph.add_edge(predecessor, task_name)
+        for successor in successors:
+            self.graph.add_edge(task_name, successor)
+        self._refresh_dependencies(successors)
 
     def edit_dependencies(self, task, new_dependencies):
         if task not in self.graph:
             raise ValueError(f"Task '{task}' does not exist.")
-        for predecessor in list(self.graph.predecessors(task)):
-            self.graph.remove_edge(predecessor, task)
+        self._check_dependencies(new_dependencies)
         for dep in new_dependencies:
             if dep not in self.graph:
                 raise ValueError(f"Dependency '{dep}' does not exist.")
-            self.graph.add_edge(dep, task)
-
-    def detect_cycle(self):
-        def dfs(node, visited, rec_stack):
-            visited.add(node)
-            rec_stack.add(node)
+        if self._undo is None:
+            self._ensure_order()  # inside a transaction the cycle check waits for commit
+        old_dependencies = list(self.graph.predecessors(task))
+        for predecessor in old_dependencies:
+            self.graph.remove_edge(predecessor, task)
+        added = []
+        try:
+            for dep in dict.fromkeys(new_dependencies):
+                self._insert_edge(dep, task)
+                added.append(dep)
+        except ValueError:
+            # Put the old dependencies back so a rejected edit leaves the graph untouched
+            for dep in added:
+                self.graph.remove_edge(dep, task)
+            for dep in old_dependencies:
+                self._insert_edge(dep, task)
+            raise
+        if self._reachability is not None:
+            if set(old_dependencies) - set(new_dependencies):
+                self._reachability = None  # lost reachability cannot be subtracted from the bitsets
+            else:
+                for dep in added:
+                    self._reachability.add_edge(dep, task)
+        self._refresh_dependencies((task,))
+        self._remember(lambda: self._reset_dependencies(task, old_dependencies))
+        self._log("edit_dependencies", task, list(new_dependencies))
 
+    def _reset_dependencies(self, task, dependencies):
+        for predecessor in list(self.graph.predecessors(task)):
+            self.graph.remove_edge(predecessor, task)
+        for dep in dependencies:
+            self.graph.add_edge(dep, task)
+        self._refresh_dependencies((task,))
+
+    def _refresh_dependencies(self, tasks):
+        # task_details[task]["dependencies"] lists the task's predecessors in the graph; after an
+        # edit changed them it is rebuilt here. The compact backend reads it from the graph.
+        if not isinstance(self.task_details, CompactTaskDetails):
+            for task in tasks:
+                self.task_details[task]["dependencies"] = list(self.graph.predecessors(task))
+
+    def invalidate_order(self):
+        # Call after changing self.graph or self.task_details directly instead of through the
+        # scheduler methods.
+        self.version += 1
+        self._order = None
+        self._position = {}
+        self._holes = 0
+        self._reachability = None
+        self._deadlines = None
+
+    def _ensure_order(self):
+        if self._order is None:
+            order, cycle = self._kahn_sort()
+            if order is None:
+                return cycle
+            self._seed_order(order)
+        return []
+
+    def _seed_order(self, order):
+        self._order = order
+        self._position = {node: index for index, node in enumerate(order)}
+        self._holes = 0
+
+    def _forget_position(self, task):
+        if self._order is None:
+            return
+        self._order[self._position.pop(task)] = None
+        self._holes += 1
+        if self._holes * 2 > len(self._order):
+            self._order = [node for node in self._order if node is not None]
+            self._position = {node: index for index, node in enumerate(self._order)}
+            self._holes = 0
+
+    def _insert_edge(self, u, v):
+        if self._order is None or self.graph.has_edge(u, v):
+            self.graph.add_edge(u, v)
+            return
+        if u == v:
+            raise CycleError(f"Dependency '{u}' -> '{v}' would create a cycle: {[u, v]}", [u, v])
+        lower = self._position[v]
+        upper = self._position[u]
+        if lower < upper:
+            # Pearce-Kelly: only tasks positioned between v and u can be affected.
+            forward = self._bounded_search(v, u, self.graph.successors, lambda position: position < upper)
+            backward = self._bounded_search(u, None, self.graph.predecessors, lambda position: position > lower)
+            forward.sort(key=self._position.__getitem__)
+            backward.sort(key=self._position.__getitem__)
+            moved = backward + forward
+            slots = sorted(self._position[node] for node in moved)
+            for node, slot in zip(moved, slots):
+                self._order[slot] = node
+                self._position[node] = slot
+        self.graph.add_edge(u, v)
+
+    def _bounded_search(self, start, target, neighbors, in_bounds):
+        parent = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for neighbor in neighbors(node):
+                if neighbor == target:
+                    # start reaches target, so the edge target -> start closes a cycle
+                    path = [node]
+                    while parent[path[-1]] is not None:
+                        path.append(parent[path[-1]])
+                    path.reverse()
+                    cycle = [target] + path + [target]
+                    raise CycleError(f"Dependency '{target}' -> '{start}' would create a cycle: {cycle}", cycle)
+                if neighbor not in parent and in_bounds(self._position[neighbor]):
+                    parent[neighbor] = node
+                    stack.append(neighbor)
+        return list(parent)
+
+    def _kahn_sort(self):
+        # Single O(V+E) pass that returns either the order or a cycle witness,
+        # using an explicit stack so deep chains never hit the recursion limit.
+        in_degree = dict(self.graph.in_degree())
+        stack = [node for node, degree in in_degree.items() if degree == 0]
+        stack.reverse()
+        order = []
+        while stack:
+            node = stack.pop()
+            order.append(node)
             for neighbor in self.graph[node]:
-                if neighbor not in visited:
-                    has_cycle, cycle_path = dfs(neighbor, visited, rec_stack)
-                    if has_cycle:
-                        cycle_path.append(node)
-                        return True, cycle_path
-                elif neighbor in rec_stack:
-                    return True, [neighbor, node]
-
-            rec_stack.remove(node)
-            return False, []
-
-        visited = set()
-        rec_stack = set()
-
-        for node in self.graph:
-            if node not in visited:
-                has_cycle, cycle_path = dfs(node, visited, rec_stack)
-                if has_cycle:
-                    cycle_path.reverse()
-                    return True, cycle_path
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    stack.append(neighbor)
+
+        if len(order) == len(in_degree):
+            return order, []
+
+        # Every task left over still waits on a task that was never emitted,
+        # so walking those predecessors backwards must run into a repeat.
+        node = next(node for node, degree in in_degree.items() if degree > 0)
+        seen = {}
+        path = []
+        while node not in seen:
+            seen[node] = len(path)
+            path.append(node)
+            node = next(pred for pred in self.graph.predecessors(node) if in_degree[pred] > 0)
+        cycle = path[seen[node]:]
+        cycle.reverse()
+        cycle.append(cycle[0])
+        return None, cycle
+
+    def _reach(self):
+        # The closure index, built on demand; None when the graph is too big to afford it
+        if self._reachability is not None and self._reachability.is_fragmented():
+            self._reachability = None
+        if self._reachability is None and self.graph.number_of_nodes() <= REACHABILITY_LIMIT:
+            self._check_acyclic()
+            self._reachability = ReachabilityIndex(self.graph, self.topological_sort())
+        return self._reachability
+
+    def _check_acyclic(self):
+        cycle = self._ensure_order()
+        if cycle:
+            raise CycleError(f"The tasks contain a cycle: {cycle}", cycle)
+
+    def depends_on(self, task, other):
+        # True if task cannot start before other is done, directly or through other tasks
+        for name in (task, other):
+            if name not in self.graph:
+                raise ValueError(f"Task '{name}' does not exist.")
+        index = self._reach()
+        if index is not None:
+            return index.depends_on(task, other)
+        # Too big to index: search forward from other, only through tasks ordered before task
+        self._check_acyclic()
+        upper = self._position[task]
+        if self._position[other] >= upper:
+            return False
+        seen = {other}
+        stack = [other]
+        while stack:
+            for successor in self.graph.successors(stack.pop()):
+                if successor == task:
+                    return True
+                if successor not in seen and self._position[successor] < upper:
+                    seen.add(successor)
+                    stack.append(successor)
+        return False
+
+    def ancestors(self, task):
+        # Every task that task transitively depends on
+        return set(self._cached("closure", self._closure, task, "ancestors"))
+
+    def descendants(self, task):
+        # Every task that transitively depends on task, i.e. what breaks if it is deleted
+        return set(self._cached("closure", self._closure, task, "descendants"))
+
+    def _closure(self, task, direction):
+        if task not in self.graph:
+            raise ValueError(f"Task '{task}' does not exist.")
+        index = self._reach()
+        if index is not None:
+            return frozenset(getattr(index, direction)(task))
+        neighbors = self.graph.predecessors if direction == "ancestors" else self.graph.successors
+        seen = set()
+        stack = [task]
+        while stack:
+            for neighbor in neighbors(stack.pop()):
+                if neighbor not in seen:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return frozenset(seen)
+
+    def _implied(self, task, targets):
+        # Those of targets, direct successors of task, that task also reaches through another
+        # successor. Only tasks ordered before the last target can lead to one of them, and the
+        # search gives up after looking at PRUNE_SEARCH_LIMIT dependencies, so a delete stays
+        # cheap; whatever it misses is left to transitive_reduction().
+        upper = max(self._position[node] for node in targets)
+        remaining = set(targets)
+        implied = set()
+        stack = [node for node in self.graph.successors(task) if self._position[node] < upper]
+        seen = set(stack)
+        budget = PRUNE_SEARCH_LIMIT
+        while stack and remaining and budget > 0:
+            for neighbor in self.graph.successors(stack.pop()):
+                budget -= 1
+                if neighbor in remaining:
+                    remaining.discard(neighbor)
+                    implied.add(neighbor)
+                if neighbor not in seen and self._position[neighbor] < upper:
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return implied
+
+    def _redundant_successors(self, successors):
+        # The successors of one task that are also reachable through another of them.
+        # Uses the closure if it is already built, otherwise searches from the successors,
+        # pruned by the topological order when it is known.
+        if len(successors) < 2:
+            return []
+        if self._reachability is not None:
+            return self._reachability.redundant(successors)
+        targets = set(successors)
+        upper = max(self._position[node] for node in successors) if self._order is not None else None
+        redundant = set()
+        seen = set(successors)
+        stack = list(successors)
+        while stack:
+            for neighbor in self.graph.successors(stack.pop()):
+                if neighbor in targets:
+                    redundant.add(neighbor)
+                if neighbor not in seen and (upper is None or self._position[neighbor] < upper):
+                    seen.add(neighbor)
+                    stack.append(neighbor)
+        return [node for node in successors if node in redundant]
+
+    def transitive_reduction(self):
+        # Removes every dependency that is already implied through other tasks. What depends on
+        # what does not change, only the redundant edges go. Returns the removed edges.
+        self._check_acyclic()
+        self._reach()  # one closure answers every task's question, when the graph is small enough
+        removed = []
+        for task in self.graph:
+            removed.extend((task, successor) for successor in self._redundant_successors(list(self.graph.successors(task))))
+        for predecessor, successor in removed:
+            self.graph.remove_edge(predecessor, successor)
+        self._refresh_dependencies(dict.fromkeys(successor for _, successor in removed))
+        self._remember(lambda: self._restore_edges(removed))
+        self._log("transitive_reduction")
+        return removed
+
+    def _restore_edges(self, edges):
+        self.graph.add_edges_from(edges)
+        self._refresh_dependencies(dict.fromkeys(successor for _, successor in edges))
+
+    def _cycle(self):
+        # _ensure_order, memoized: while the graph has a cycle the order stays unknown, and
+        # every check would otherwise run Kahn's algorithm again
+        return self._cached("cycle", lambda: tuple(self._ensure_order()))
 
+    def detect_cycle(self):
+        cycle = self._cycle()
+        if cycle:
+            return True, list(cycle)
         return False, []
 
     def topological_sort(self):
-        detected, cycle = self.detect_cycle()
-        if detected:
+        if self._cycle():
             print("There is a cycle, can't perform topological sort due to the cycle.")
             return None
-        visited = set()
-        stack = []
-
-        def dfs(node):
-            visited.add(node)
-            for neighbor in self.graph[node]:
-                if neighbor not in visited:
-                    dfs(neighbor)
-            stack.append(node)
-
-        for node in self.graph.nodes:
-            if node not in visited:
-                dfs(node)
+        return list(self._cached("topological_sort", self._current_order))
 
-        return stack[::-1]
+    def _current_order(self):
+        self._ensure_order()
+        if self._holes:
+            return tuple(node for node in self._order if node is not None)
+        return tuple(self._order)
 
     def get_priority(self, task):
         return self.task_details[task]["priority"]
 
     def STBP(self):
-        sorted_tasks = sorted(self.graph.nodes, key=self.get_priority, reverse=True)
-        return sorted_tasks
-
-    def visualize(self):
+        return list(self._cached("STBP", lambda: tuple(sorted(self.graph.nodes, key=self.get_priority, reverse=True))))
+
+    def visualize(self, path=None, around=None, direction="both", depth=None, groups=None):
+        # With a path the graph is written to an .svg/.png/.dot file (see rendering.py), which
+        # works headless and scales to large graphs; without one it opens a matplotlib window
+        if path is not None:
+            from rendering import render
+            return render(self, path, around=around, direction=direction, depth=depth, groups=groups)
         if self.graph.number_of_nodes() == 0:
             raise ValueError("Cannot visualize an empty graph.")
-        nx.draw(self.graph, with_labels=True, node_color='skyblue', font_weight='bold', node_size=2000, font_size=10)
+        import matplotlib.pyplot as plt
+        import networkx as nx
+        graph = self.graph.to_networkx() if isinstance(self.graph, CompactDiGraph) else self.graph
+        nx.draw(graph, with_labels=True, node_color='skyblue', font_weight='bold', node_size=2000, font_size=10)
         plt.show()
 
-    def sort_by_deadline(self):
-        def get_deadline_key(task):
-            deadline = self.task_details[task]["deadline"]
-            INT_MAX = 2**31 - 1
-            year = int(deadline.get('year')) if str(deadline.get('year')).isdigit() else INT_MAX
-            month = int(deadline.get('month')) if str(deadline.get('month')).isdigit() else INT_MAX
-            day = int(deadline.get('day')) if str(deadline.get('day')).isdigit() else INT_MAX
-            return (year, month, day)
+    def get_deadline_key(self, task):
+        # Day number of the deadline; tasks without one sort after every dated task
+        deadline = self.task_details[task]["deadline"]
+        return deadline.toordinal() if deadline is not None else 2**31 - 1
+
+    def _deadline_index(self):
+        if self._deadlines is None:
+            self._deadlines = DeadlineIndex((task, self.task_details[task]["deadline"]) for task in self.graph)
+        return self._deadlines
 
-        sorted_tasks = sorted(self.graph.nodes, key=get_deadline_key)
-        return sorted_tasks
+    def sort_by_deadline(self):
+        return list(self._cached("sort_by_deadline", self._sort_by_deadline))
+
+    def _sort_by_deadline(self):
+        index = self._deadline_index()
+        sorted_tasks = list(index)
+        sorted_tasks.extend(task for task in self.graph if task not in index)
+        return tuple(sorted_tasks)
+
+    def due_before(self, day):
+        # Tasks whose deadline is before day, earliest first
+        return list(self._cached("due_before", lambda day: tuple(self._deadline_index().between(end=day)), to_date(day)))
+
+    def overdue(self, today=None):
+        return self.due_before(today or date.today())
+
+    def next_due(self, k=1, today=None):
+        # The k tasks due soonest, counting from today; tasks already overdue are not included
+        return list(self._cached("next_due", self._next_due, k, to_date(today) or date.today()))
+
+    def _next_due(self, k, today):
+        return tuple(itertools.islice(self._deadline_index().between(start=today), k))
+
+    def get_duration(self, task):
+        duration = self.task_details[task].get("duration")
+        return duration if duration is not None else 0
+
+    def critical_path(self, start_date=None):
+        # Longest path over the DAG in one forward and one backward pass of the topological order.
+        # Times are in days from start_date; tasks without a duration count as zero-length milestones.
+        makespan, path, timings = self._cached("critical_path", self._critical_path, start_date or date.today())
+        return makespan, list(path), {task: dict(timing) for task, timing in timings.items()}
+
+    def _critical_path(self, start_date):
+        cycle = self._cycle()
+        if cycle:
+            cycle = list(cycle)
+            raise CycleError(f"Cannot compute the critical path because of the cycle: {cycle}", cycle)
+        order = self._cached("topological_sort", self._current_order)
+
+        earliest_finish = {}
+        critical_predecessor = {}
+        timings = {}
+        for task in order:
+            earliest_start = 0
+            critical_predecessor[task] = None
+            for predecessor in self.graph.predecessors(task):
+                if earliest_finish[predecessor] > earliest_start:
+                    earliest_start = earliest_finish[predecessor]
+                    critical_predecessor[task] = predecessor
+            earliest_finish[task] = earliest_start + self.get_duration(task)
+            timings[task] = {"earliest_start": earliest_start, "earliest_finish": earliest_finish[task]}
+        makespan = max(earliest_finish.values(), default=0)
+
+        for task in reversed(order):
+            latest_finish = min((timings[successor]["latest_start"] for successor in self.graph.successors(task)),
+                                default=makespan)
+            latest_start = latest_finish - self.get_duration(task)
+            due = self.task_details[task]["deadline"]
+            late = due is not None and start_date + timedelta(days=earliest_finish[task]) > due
+            timings[task].update({
+                "latest_start": latest_start,
+                "latest_finish": latest_finish,
+                "slack": latest_start - timings[task]["earliest_start"],
+                "late": late,
+            })
+
+        path = []
+        task = max(earliest_finish, key=earliest_finish.get) if earliest_finish else None
+        while task is not None:
+            path.append(task)
+            task = critical_predecessor[task]
+        path.reverse()
+        return makespan, tuple(path), timings
+
+    def schedule_key(self, by="priority"):
+        # Heap key for ready tasks: smallest key runs first
+        if by == "priority":
+            def key(task):
+                priority = self.get_priority(task)
+                return (-(priority if priority is not None else -1), self.get_deadline_key(task))
+        elif by == "deadline":
+            def key(task):
+                priority = self.get_priority(task)
+                return (self.get_deadline_key(task), -(priority if priority is not None else -1))
+        else:
+            raise ValueError(f"Unknown schedule key '{by}', expected 'priority' or 'deadline'.")
+        return key
+
+    def iter_schedule(self, by="priority"):
+        # Yields an executable order: a task comes out only after all of its dependencies,
+        # and among the ready tasks the highest priority (or earliest deadline) goes first.
+        key = self.schedule_key(by)
+        has_cycle, cycle = self.detect_cycle()
+        if has_cycle:
+            raise CycleError(f"Cannot schedule tasks because of the cycle: {cycle}", cycle)
+
+        in_degree = dict(self.graph.in_degree())
+        ready = []
+        counter = 0  # tie-breaker so the heap never compares task names
+        for task, degree in in_degree.items():
+            if degree == 0:
+                ready.append((key(task), counter, task))
+                counter += 1
+        heapq.heapify(ready)
+        while ready:
+            _, _, task = heapq.heappop(ready)
+            yield task
+            for successor in self.graph.successors(task):
+                in_degree[successor] -= 1
+                if in_degree[successor] == 0:
+                    heapq.heappush(ready, (key(successor), counter, successor))
+                    counter += 1
+
+    def schedule(self, by="priority"):
+        return list(self._cached("schedule", lambda by: tuple(self.iter_schedule(by)), by))
+
+    def sharded_schedule(self, by="priority", partitions=None, workers=None):
+        # detect_cycle, topological_sort and schedule in one go, each independent project
+        # (weakly connected component, or user partition) in a worker process; returns a
+        # sharding.ShardedResult. See sharding.py for when it actually forks.
+        from sharding import run_sharded
+        result = run_sharded(self, by, partitions, workers)
+        if result.order is not None and self._order is None:
+            self._seed_order(list(result.order))
+        return result
 
 
     def ETN(self, old_task_name, new_task_name):
         if old_task_name not in self.graph:
             raise ValueError(f"Task '{old_task_name}' does not exist.")
-        if new_task_name.strip() == "":
-            raise ValueError("New task name cannot be empty.")
-        if new_task_name in self.graph:
-            raise ValueError(f"Task '{new_task_name}' already exists.")
-        self.graph = nx.relabel_nodes(self.graph, {old_task_name: new_task_name})
+        self._check_new_name(new_task_name)
+        self._rename(old_task_name, new_task_name)
+        self._remember(lambda: self._rename(new_task_name, old_task_name))
+        self._log("ETN", old_task_name, new_task_name)
+
+    def _rename(self, old_task_name, new_task_name):
+        if isinstance(self.graph, CompactDiGraph):
+            self.graph.rename_node(old_task_name, new_task_name)
+        else:
+            # In place: only the renamed task's own edges are touched, the graph is not copied
+            rename = lambda node: new_task_name if node == old_task_name else node
+            predecessors = [rename(node) for node in self.graph.predecessors(old_task_name)]
+            successors = [rename(node) for node in self.graph.successors(old_task_name)]
+            self.graph.add_node(new_task_name)
+            self.graph.add_edges_from((predecessor, new_task_name) for predecessor in predecessors)
+            self.graph.add_edges_from((new_task_name, successor) for successor in successors)
+            self.graph.remove_node(old_task_name)
         self.task_details[new_task_name] = self.task_details.pop(old_task_name)
-        print(f"Task '{old_task_name}' has been renamed to '{new_task_name}'.")
+        self._refresh_dependencies(self.graph.successors(new_task_name))
+        if self._reachability is not None:
+            self._reachability.rename(old_task_name, new_task_name)
+        if self._deadlines is not None:
+            self._deadlines.rename(old_task_name, new_task_name)
+        if self._order is not None:
+            position = self._position.pop(old_task_name)
+            self._order[position] = new_task_name
+            self._position[new_task_name] = position
 
     def edit_priority(self, task):
         if task not in self.graph:
             raise ValueError(f"Task '{task}' does not exist.")
 
-        while True:
-            new_priority = input(f"Enter a new priority for task '{task}' [0, 10]: ").strip()
-            if new_priority.isdigit() and 0 <= int(new_priority) <= 10:
-                self.task_details[task]["priority"] = int(new_priority)
-                print(f"Priority of task '{task}' updated to {new_priority}.")
-                break
-            else:
-                print("Error: Priority must be a number between 0 and 10. Please enter a valid value.")
+        new_priority = ask_priority(task)
+        self.set_priority(task, new_priority)
+        print(f"Priority of task '{task}' updated to {new_priority}.")
 
     def edit_description(self, task):
         if task not in self.graph:
@@ -228,61 +975,157 @@ class TaskScheduler:
 
         print(f"Current description for task '{task}': {self.task_details[task]['description']}")
         new_description = input("Enter a new description for the task: ").strip()
-        self.task_details[task]["description"] = new_description
+        self.set_description(task, new_description)
         print(f"Description for task '{task}' has been updated to: {new_description}")
 
     def edit_deadline(self, task):
         if task not in self.graph:
             raise ValueError(f"Task '{task}' does not exist.")
 
-        print(f"Current deadline for task '{task}': {self.task_details[task]['deadline']}")
+        print(f"Current deadline for task '{task}': {format_deadline(self.task_details[task]['deadline'])}")
 
 
         answer = input(f"Does the task '{task}' have a new deadline? [yes, remove, cancle]: ").strip().lower()
 
         if answer == "yes":
-            new_deadline = {
-                'year': '----',
-                'month': '--',
-                'day': '--',
-            }
-            while True:
-                year = input(f"{task} [year] deadline is: ").strip()
-                month = input(f"{task} [month] deadline is: ").strip()
-                day = input(f"{task} [day] deadline is: ").strip()
-                if not (year.isdigit() and month.isdigit() and day.isdigit()):
-                    print("Error, renter a valid deadline")
-                elif not ((int(year) > 2024 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31) or (int(year) == 2024 and 12 <= int(month) <= 12 and 29 <= int(day) <= 31)):
-                    print(f"Error, current date is 29/12/2024 don't enter deadline before this one, enter a valid deadline")
-                elif (year.isdigit() and month.isdigit() and day.isdigit()):
-                    year = int(year)
-                    month = int(month)
-                    day = int(day)
-                    new_deadline['year'] = year
-                    new_deadline['month'] = month
-                    new_deadline['day'] = day
-                    break
-
-            self.task_details[task]["deadline"] = new_deadline
+            new_deadline = ask_deadline(task)
+            self.set_deadline(task, new_deadline)
             print(f"Deadline for task '{task}' has been updated to: {new_deadline}")
 
         elif answer == "remove":
-
-            self.task_details[task]["deadline"] = {
-                'year': '----',
-                'month': '--',
-                'day': '--',
-            }
+            self.set_deadline(task, None)
             print(f"The deadline for task '{task}' has been removed and is now empty.")
 
         elif answer == "cancle":
             print(f"The deadline for task '{task}' will remain unchanged.")
 
 
-def main():
-    scheduler = TaskScheduler()
+def build_parser():
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Task dependency scheduler. Run without a command for the interactive menu.",
+        epilog="Commands exit with 1 when the tasks contain a cycle and 2 on any other error.")
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH, help=f"snapshot file (default: {SNAPSHOT_PATH})")
+    parser.add_argument("--journal", default=JOURNAL_PATH, help=f"journal file (default: {JOURNAL_PATH})")
+    parser.add_argument("--profile", metavar="FILE",
+                        help="run the command under cProfile and dump the stats to FILE (read with pstats)")
+    parser.add_argument("--metrics", choices=("json", "prometheus"),
+                        help="print call counts and timings of the scheduler methods to stderr afterwards")
+    source = argparse.ArgumentParser(add_help=False)
+    source.add_argument("--file", help="read the tasks from a .csv or .jsonl file instead of the saved tasks")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+    commands.add_parser("sort", parents=[source], help="print the tasks in dependency order")
+    commands.add_parser("detect-cycle", parents=[source], help="print a dependency cycle if there is one")
+    schedule = commands.add_parser("schedule", parents=[source],
+                                   help="print the tasks in dependency order, most urgent first")
+    schedule.add_argument("--by", choices=("priority", "deadline"), default="priority")
+    schedule.add_argument("--workers", type=int, metavar="N",
+                          help="schedule independent projects in N processes (worth it for very large graphs)")
+    render = commands.add_parser("render", parents=[source], help="draw the task graph to an .svg, .png or .dot file")
+    render.add_argument("output")
+    render.add_argument("--around", metavar="TASK", help="only draw the tasks connected to this one")
+    render.add_argument("--direction", choices=("ancestors", "descendants", "both"), default="both")
+    render.add_argument("--depth", type=int, help="how many dependency steps --around reaches (default: all)")
+    render.add_argument("--collapse", metavar="SEP",
+                        help="draw all tasks sharing the name prefix before SEP as one box, e.g. --collapse /")
+    serve = commands.add_parser("serve", help="share the saved tasks with many clients (see server.py)")
+    where = serve.add_mutually_exclusive_group(required=True)
+    where.add_argument("--socket", metavar="PATH", help="listen on a Unix socket")
+    where.add_argument("--port", type=int, help="listen on this localhost TCP port")
+    serve.add_argument("--durable", action="store_true", help="fsync the journal before acknowledging writes")
+    return parser
+
+
+def run_server(args):
+    import asyncio
+    from server import serve
+    scheduler = open_journaled(TaskScheduler(), args.snapshot, args.journal)
+    try:
+        asyncio.run(serve(scheduler, args.socket, port=args.port, durable=args.durable))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        checkpoint(scheduler, args.snapshot)
+        scheduler.journal.close()
+    return 0
+
+
+def run_command(args):
+    # One-shot commands only read, so they use the compact backend (no networkx import)
+    # and never attach the journal for writing
+    scheduler = TaskScheduler(backend="compact")
+    if args.metrics:
+        metrics = scheduler.enable_metrics()
+    try:
+        if args.profile:
+            return profile_call(_run_command, scheduler, args, path=args.profile)
+        return _run_command(scheduler, args)
+    finally:
+        if args.metrics:
+            print(metrics.to_json(indent=2) if args.metrics == "json" else metrics.to_prometheus(),
+                  file=sys.stderr, end="\n" if args.metrics == "json" else "")
+
+
+def _run_command(scheduler, args):
+    try:
+        if args.file:
+            load_tasks(scheduler, args.file)
+        else:
+            open_journaled(scheduler, args.snapshot, args.journal, read_only=True)
+        has_cycle, cycle = scheduler.detect_cycle()
+    except CycleError as e:
+        # The scheduler refuses cyclic input outright, so a cyclic file surfaces here
+        has_cycle, cycle = True, e.cycle
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if args.command == "detect-cycle":
+        if has_cycle:
+            print(f"Cycle detected: {' -> '.join(map(str, cycle))}")
+            return 1
+        print("No cycle detected.")
+        return 0
+    if has_cycle:
+        print(f"Error: the tasks contain a cycle: {' -> '.join(map(str, cycle))}", file=sys.stderr)
+        return 1
+    if args.command == "render":
+        groups = None
+        if args.collapse:
+            groups = lambda task: task.split(args.collapse, 1)[0] if args.collapse in task else None
+        try:
+            count = scheduler.visualize(args.output, args.around, args.direction, args.depth, groups)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 2
+        print(f"Wrote {count} tasks to '{args.output}'.")
+        return 0
+    if args.command == "sort":
+        tasks = scheduler.topological_sort()
+    elif args.workers:
+        tasks = scheduler.sharded_schedule(args.by, workers=args.workers).schedule
+    else:
+        tasks = scheduler.schedule(args.by)
+    for task in tasks:
+        print(task)
+    return 0
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        sys.exit(run_server(args))
+    if args.command is not None:
+        sys.exit(run_command(args))
+    run_menu(args.snapshot, args.journal)
+
+
+def run_menu(snapshot_path=SNAPSHOT_PATH, journal_path=JOURNAL_PATH):
+    scheduler = open_journaled(TaskScheduler(), snapshot_path, journal_path)
 
     print("Welcome to the Task Scheduler!")
+    if scheduler.graph.number_of_nodes():
+        print(f"Restored {scheduler.graph.number_of_nodes()} tasks from '{snapshot_path}' and '{journal_path}'.")
     while True:
         print("\nMenu:")
         print("1. Add a task")
@@ -298,9 +1141,13 @@ def main():
         print("11. Edit task priority")
         print("12. Edit task description")
         print("13. Edit task deadline")
-        print("14. Exit")
+        print("14. Schedule tasks by priority (respecting dependencies)")
+        print("15. Schedule tasks by deadline (respecting dependencies)")
+        print("16. Show critical path")
+        print("17. Import tasks from a CSV or JSONL file")
+        print("18. Exit")
 
-        choice = input("Enter your choice (1-14): ").strip()
+        choice = input("Enter your choice (1-18): ").strip()
 
         try:
             if choice == "1":
@@ -319,38 +1166,30 @@ def main():
                             break
                         else:
                             print("Error: Priority must be a number [0 , 10]. Please enter a valid number.")
-                    deadline = {
-                        'year': '----',
-                        'month': '--',
-                        'day': '--',
-                    }
+                    deadline = None
                     answer = input(f"does {task} have deadline? [yes , no] : ")
                     if answer == "yes":
-                        while True:
-                            year = input(f"{task} [ year ] dead line is : ").strip()
-                            month = input(f"{task} [ month ] dead line is : ").strip()
-                            day = input(f"{task} [ day ] dead line is : ").strip()
-                            if not (year.isdigit() and month.isdigit() and day.isdigit()):
-                                print("Error, renter a valid deadline")
-                            elif not ((int(year) > 2024 and 1 <= int(month) <= 12 and 1 <= int(day) <= 31) or (int(year) == 2024 and 12 <= int(month) <= 12 and 29 <= int(day) <= 31)):
-                                print(f"Error, current date is 29/12/2024 don't enter deadline before this one, enter a valid deadline")
-                            elif (year.isdigit() and month.isdigit() and day.isdigit()):
-                                year = int(year)
-                                month = int(month)
-                                day = int(day)
-                                deadline['year'] = year
-                                deadline['month'] = month
-                                deadline['day'] = day
-                                break
-                        # deadline = input("Enter deadline (YYYY-MM-DD): ").strip()
+                        deadline = ask_deadline(task)
                     if answer == "no":
                         print(f"will, the deadline will be blank value for the task {task}")
                     description = input("Enter task description: ").strip()
+                    duration = None
+                    while True:
+                        answer = input("Enter estimated duration in days (leave blank if unknown): ").strip()
+                        if answer == "":
+                            break
+                        try:
+                            duration = float(answer)
+                        except ValueError:
+                            duration = -1
+                        if duration >= 0:
+                            break
+                        print("Error: Duration must be a non-negative number. Please enter a valid value.")
 
                     try:
-                        scheduler.add_task(task, dependencies, priority, deadline, description)
+                        scheduler.add_task(task, dependencies, priority, deadline, description, duration=duration)
                         print(
-                            f"Task '{task}' added successfully with dependencies: {dependencies}, priority: {priority}, deadline: {deadline}, description: {description}")
+                            f"Task '{task}' added successfully with dependencies: {dependencies}, priority: {priority}, deadline: {format_deadline(deadline)}, description: {description}")
                         break
                     except ValueError as e:
                         print(f"Error: {e}. Please enter dependencies again.")
@@ -380,8 +1219,13 @@ def main():
                     print("Cannot perform topological sort due to a cycle.")
 
             elif choice == "5":
-                print("Visualizing the task graph...")
-                scheduler.visualize()
+                path = input("Save to a .svg, .png or .dot file (leave blank to open a window): ").strip()
+                if path:
+                    count = scheduler.visualize(path)
+                    print(f"Wrote {count} tasks to '{path}'.")
+                else:
+                    print("Visualizing the task graph...")
+                    scheduler.visualize()
 
             elif choice == "6":
                 sorted_tasks = scheduler.STBP()
@@ -408,18 +1252,20 @@ def main():
                     print("Tasks sorted by deadline:", end=" ")
                     for task in sorted_tasks:
                         deadline = scheduler.task_details[task]["deadline"]
-                        print(f"{task}[{deadline}]", end=" ")
+                        print(f"{task}[{format_deadline(deadline)}]", end=" ")
                     print()
                 else:
                     print("No tasks to sort by deadline.")
             elif choice == "9":
                 task = input("Enter the task name: ").strip()
                 scheduler.delete_task(task)
+                print(f"Task '{task}' has been successfully deleted. Its dependencies have been reassigned.")
             elif choice == "10":
                 old_task_name = input("Enter the task name to edit: ").strip()
                 new_task_name = input("Enter new task name: ").strip()
                 try:
                     scheduler.ETN(old_task_name, new_task_name)
+                    print(f"Task '{old_task_name}' has been renamed to '{new_task_name}'.")
                 except ValueError as e:
                     print(f"Error: {e}")
             elif choice == "11":
@@ -441,12 +1287,40 @@ def main():
                 except ValueError as e:
                     print(f"Error: {e}")
 
-            elif choice == "14":
+            elif choice in ("14", "15"):
+                by = "priority" if choice == "14" else "deadline"
+                sorted_tasks = scheduler.schedule(by)
+                if sorted_tasks:
+                    print(f"Tasks scheduled by {by}:", end=" ")
+                    for task in sorted_tasks:
+                        print(f"{task}[{scheduler.get_priority(task)}, {format_deadline(scheduler.task_details[task]['deadline'])}]", end=" ")
+                    print()
+                else:
+                    print("No tasks to schedule.")
+
+            elif choice == "16":
+                makespan, path, timings = scheduler.critical_path()
+                print(f"Total run time: {makespan} days. Critical path: {' -> '.join(map(str, path))}")
+                for task, timing in timings.items():
+                    flag = "  MISSES DEADLINE" if timing["late"] else ""
+                    print(f"{task}: start {timing['earliest_start']}-{timing['latest_start']}, "
+                          f"finish {timing['earliest_finish']}-{timing['latest_finish']}, slack {timing['slack']}{flag}")
+
+            elif choice == "17":
+                path = input("Enter the path of the .csv or .jsonl file: ").strip()
+                try:
+                    count = load_tasks(scheduler, path)
+                    print(f"Imported {count} tasks from '{path}'.")
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Error: {e}")
+
+            elif choice == "18":
+                checkpoint(scheduler, snapshot_path)
                 print("Exiting. Goodbye!")
                 break
 
             else:
-                print("Invalid choice. Please enter a number between 1 and 8.")
+                print("Invalid choice. Please enter a number between 1 and 18.")
 
         except ValueError as e:
             print(f"Error: {e}")
@@ -0,0 +1,64 @@
+"""Times loading a shuffled task file (dependencies pointing forward and backward).
+
+    python benchmarks/bench_bulk_load.py
+    python benchmarks/bench_bulk_load.py --tasks 100000 --format jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PaythonDraft_01 import TaskScheduler
+from loaders import load_tasks
+
+
+def write_tasks(path, tasks, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(tasks):
+        dependencies = sorted({f"task-{rng.randrange(i)}" for _ in range(min(i, rng.randint(0, 3)))})
+        deadline = f"{2025 + rng.randrange(3)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        rows.append((f"task-{i}", dependencies, rng.randint(0, 10), deadline, f"step {i}", rng.randint(1, 5)))
+    rng.shuffle(rows)  # file order no longer matches dependency order
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            writer = csv.writer(f)
+            writer.writerow(["task", "dependencies", "priority", "deadline", "description", "duration"])
+            for task, dependencies, priority, deadline, description, duration in rows:
+                writer.writerow([task, ",".join(dependencies), priority, deadline, description, duration])
+        else:
+            for task, dependencies, priority, deadline, description, duration in rows:
+                f.write(json.dumps({"task": task, "dependencies": dependencies, "priority": priority,
+                                    "deadline": deadline, "description": description, "duration": duration}) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=["csv", "jsonl"], nargs="+", default=["csv", "jsonl"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for file_format in args.format:
+            path = os.path.join(directory, f"tasks.{file_format}")
+            write_tasks(path, args.tasks)
+            size = os.path.getsize(path) / 2**20
+            for backend in ("networkx", "compact"):
+                scheduler = TaskScheduler(backend)
+                start = time.perf_counter()
+                count = load_tasks(scheduler, path)
+                elapsed = time.perf_counter() - start
+                assert count == args.tasks and scheduler.topological_sort() is not None
+                print(f"{file_format:>5} {size:7.1f} MB {backend:>9}: {count} tasks in {elapsed:6.2f}s "
+                      f"({count / elapsed:,.0f} tasks/s)")
+                del scheduler
+
+
+if __name__ == "__main__":
+    main()
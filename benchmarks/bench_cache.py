@@ -0,0 +1,62 @@
+"""Times the scheduler's reads computed from scratch against the same reads memoized.
+
+Every read is timed once right after a mutation (cold: the memoized results
+were just dropped) and then again on the unchanged graph (warm), where it
+only copies the memoized answer:
+
+    python benchmarks/bench_cache.py
+    python benchmarks/bench_cache.py --sizes 10000 100000 1000000 --workload layered
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PaythonDraft_01 import TaskScheduler
+from workloads import FIRST_DAY, WORKLOADS
+
+WARM_CALLS = 20
+
+
+def reads(scheduler, task):
+    return {
+        "detect_cycle": scheduler.detect_cycle,
+        "topological_sort": scheduler.topological_sort,
+        "STBP": scheduler.STBP,
+        "sort_by_deadline": scheduler.sort_by_deadline,
+        "schedule": scheduler.schedule,
+        "critical_path": lambda: scheduler.critical_path(FIRST_DAY),
+        "due_before": lambda: scheduler.due_before(date(2026, 1, 1)),
+        "next_due": lambda: scheduler.next_due(10, FIRST_DAY),
+        "descendants": lambda: scheduler.descendants(task),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--workload", choices=sorted(WORKLOADS), default="random")
+    parser.add_argument("--backend", choices=("networkx", "compact"), default="networkx")
+    args = parser.parse_args()
+
+    print(f"{'size':>9} {'read':>17} {'cold ms':>10} {'warm us':>10} {'speedup':>10}")
+    for size in args.sizes:
+        scheduler = TaskScheduler(args.backend)
+        scheduler.bulk_add(WORKLOADS[args.workload](size))
+        for name, read in reads(scheduler, "task-0").items():
+            scheduler.set_priority("task-0", 5)  # any mutation drops the memoized results
+            start = time.perf_counter()
+            read()
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(WARM_CALLS):
+                read()
+            warm = (time.perf_counter() - start) / WARM_CALLS
+            print(f"{size:>9} {name:>17} {cold * 1e3:>10.3f} {warm * 1e6:>10.3f} {cold / warm:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
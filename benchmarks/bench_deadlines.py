@@ -0,0 +1,60 @@
+"""Compares the deadline index with re-sorting every task for each query.
+
+    python benchmarks/bench_deadlines.py
+    python benchmarks/bench_deadlines.py --sizes 10000 1000000 --queries 1000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memory import build
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def scan_before(scheduler, day):
+    # What due_before costs without the index: sort everything, keep the early ones
+    details = scheduler.task_details
+    dated = [task for task in scheduler.graph if details[task]["deadline"] is not None]
+    dated.sort(key=lambda task: details[task]["deadline"])
+    return [task for task in dated if details[task]["deadline"] < day]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--backend", choices=("networkx", "compact"), default="networkx")
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rng = random.Random(size)
+        scheduler = build(args.backend, size)
+        names = list(scheduler.graph)
+        days = [date(2025, 1, 1) + timedelta(days=rng.randrange(3 * 365)) for _ in range(args.queries)]
+        print(f"{size} tasks ({args.backend} backend)")
+
+        _, elapsed = timed(lambda: [scan_before(scheduler, day) for day in days])
+        print(f"{'due_before by sorting':>28} {elapsed / len(days) * 1e3:9.3f} ms/query")
+        _, elapsed = timed(scheduler._deadline_index)
+        print(f"{'build deadline index':>28} {elapsed * 1e3:9.3f} ms")
+        _, elapsed = timed(lambda: [scheduler.due_before(day) for day in days])
+        print(f"{'due_before by index':>28} {elapsed / len(days) * 1e3:9.3f} ms/query")
+        _, elapsed = timed(lambda: [scheduler.next_due(10, day) for day in days])
+        print(f"{'next_due(10) by index':>28} {elapsed / len(days) * 1e6:9.3f} us/query")
+        moves = [(rng.choice(names), rng.choice(days)) for _ in range(10_000)]
+        _, elapsed = timed(lambda: [scheduler.set_deadline(task, day) for task, day in moves])
+        print(f"{'set_deadline keeping index':>28} {elapsed / len(moves) * 1e6:9.3f} us/update")
+
+
+if __name__ == "__main__":
+    main()
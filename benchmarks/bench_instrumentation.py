@@ -0,0 +1,60 @@
+"""Measures what enable_metrics() adds to cheap and expensive scheduler calls.
+
+    python benchmarks/bench_instrumentation.py
+    python benchmarks/bench_instrumentation.py --tasks 100000 --backend compact
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memory import build
+from PaythonDraft_01 import TaskScheduler
+
+
+def per_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def workload(backend, tasks, metrics):
+    scheduler = TaskScheduler(backend)
+    if metrics:
+        scheduler.enable_metrics()
+    start = time.perf_counter()
+    for i in range(tasks):
+        scheduler.add_task(f"task-{i}", [f"task-{i - 1}"] if i else None, i % 11)
+    return (time.perf_counter() - start) / tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--backend", choices=("networkx", "compact"), default="networkx")
+    args = parser.parse_args()
+
+    print(f"{args.tasks} tasks ({args.backend} backend)")
+    for metrics in (False, True):
+        label = "on" if metrics else "off"
+        elapsed = workload(args.backend, args.tasks, metrics)
+        print(f"{'add_task, metrics ' + label:>34} {elapsed * 1e6:9.2f} us/call")
+
+    scheduler = build(args.backend, args.tasks)
+    scheduler.topological_sort()
+    for metrics in (False, True):
+        label = "on" if metrics else "off"
+        if metrics:
+            scheduler.enable_metrics()
+        elapsed = per_call(lambda: scheduler.detect_cycle(), 100_000)
+        print(f"{'detect_cycle, order known, ' + label:>34} {elapsed * 1e9:9.0f} ns/call")
+        elapsed = per_call(scheduler.topological_sort, 20)
+        print(f"{'topological_sort, metrics ' + label:>34} {elapsed * 1e3:9.3f} ms/call")
+    print(scheduler.metrics.to_prometheus().count("\n"), "lines of Prometheus output")
+
+
+if __name__ == "__main__":
+    main()
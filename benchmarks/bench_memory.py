@@ -0,0 +1,71 @@
+"""Compares the memory held by the networkx and compact TaskScheduler backends.
+
+Each run builds the same synthetic project through add_task (up to three
+dependencies on earlier tasks, a priority, a deadline and a short description)
+and reports the bytes still allocated once the build is done:
+
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --sizes 10000 100000
+"""
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PaythonDraft_01 import TaskScheduler
+
+
+def build(backend, size, seed=0):
+    rng = random.Random(seed)
+    scheduler = TaskScheduler(backend)
+    for i in range(size):
+        dependencies = [f"task-{rng.randrange(i)}" for _ in range(min(i, rng.randint(0, 3)))]
+        deadline = None
+        if rng.random() < 0.5:
+            deadline = date(2025 + rng.randrange(3), rng.randint(1, 12), rng.randint(1, 28))
+        scheduler.add_task(f"task-{i}", list(dict.fromkeys(dependencies)), rng.randint(0, 10), deadline, f"step {i}")
+    if backend == "compact":
+        scheduler.graph.compact()
+    return scheduler
+
+
+def measure(backend, size):
+    # Time a plain build first; tracemalloc itself slows allocation-heavy code down a lot.
+    start = time.perf_counter()
+    build(backend, size)
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    scheduler = build(backend, size)
+    gc.collect()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    edges = scheduler.graph.number_of_edges()
+    del scheduler
+    return current, elapsed, edges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'tasks':>9} {'edges':>9} {'backend':>9} {'MB':>8} {'B/task':>8} {'build s':>8}")
+    for size in args.sizes:
+        results = {}
+        for backend in ("networkx", "compact"):
+            current, elapsed, edges = measure(backend, size)
+            results[backend] = current
+            print(f"{size:>9} {edges:>9} {backend:>9} {current / 2**20:>8.1f} {current / size:>8.0f} {elapsed:>8.1f}")
+        print(f"{'':>9} compact uses {results['compact'] / results['networkx']:.0%} of the networkx backend")
+
+
+if __name__ == "__main__":
+    main()
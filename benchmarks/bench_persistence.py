@@ -0,0 +1,58 @@
+"""Compares rebuilding a scheduler through add_task with snapshot load + journal replay.
+
+    python benchmarks/bench_persistence.py
+    python benchmarks/bench_persistence.py --tasks 100000 --journal 1000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memory import build
+from PaythonDraft_01 import TaskScheduler
+from persistence import Journal, checkpoint, open_journaled, save_snapshot
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--journal", type=int, default=10_000, help="mutations journaled after the snapshot")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot = os.path.join(directory, "tasks.snapshot")
+        journal = os.path.join(directory, "tasks.journal")
+        for backend in ("networkx", "compact"):
+            scheduler, elapsed = timed(build, backend, args.tasks)
+            print(f"{backend:>9}: rebuild {args.tasks} tasks through add_task  {elapsed:8.3f}s")
+            scheduler.topological_sort()
+            _, elapsed = timed(save_snapshot, scheduler, snapshot)
+            print(f"{backend:>9}: save snapshot ({os.path.getsize(snapshot) / 2**20:.1f} MB)    {elapsed:8.3f}s")
+
+            scheduler.journal = Journal(journal)
+            checkpoint(scheduler, snapshot)
+            for i in range(args.journal):
+                scheduler.add_task(f"late-{i}", [f"task-{i}"], i % 11, None, "journaled")
+                scheduler.edit_dependencies(f"task-{args.tasks - 1 - i}", [])
+            scheduler.journal.close()
+            del scheduler
+
+            loaded, elapsed = timed(open_journaled, TaskScheduler(backend), snapshot, journal)
+            assert loaded.graph.number_of_nodes() == args.tasks + args.journal
+            print(f"{backend:>9}: mmap snapshot + replay {2 * args.journal} journal records {elapsed:8.3f}s")
+            loaded.journal.close()
+            del loaded
+            os.remove(journal)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compares depends_on through the closure index with the search it replaces.
+
+    python benchmarks/bench_reachability.py
+    python benchmarks/bench_reachability.py --sizes 1000 20000 --queries 100000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import PaythonDraft_01
+from bench_memory import build
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def ask(scheduler, pairs):
+    return sum(scheduler.depends_on(task, other) for task, other in pairs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 20_000])
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    limit = PaythonDraft_01.REACHABILITY_LIMIT
+    for size in args.sizes:
+        rng = random.Random(size)
+        scheduler = build("networkx", size)
+        names = list(scheduler.graph)
+        pairs = [(rng.choice(names), rng.choice(names)) for _ in range(args.queries)]
+        print(f"{size} tasks, {scheduler.graph.number_of_edges()} edges")
+
+        scheduler.topological_sort()
+        PaythonDraft_01.REACHABILITY_LIMIT = -1
+        searched, elapsed = timed(ask, scheduler, pairs)
+        print(f"{'depends_on by search':>30} {elapsed / len(pairs) * 1e6:9.2f} us/query")
+
+        PaythonDraft_01.REACHABILITY_LIMIT = limit
+        _, elapsed = timed(scheduler._reach)
+        print(f"{'build closure index':>30} {elapsed:9.3f} s")
+        indexed, elapsed = timed(ask, scheduler, pairs)
+        assert indexed == searched
+        print(f"{'depends_on by index':>30} {elapsed / len(pairs) * 1e6:9.2f} us/query  ({indexed} true)")
+        _, elapsed = timed(lambda: [scheduler.descendants(task) for task, _ in pairs[:1000]])
+        print(f"{'descendants by index':>30} {elapsed:9.3f} ms/query")
+        _, elapsed = timed(lambda: [scheduler.add_task(f"late-{i}", [rng.choice(names)]) for i in range(1000)])
+        print(f"{'add_task keeping index':>30} {elapsed:9.3f} ms/task")
+
+        edges = scheduler.graph.number_of_edges()
+        for task in rng.sample(names, size // 10):
+            scheduler.delete_task(task)
+        print(f"{'delete 10% of tasks':>30} {edges} -> {scheduler.graph.number_of_edges()} edges")
+        removed, elapsed = timed(scheduler.transitive_reduction)
+        print(f"{'transitive reduction':>30} {elapsed:9.3f} s  ({len(removed)} redundant edges removed)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Times the layered layout and each file format on a large synthetic project.
+
+    python benchmarks/bench_render.py
+    python benchmarks/bench_render.py --tasks 10000 --formats svg dot
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memory import build
+from rendering import FORMATS, layered_layout, neighborhood, render
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--backend", choices=("networkx", "compact"), default="networkx")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    args = parser.parse_args()
+
+    scheduler = build(args.backend, args.tasks)
+    scheduler.topological_sort()
+    print(f"{args.tasks} tasks, {scheduler.graph.number_of_edges()} edges ({args.backend} backend)")
+    layout, elapsed = timed(layered_layout, scheduler)
+    print(f"{'layered layout':>28} {elapsed:8.3f}s  ({len(set(x for x, _, _ in layout.position.values()))} columns)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        for fmt in args.formats:
+            path = os.path.join(directory, f"tasks.{fmt}")
+            _, elapsed = timed(render, scheduler, path)
+            print(f"{'full graph -> ' + fmt:>28} {elapsed:8.3f}s  ({os.path.getsize(path) / 2**20:.1f} MB)")
+
+        middle = f"task-{args.tasks // 2}"
+        path = os.path.join(directory, "around.svg")
+        count, elapsed = timed(render, scheduler, path, around=middle, direction="ancestors")
+        print(f"{'ancestors of ' + middle + ' -> svg':>28} {elapsed:8.3f}s  ({count} tasks)")
+        groups = lambda task: f"block-{int(task.split('-')[1]) // 1000}"
+        count, elapsed = timed(render, scheduler, path, groups=groups)
+        print(f"{'collapsed by 1000 -> svg':>28} {elapsed:8.3f}s  ({count} boxes)")
+        _, elapsed = timed(neighborhood, scheduler, middle, "both")
+        print(f"{'neighborhood only':>28} {elapsed:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
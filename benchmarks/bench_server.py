@@ -0,0 +1,80 @@
+"""Measures requests per second through the task server with several concurrent clients.
+
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --clients 16 --requests 20000 --tcp
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PaythonDraft_01 import TaskScheduler
+from server import TaskClient, TaskServer
+
+
+async def run(args, directory):
+    server = TaskServer(TaskScheduler(args.backend))
+    if args.tcp:
+        host, port = await server.start(port=0)
+        connect = lambda: TaskClient.connect(host=host, port=port)
+    else:
+        path = await server.start(os.path.join(directory, "tasks.sock"))
+        connect = lambda: TaskClient.connect(path)
+    clients = [await connect() for _ in range(args.clients)]
+    per_client = args.requests // args.clients
+
+    async def writes(client, c):
+        for i in range(0, per_client, args.pipeline):
+            await asyncio.gather(*(client.call("add_task", task=f"c{c}-{j}", priority=j % 11,
+                                               dependencies=[f"c{c}-{j - 1}"] if j % 4 else None)
+                                   for j in range(i, min(i + args.pipeline, per_client))))
+
+    async def reads(client):
+        for i in range(0, per_client, args.pipeline):
+            await asyncio.gather(*(client.call("ready", limit=10) for _ in range(min(args.pipeline, per_client - i))))
+
+    async def jobs(client):
+        # The job-queue cycle: claim a ready task, then report it done
+        done = 0
+        while done < per_client // 2:
+            ready = await client.call("ready", limit=1, claim=True)
+            if not ready:
+                break
+            await client.call("complete", task=ready[0])
+            done += 2
+        return done
+
+    for label, work in (("add_task", lambda: [writes(client, c) for c, client in enumerate(clients)]),
+                        ("ready", lambda: [reads(client) for client in clients]),
+                        ("claim + complete", lambda: [jobs(client) for client in clients])):
+        start = time.perf_counter()
+        counts = await asyncio.gather(*work())
+        elapsed = time.perf_counter() - start
+        requests = sum(counts) if label == "claim + complete" else per_client * len(clients)
+        print(f"{label:>18} {requests / elapsed:10.0f} requests/s  ({requests} requests, {elapsed:.2f}s)")
+    print(f"{'':>18} {server.version} write batches applied")
+    for client in clients:
+        await client.close()
+    await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=20_000, help="requests per phase, split over the clients")
+    parser.add_argument("--pipeline", type=int, default=32, help="requests each client keeps in flight")
+    parser.add_argument("--backend", choices=("networkx", "compact"), default="networkx")
+    parser.add_argument("--tcp", action="store_true", help="localhost TCP instead of a Unix socket")
+    args = parser.parse_args()
+    print(f"{args.clients} clients, {args.pipeline} requests in flight each, "
+          f"{'TCP' if args.tcp else 'Unix socket'} ({args.backend} backend)")
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args, directory))
+
+
+if __name__ == "__main__":
+    main()
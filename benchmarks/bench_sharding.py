@@ -0,0 +1,70 @@
+"""Compares serial cycle check + sort + schedule with the sharded, multi-process version.
+
+The graph is many independent projects (random DAGs) in one scheduler:
+
+    python benchmarks/bench_sharding.py
+    python benchmarks/bench_sharding.py --projects 200 --tasks 5000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sharding
+from PaythonDraft_01 import TaskScheduler
+from workloads import random_dag
+
+
+def build(backend, projects, tasks):
+    scheduler = TaskScheduler(backend)
+    for project in range(projects):
+        scheduler.bulk_add({**record, "task": f"p{project}/{record['task']}",
+                            "dependencies": [f"p{project}/{dependency}" for dependency in record["dependencies"]]}
+                           for record in random_dag(tasks, seed=project))
+    if backend == "compact":
+        scheduler.graph.compact()
+    return scheduler
+
+
+def serial(scheduler):
+    scheduler.invalidate_order()
+    scheduler.detect_cycle()
+    scheduler.topological_sort()
+    return scheduler.schedule()
+
+
+def sharded(scheduler, workers):
+    scheduler.invalidate_order()
+    return scheduler.sharded_schedule(workers=workers).schedule
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--projects", type=int, default=100)
+    parser.add_argument("--tasks", type=int, default=5_000, help="tasks per project")
+    parser.add_argument("--backend", choices=("networkx", "compact"), default="networkx")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    scheduler = build(args.backend, args.projects, args.tasks)
+    print(f"{args.projects} projects x {args.tasks} tasks, {scheduler.graph.number_of_edges()} edges "
+          f"({args.backend} backend, {os.cpu_count()} CPUs)")
+    start = time.perf_counter()
+    shards = sharding.shard(scheduler)
+    print(f"{'find components':>22} {time.perf_counter() - start:8.3f}s  ({len(shards)} shards)")
+    start = time.perf_counter()
+    expected = serial(scheduler)
+    baseline = time.perf_counter() - start
+    print(f"{'serial':>22} {baseline:8.3f}s")
+    for workers in dict.fromkeys(args.workers):
+        start = time.perf_counter()
+        schedule = sharded(scheduler, workers)
+        elapsed = time.perf_counter() - start
+        assert len(schedule) == len(expected)
+        print(f"{f'sharded, {workers} workers':>22} {elapsed:8.3f}s  ({baseline / elapsed:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
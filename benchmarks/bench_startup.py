@@ -0,0 +1,89 @@
+"""Measures import time and cold-start latency of the one-shot CLI commands.
+
+Every sample is a fresh interpreter, so nothing is warm but the OS file cache:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --tasks 100000 --runs 20 --max-import-ms 150
+
+Exits with 1 if importing the scheduler loads networkx or matplotlib, or if
+the median import takes longer than --max-import-ms.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bench_memory import build
+from persistence import save_snapshot
+
+HEAVY_MODULES = ("networkx", "matplotlib")
+
+
+def median_ms(command, runs, cwd=ROOT):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=cwd, check=True, stdout=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def heaviest_imports(count=5):
+    # -X importtime writes "import time: self | cumulative | module" lines to stderr,
+    # indented two more spaces per level; level one is what PaythonDraft_01 imports directly
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import PaythonDraft_01"],
+                            cwd=ROOT, check=True, capture_output=True, text=True)
+    timings = []
+    for line in result.stderr.splitlines()[1:]:
+        _, cumulative, module = line.split("|")
+        if module.startswith("   ") and not module.startswith("     "):
+            timings.append((int(cumulative) / 1000, module.strip()))
+    return sorted(timings, reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000, help="size of the snapshot the commands read")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    check = "import sys, PaythonDraft_01; print(' '.join(m for m in %r if m in sys.modules))" % (HEAVY_MODULES,)
+    loaded = subprocess.run([sys.executable, "-c", check], cwd=ROOT, check=True,
+                            capture_output=True, text=True).stdout.split()
+
+    interpreter = median_ms([sys.executable, "-c", "pass"], args.runs)
+    imported = median_ms([sys.executable, "-c", "import PaythonDraft_01"], args.runs)
+    print(f"{'bare interpreter':>36} {interpreter:8.1f} ms")
+    print(f"{'import PaythonDraft_01':>36} {imported:8.1f} ms  ({imported - interpreter:.1f} ms over bare)")
+    for cumulative, module in heaviest_imports():
+        print(f"{'':>38}{module:<24} {cumulative:8.1f} ms")
+
+    script = os.path.join(ROOT, "PaythonDraft_01.py")
+    with tempfile.TemporaryDirectory() as directory:
+        scheduler = build("compact", args.tasks)
+        scheduler.topological_sort()
+        save_snapshot(scheduler, os.path.join(directory, "tasks.snapshot"))
+        del scheduler
+        for command in (["sort"], ["detect-cycle"], ["schedule", "--by", "priority"], ["schedule", "--by", "deadline"]):
+            elapsed = median_ms([sys.executable, script, *command], args.runs, cwd=directory)
+            print(f"{' '.join(command) + f' ({args.tasks} tasks)':>36} {elapsed:8.1f} ms")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: importing the scheduler loads {', '.join(loaded)}")
+        failed = True
+    if args.max_import_ms is not None and imported > args.max_import_ms:
+        print(f"FAIL: import takes {imported:.1f} ms, limit is {args.max_import_ms:.1f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
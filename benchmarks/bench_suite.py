@@ -0,0 +1,200 @@
+"""Times the core TaskScheduler operations on every synthetic workload and size.
+
+Each (workload, size, backend) builds a fresh scheduler through add_task and
+then times detect_cycle, topological_sort, STBP and sort_by_deadline (from
+scratch: the memoized results, the maintained order and the deadline index are
+dropped first; bench_cache.py times the memoized reads),
+delete_task and ETN (per call, over a sample of tasks).  delete_task_unread
+deletes the same sample from a second scheduler that was never read, whose
+first delete has to work out the topological order.  On the "cyclic"
+workload the planted cycles are timed instead: detect_cycle finding one, and
+add_task refusing an edge that would close one.
+
+Results are written as JSON, and can be compared against an earlier results
+file; the run then fails (exit 1) if anything got slower than the tolerance:
+
+    python benchmarks/bench_suite.py --output results.json
+    python benchmarks/bench_suite.py --sizes 1000 10000 100000 1000000 --output results.json
+    python benchmarks/bench_suite.py --baseline baseline.json --tolerance 0.25
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PaythonDraft_01 import CycleError, TaskScheduler
+from workloads import WORKLOADS, plant_cycles, planted_edges
+
+SAMPLE = 1000  # tasks deleted / renamed per measurement
+
+
+def best_of(repeat, function, prepare=None):
+    # Fastest of `repeat` runs; prepare() resets state before each one and is not timed
+    best = float("inf")
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build(records, backend):
+    scheduler = TaskScheduler(backend)
+    for record in records:
+        scheduler.add_task(record["task"], record["dependencies"], record["priority"], record["deadline"],
+                           record["description"], duration=record["duration"])
+    return scheduler
+
+
+def run_workload(workload, size, backend, repeat, seed):
+    # Returns {operation: (seconds, calls)}; seconds covers all the calls
+    records = WORKLOADS[workload](size, seed)
+    results = {}
+    gc.collect()
+    start = time.perf_counter()
+    scheduler = build(records, backend)
+    results["add_task"] = (time.perf_counter() - start, size)
+    if backend == "compact":
+        scheduler.graph.compact()
+
+    if workload == "cyclic":
+        edges = planted_edges(records, seed=seed)
+        task, ancestor = edges[0]
+        scheduler.add_task(f"{task}-closing", [task], None)
+        try:
+            start = time.perf_counter()
+            scheduler.edit_dependencies(ancestor, list(scheduler.graph.predecessors(ancestor)) + [f"{task}-closing"])
+        except CycleError:
+            results["reject_cycle"] = (time.perf_counter() - start, 1)
+        else:
+            raise AssertionError("Closing a planted cycle was not refused.")
+        plant_cycles(scheduler, edges)
+        results["detect_cycle"] = (best_of(repeat, scheduler.detect_cycle, scheduler.invalidate_order), 1)
+        assert scheduler.detect_cycle()[0]
+        return results
+
+    results["detect_cycle"] = (best_of(repeat, scheduler.detect_cycle, scheduler.invalidate_order), 1)
+    results["topological_sort"] = (best_of(repeat, scheduler.topological_sort, scheduler.invalidate_order), 1)
+    results["STBP"] = (best_of(repeat, scheduler.STBP, scheduler.invalidate_order), 1)
+
+    def drop_deadline_index():
+        scheduler.invalidate_order()
+        scheduler._deadlines = None
+    results["sort_by_deadline"] = (best_of(repeat, scheduler.sort_by_deadline, drop_deadline_index), 1)
+
+    scheduler.topological_sort()
+    rng = random.Random(seed)
+    sample = rng.sample([record["task"] for record in records], min(SAMPLE, size // 2))
+    start = time.perf_counter()
+    for task in sample:
+        scheduler.ETN(task, f"{task}-renamed")
+    results["ETN"] = (time.perf_counter() - start, len(sample))
+    start = time.perf_counter()
+    for task in sample:
+        scheduler.delete_task(f"{task}-renamed")
+    results["delete_task"] = (time.perf_counter() - start, len(sample))
+
+    del scheduler
+    unread = build(records, backend)
+    start = time.perf_counter()
+    for task in sample:
+        unread.delete_task(task)
+    results["delete_task_unread"] = (time.perf_counter() - start, len(sample))
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, tolerance, floor):
+    # Entries slower than baseline * (1 + tolerance); times under `floor` seconds are noise
+    before = {(r["workload"], r["size"], r["backend"], r["operation"]): r for r in baseline["results"]}
+    regressions = []
+    for result in results:
+        old = before.get((result["workload"], result["size"], result["backend"], result["operation"]))
+        if old is None or max(result["seconds"], old["seconds"]) < floor:
+            continue
+        ratio = result["seconds_per_call"] / old["seconds_per_call"] if old["seconds_per_call"] else float("inf")
+        result["baseline_seconds_per_call"] = old["seconds_per_call"]
+        result["ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(result)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--workloads", nargs="+", choices=sorted(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--backends", nargs="+", choices=("networkx", "compact"), default=["networkx"])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per whole-graph operation, fastest kept")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results file from an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline before failing (default: 0.25 = 25%%)")
+    parser.add_argument("--floor", type=float, default=0.001,
+                        help="ignore operations faster than this many seconds in both runs (default: 0.001)")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'workload':>10} {'size':>9} {'backend':>9} {'operation':>18} {'seconds':>10} {'us/call':>10}")
+    for size in args.sizes:
+        for workload in args.workloads:
+            for backend in args.backends:
+                timings = run_workload(workload, size, backend, args.repeat, args.seed)
+                for operation, (seconds, calls) in timings.items():
+                    results.append({"workload": workload, "size": size, "backend": backend, "operation": operation,
+                                    "calls": calls, "seconds": seconds, "seconds_per_call": seconds / calls})
+                    print(f"{workload:>10} {size:>9} {backend:>9} {operation:>18} {seconds:>10.4f} "
+                          f"{seconds / calls * 1e6:>10.2f}")
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.floor)
+        report["baseline"] = {"path": args.baseline, "commit": baseline.get("commit"), "tolerance": args.tolerance}
+        compared = sum("ratio" in result for result in results)
+        print(f"\nCompared {compared} timings with {args.baseline} (commit {baseline.get('commit')}).")
+        for result in regressions:
+            print(f"SLOWER {result['workload']} {result['size']} {result['backend']} {result['operation']}: "
+                  f"{result['baseline_seconds_per_call'] * 1e6:.2f} -> {result['seconds_per_call'] * 1e6:.2f} "
+                  f"us/call ({result['ratio']:.2f}x)")
+        if regressions:
+            status = 1
+        else:
+            print(f"No operation got more than {args.tolerance:.0%} slower.")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=1)
+            f.write("\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
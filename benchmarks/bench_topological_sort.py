@@ -0,0 +1,85 @@
+"""Checks that detect_cycle / topological_sort scale linearly in time and memory.
+
+Builds random DAGs of growing size straight into ``scheduler.graph`` and reports
+seconds and peak bytes per (V + E).  Roughly constant ratios across the sizes
+mean the engine is linear.  The default top size is 1M tasks and 5M edges:
+
+    python benchmarks/bench_topological_sort.py
+    python benchmarks/bench_topological_sort.py --nodes 100000 --edges 500000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PaythonDraft_01 import TaskScheduler
+
+
+def build_random_dag(nodes, edges, seed=0):
+    rng = random.Random(seed)
+    scheduler = TaskScheduler()
+    scheduler.graph.add_nodes_from(range(nodes))
+    pairs = ((rng.randrange(nodes), rng.randrange(nodes)) for _ in range(edges))
+    scheduler.graph.add_edges_from((min(u, v), max(u, v)) for u, v in pairs if u != v)
+    return scheduler
+
+
+def build_chain(nodes):
+    scheduler = TaskScheduler()
+    scheduler.graph.add_nodes_from(range(nodes))
+    scheduler.graph.add_edges_from((i, i + 1) for i in range(nodes - 1))
+    return scheduler
+
+
+def measure(scheduler, method):
+    # Drop the maintained order so every call pays for a full rebuild.
+    scheduler.invalidate_order()
+    start = time.perf_counter()
+    result = getattr(scheduler, method)()
+    elapsed = time.perf_counter() - start
+
+    scheduler.invalidate_order()
+    tracemalloc.start()
+    getattr(scheduler, method)()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--edges", type=int, default=5_000_000)
+    parser.add_argument("--steps", type=int, default=4, help="number of doubling sizes up to the top size")
+    args = parser.parse_args()
+
+    print(f"{'V':>10} {'E':>10} {'method':>17} {'seconds':>9} {'ns/(V+E)':>9} {'peak MB':>9} {'B/(V+E)':>8}")
+    for step in reversed(range(args.steps)):
+        nodes = max(1, args.nodes >> step)
+        edges = args.edges >> step
+        scheduler = build_random_dag(nodes, edges)
+        size = scheduler.graph.number_of_nodes() + scheduler.graph.number_of_edges()
+        for method in ("detect_cycle", "topological_sort"):
+            _, elapsed, peak = measure(scheduler, method)
+            print(f"{nodes:>10} {scheduler.graph.number_of_edges():>10} {method:>17} {elapsed:>9.3f} "
+                  f"{elapsed * 1e9 / size:>9.1f} {peak / 2**20:>9.1f} {peak / size:>8.1f}")
+        del scheduler
+
+    # A single chain as deep as the top size would overflow any recursive DFS.
+    scheduler = build_chain(args.nodes)
+    order, elapsed, _ = measure(scheduler, "topological_sort")
+    assert order == list(range(args.nodes))
+    print(f"chain of {args.nodes} tasks sorted in {elapsed:.3f}s without recursion")
+
+    scheduler.graph.add_edge(args.nodes - 1, 0)
+    (has_cycle, cycle), elapsed, _ = measure(scheduler, "detect_cycle")
+    assert has_cycle and cycle[0] == cycle[-1] and len(cycle) == args.nodes + 1
+    print(f"cycle through all {args.nodes} tasks found in {elapsed:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
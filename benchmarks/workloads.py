@@ -0,0 +1,81 @@
+"""Synthetic task graphs for the benchmarks, as add_task / bulk_add records.
+
+Every generator is deterministic for a given size and seed and returns a list of
+dicts with add_task's keyword names plus "task", in dependency order (a task
+only depends on tasks listed before it):
+
+    random_dag   up to three dependencies on any earlier task
+    chain        one long line, as deep as the graph is big
+    fan_out      one root that every other task depends on
+    layered      a pipeline of stages about sqrt(size) wide, each task
+                 depending on one to three tasks of the stage before
+    cyclic       random_dag plus planted_edges(), back edges that close cycles
+
+The scheduler refuses to create a cycle, so planted edges are put straight into
+scheduler.graph (plant_cycles) to time cycle detection on them.
+"""
+import math
+import random
+from datetime import date, timedelta
+
+FIRST_DAY = date(2025, 1, 1)
+
+
+def _record(rng, i, dependencies):
+    deadline = FIRST_DAY + timedelta(days=rng.randrange(3 * 365)) if rng.random() < 0.5 else None
+    return {"task": f"task-{i}", "dependencies": dependencies, "priority": rng.randint(0, 10),
+            "deadline": deadline, "description": f"step {i}", "duration": rng.randint(1, 5)}
+
+
+def random_dag(size, seed=0):
+    rng = random.Random(seed)
+    return [_record(rng, i, list(dict.fromkeys(f"task-{rng.randrange(i)}" for _ in range(min(i, rng.randint(0, 3))))))
+            for i in range(size)]
+
+
+def chain(size, seed=0):
+    rng = random.Random(seed)
+    return [_record(rng, i, [f"task-{i - 1}"] if i else []) for i in range(size)]
+
+
+def fan_out(size, seed=0):
+    rng = random.Random(seed)
+    return [_record(rng, i, ["task-0"] if i else []) for i in range(size)]
+
+
+def layered(size, seed=0):
+    rng = random.Random(seed)
+    width = max(1, math.isqrt(size))
+    records = []
+    for i in range(size):
+        stage_start = i // width * width
+        previous = range(max(0, stage_start - width), stage_start)
+        count = min(len(previous), rng.randint(1, 3))
+        records.append(_record(rng, i, [f"task-{j}" for j in rng.sample(previous, count)]))
+    return records
+
+
+def planted_edges(records, cycles=10, seed=0):
+    # Each edge runs from a task back to one of its ancestors, found by walking up to 50
+    # dependency steps, so it closes a cycle through the tasks walked over
+    rng = random.Random(seed)
+    dependencies = {record["task"]: record["dependencies"] for record in records}
+    starts = [task for task, found in dependencies.items() if found]
+    edges = []
+    for task in rng.sample(starts, min(cycles, len(starts))):
+        ancestor = task
+        for _ in range(rng.randint(1, 50)):
+            if not dependencies[ancestor]:
+                break
+            ancestor = rng.choice(dependencies[ancestor])
+        edges.append((task, ancestor))
+    return edges
+
+
+def plant_cycles(scheduler, edges):
+    scheduler.graph.add_edges_from(edges)
+    scheduler.invalidate_order()
+
+
+# "cyclic" is random_dag built as usual, then given planted_edges() by the benchmark
+WORKLOADS = {"random": random_dag, "chain": chain, "fan_out": fan_out, "layered": layered, "cyclic": random_dag}
@@ -0,0 +1,436 @@
+"""Array-backed storage for TaskScheduler(backend="compact").
+
+Task names are interned to integer ids and adjacency lives in CSR arrays
+(offsets + targets, one pair per direction).  Mutations go to a small delta
+(added edge lists, removed edge set, dead ids) that is folded back into the
+CSR arrays once it grows past a quarter of the graph, so the amortized cost of
+an edit stays O(1) while the bulk of the graph costs a few bytes per edge.
+"""
+import math
+from array import array
+from collections.abc import MutableMapping
+from datetime import date
+
+NO_PRIORITY = -128
+NO_DEADLINE = -2**31
+EPOCH = date(1970, 1, 1).toordinal()
+
+
+class CompactDiGraph:
+    def __init__(self):
+        self._ids = {}
+        self._names = []
+        self._base_nodes = 0
+        self._succ_offsets = array("q", [0])
+        self._succ_targets = array("i")
+        self._pred_offsets = array("q", [0])
+        self._pred_targets = array("i")
+        self._added_succ = {}
+        self._added_pred = {}
+        self._removed = set()
+        self._dead = 0
+        self._edge_count = 0
+        self._delta = 0
+
+    @classmethod
+    def from_csr(cls, names, succ_offsets, succ_targets, pred_offsets, pred_targets, buffer=None):
+        # The CSR buffers may be read-only memoryviews over an mmap'd snapshot (passed as
+        # buffer to keep it open): they are only ever read, and compact() replaces them.
+        graph = cls()
+        graph._buffer = buffer
+        graph._names = list(names)
+        graph._ids = {name: i for i, name in enumerate(graph._names)}
+        graph._base_nodes = len(graph._names)
+        graph._succ_offsets, graph._succ_targets = succ_offsets, succ_targets
+        graph._pred_offsets, graph._pred_targets = pred_offsets, pred_targets
+        graph._edge_count = len(succ_targets)
+        return graph
+
+    # ----- interning -----
+
+    def _id(self, node):
+        try:
+            return self._ids[node]
+        except KeyError:
+            raise KeyError(node) from None
+
+    def _live(self, i):
+        return self._names[i] is not None
+
+    def _succ_ids(self, i):
+        if i < self._base_nodes:
+            removed = self._removed
+            for k in range(self._succ_offsets[i], self._succ_offsets[i + 1]):
+                w = self._succ_targets[k]
+                if self._names[w] is not None and not (removed and (i, w) in removed):
+                    yield w
+        for w in self._added_succ.get(i, ()):
+            if self._names[w] is not None:
+                yield w
+
+    def _pred_ids(self, i):
+        if i < self._base_nodes:
+            removed = self._removed
+            for k in range(self._pred_offsets[i], self._pred_offsets[i + 1]):
+                w = self._pred_targets[k]
+                if self._names[w] is not None and not (removed and (w, i) in removed):
+                    yield w
+        for w in self._added_pred.get(i, ()):
+            if self._names[w] is not None:
+                yield w
+
+    # ----- the part of the networkx.DiGraph API TaskScheduler relies on -----
+
+    def __contains__(self, node):
+        try:
+            return node in self._ids
+        except TypeError:
+            return False
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, node):
+        return self.successors(node)
+
+    @property
+    def nodes(self):
+        return list(self._ids)
+
+    def number_of_nodes(self):
+        return len(self._ids)
+
+    def number_of_edges(self):
+        return self._edge_count
+
+    def successors(self, node):
+        names = self._names
+        return (names[w] for w in self._succ_ids(self._id(node)))
+
+    def predecessors(self, node):
+        names = self._names
+        return (names[w] for w in self._pred_ids(self._id(node)))
+
+    def _degree_bound(self, i, offsets, added):
+        # Upper bound on a degree: counts edges removed since the last compact() too
+        base = offsets[i + 1] - offsets[i] if i < self._base_nodes else 0
+        extra = added.get(i)
+        return base + len(extra) if extra is not None else base
+
+    def has_edge(self, u, v):
+        if u not in self._ids or v not in self._ids:
+            return False
+        i = self._ids[u]
+        j = self._ids[v]
+        # Scan whichever side is shorter: adding the 10,000th dependent of a hub task should
+        # not walk the hub's other 9,999
+        if (self._degree_bound(i, self._succ_offsets, self._added_succ)
+                <= self._degree_bound(j, self._pred_offsets, self._added_pred)):
+            return any(w == j for w in self._succ_ids(i))
+        return any(w == i for w in self._pred_ids(j))
+
+    def in_degree(self, node=None):
+        if node is not None:
+            return sum(1 for _ in self._pred_ids(self._id(node)))
+        return ((name, sum(1 for _ in self._pred_ids(i))) for name, i in self._ids.items())
+
+    def edges(self):
+        names = self._names
+        for name, i in self._ids.items():
+            for w in self._succ_ids(i):
+                yield name, names[w]
+
+    def add_node(self, node):
+        if node in self._ids:
+            return
+        self._ids[node] = len(self._names)
+        self._names.append(node)
+
+    def add_nodes_from(self, nodes):
+        for node in nodes:
+            self.add_node(node)
+
+    def add_edge(self, u, v):
+        self.add_node(u)
+        self.add_node(v)
+        if self.has_edge(u, v):
+            return
+        i = self._ids[u]
+        j = self._ids[v]
+        if (i, j) in self._removed:
+            self._removed.discard((i, j))
+        else:
+            self._added_succ.setdefault(i, array("i")).append(j)
+            self._added_pred.setdefault(j, array("i")).append(i)
+        self._edge_count += 1
+        self._changed()
+
+    def add_edges_from(self, edges):
+        # Batch insert: duplicates within the batch collapse in a set, and the has_edge scan
+        # is only needed when the target already had incoming edges before the batch.
+        batch = set()
+        for u, v in edges:
+            self.add_node(u)
+            self.add_node(v)
+            batch.add((self._ids[u], self._ids[v]))
+        names = self._names
+        new_edges = []
+        revived = []
+        for i, j in batch:
+            if j < self._base_nodes or j in self._added_pred:
+                if (i, j) in self._removed:
+                    revived.append((i, j))
+                    continue
+                if self.has_edge(names[i], names[j]):
+                    continue
+            new_edges.append((i, j))
+        for pair in revived:
+            self._removed.discard(pair)
+        for i, j in new_edges:
+            self._added_succ.setdefault(i, array("i")).append(j)
+            self._added_pred.setdefault(j, array("i")).append(i)
+        self._edge_count += len(new_edges) + len(revived)
+        self._delta += len(new_edges) + len(revived) - 1
+        self._changed()
+
+    def remove_edge(self, u, v):
+        if not self.has_edge(u, v):
+            raise ValueError(f"Edge '{u}' -> '{v}' does not exist.")
+        i = self._ids[u]
+        j = self._ids[v]
+        added = self._added_succ.get(i)
+        if added is not None and j in added:
+            added.remove(j)
+            self._added_pred[j].remove(i)
+        else:
+            self._removed.add((i, j))
+        self._edge_count -= 1
+        self._changed()
+
+    def remove_node(self, node):
+        i = self._ids.pop(node, None)
+        if i is None:
+            raise ValueError(f"Task '{node}' does not exist.")
+        degree = sum(1 for w in self._succ_ids(i) if w != i) + sum(1 for _ in self._pred_ids(i))
+        self._edge_count -= degree
+        self._names[i] = None
+        self._added_succ.pop(i, None)
+        self._added_pred.pop(i, None)
+        self._dead += 1
+        self._changed()
+
+    def rename_node(self, old, new):
+        i = self._ids.pop(old)
+        self._ids[new] = i
+        self._names[i] = new
+
+    def to_networkx(self):
+        import networkx as nx
+
+        graph = nx.DiGraph()
+        graph.add_nodes_from(self._ids)
+        graph.add_edges_from(self.edges())
+        return graph
+
+    # ----- CSR maintenance -----
+
+    def _changed(self):
+        self._delta += 1
+        if self._delta > 1024 + (self._edge_count + len(self._ids)) // 4:
+            self.compact()
+
+    def compact(self):
+        """Fold the delta into fresh CSR arrays and renumber the live tasks densely."""
+        old_ids = list(self._ids.values())
+        remap = array("i", [-1]) * len(self._names)
+        for new_id, old_id in enumerate(old_ids):
+            remap[old_id] = new_id
+        n = len(old_ids)
+
+        succ_offsets = array("q", [0]) * (n + 1)
+        for new_id, old_id in enumerate(old_ids):
+            succ_offsets[new_id + 1] = succ_offsets[new_id] + sum(1 for _ in self._succ_ids(old_id))
+        succ_targets = array("i", [0]) * succ_offsets[n]
+        pred_offsets = array("q", [0]) * (n + 1)
+        for new_id, old_id in enumerate(old_ids):
+            k = succ_offsets[new_id]
+            for w in self._succ_ids(old_id):
+                succ_targets[k] = remap[w]
+                pred_offsets[remap[w] + 1] += 1
+                k += 1
+        for new_id in range(n):
+            pred_offsets[new_id + 1] += pred_offsets[new_id]
+        pred_targets = array("i", [0]) * pred_offsets[n]
+        fill = array("q", pred_offsets)
+        for new_id in range(n):
+            for k in range(succ_offsets[new_id], succ_offsets[new_id + 1]):
+                w = succ_targets[k]
+                pred_targets[fill[w]] = new_id
+                fill[w] += 1
+
+        self._names = [self._names[old_id] for old_id in old_ids]
+        self._ids = {name: new_id for new_id, name in enumerate(self._names)}
+        self._base_nodes = n
+        self._succ_offsets, self._succ_targets = succ_offsets, succ_targets
+        self._pred_offsets, self._pred_targets = pred_offsets, pred_targets
+        self._added_succ = {}
+        self._added_pred = {}
+        self._removed = set()
+        self._dead = 0
+        self._delta = 0
+
+
+class _TaskRecord(MutableMapping):
+    # Dict-like view of one row so task_details[task]["priority"] = ... keeps working.
+    __slots__ = ("_details", "_task")
+
+    def __init__(self, details, task):
+        self._details = details
+        self._task = task
+
+    def __getitem__(self, key):
+        return self._details._get_field(self._task, key)
+
+    def __setitem__(self, key, value):
+        self._details._set_field(self._task, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError("Task fields cannot be removed.")
+
+    def __iter__(self):
+        return iter(CompactTaskDetails.FIELDS)
+
+    def __len__(self):
+        return len(CompactTaskDetails.FIELDS)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class CompactTaskDetails(MutableMapping):
+    """task_details replacement storing each field in a typed column.
+
+    priority is an int8 column, deadline an int32 column of days since
+    1970-01-01 (the same encoding snapshots use), and dependencies are read
+    from the graph instead of being copied per task.
+    """
+
+    FIELDS = ("dependencies", "priority", "deadline", "description", "action", "duration")
+
+    def __init__(self, graph):
+        self._graph = graph
+        self._rows = {}
+        self._free = []
+        self._priority = array("b")
+        self._deadline = array("i")
+        self._description = []
+        self._duration = array("d")
+        self._action = {}
+
+    @classmethod
+    def from_columns(cls, graph, names, priority, deadline, duration, description):
+        # Columns must be writable arrays (and a list for descriptions), one entry per name
+        details = cls(graph)
+        details._rows = {name: row for row, name in enumerate(names)}
+        details._priority = priority
+        details._deadline = deadline
+        details._duration = duration
+        details._description = description
+        return details
+
+    def __getitem__(self, task):
+        if task not in self._rows:
+            raise KeyError(task)
+        return _TaskRecord(self, task)
+
+    def __setitem__(self, task, details):
+        row = self._rows.get(task)
+        if row is None:
+            if self._free:
+                row = self._free.pop()
+            else:
+                row = len(self._description)
+                self._priority.append(NO_PRIORITY)
+                self._deadline.append(NO_DEADLINE)
+                self._description.append(None)
+                self._duration.append(math.nan)
+            self._rows[task] = row
+        for key in ("priority", "deadline", "description", "action", "duration"):
+            self._set_field(task, key, details.get(key))
+
+    def __delitem__(self, task):
+        row = self._rows.pop(task)
+        self._description[row] = None
+        self._action.pop(row, None)
+        self._free.append(row)
+
+    def pop(self, task, *default):
+        if task not in self._rows:
+            if default:
+                return default[0]
+            raise KeyError(task)
+        record = dict(self[task])
+        del self[task]
+        return record
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def _get_field(self, task, key):
+        row = self._rows[task]
+        if key == "priority":
+            priority = self._priority[row]
+            return None if priority == NO_PRIORITY else priority
+        if key == "deadline":
+            return unpack_deadline(self._deadline[row])
+        if key == "description":
+            return self._description[row]
+        if key == "duration":
+            duration = self._duration[row]
+            return None if math.isnan(duration) else duration
+        if key == "action":
+            return self._action.get(row)
+        if key == "dependencies":
+            return list(self._graph.predecessors(task)) if task in self._graph else []
+        raise KeyError(key)
+
+    def _set_field(self, task, key, value):
+        row = self._rows[task]
+        if key == "priority":
+            if value is None:
+                value = NO_PRIORITY
+            elif not -127 <= value <= 127:
+                raise ValueError(f"Priority {value} does not fit the compact backend's int8 column.")
+            self._priority[row] = value
+        elif key == "deadline":
+            self._deadline[row] = pack_deadline(value)
+        elif key == "description":
+            self._description[row] = value
+        elif key == "duration":
+            self._duration[row] = math.nan if value is None else value
+        elif key == "action":
+            # Sparse: most tasks carry no callable, so only rows that do are stored
+            if value is None:
+                self._action.pop(row, None)
+            else:
+                self._action[row] = value
+        elif key != "dependencies":
+            raise KeyError(key)
+
+
+def pack_deadline(deadline):
+    if deadline is None:
+        return NO_DEADLINE
+    return deadline.toordinal() - EPOCH
+
+
+def unpack_deadline(packed):
+    if packed == NO_DEADLINE:
+        return None
+    return date.fromordinal(packed + EPOCH)
@@ -0,0 +1,91 @@
+"""Calendar deadlines and the sorted index behind TaskScheduler.due_before / next_due / overdue.
+
+Deadlines are datetime.date values, or None for "no deadline".  to_date()
+also accepts "YYYY-MM-DD" strings, which is what the journal and the CSV/JSONL
+loaders carry.
+
+DeadlineIndex keeps tasks bucketed by due day, with the distinct days in one
+sorted list.  Adding, moving or removing a deadline is a dict update plus a
+bisect over the distinct days, and range queries bisect to their first day and
+then only touch the tasks they return.
+"""
+from bisect import bisect_left, insort
+from datetime import date
+
+
+def to_date(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip())
+        except ValueError:
+            raise ValueError(f"Deadline must be a valid YYYY-MM-DD date, got '{value}'.") from None
+    raise ValueError(f"Deadline must be a date or a YYYY-MM-DD string, got {value!r}.")
+
+
+def format_deadline(deadline):
+    return deadline.isoformat() if deadline is not None else "----"
+
+
+class DeadlineIndex:
+    def __init__(self, deadlines=()):
+        # deadlines: (task, date or None) pairs
+        self._due = {}    # task -> ordinal of its deadline
+        self._tasks = {}  # ordinal -> {task: None}, tasks due that day in insertion order
+        for task, deadline in deadlines:
+            if deadline is not None:
+                day = deadline.toordinal()
+                self._due[task] = day
+                self._tasks.setdefault(day, {})[task] = None
+        self._days = sorted(self._tasks)
+
+    def __len__(self):
+        return len(self._due)
+
+    def __contains__(self, task):
+        return task in self._due
+
+    def add(self, task, deadline):
+        if deadline is None:
+            return
+        day = deadline.toordinal()
+        self._due[task] = day
+        tasks = self._tasks.get(day)
+        if tasks is None:
+            tasks = self._tasks[day] = {}
+            insort(self._days, day)
+        tasks[task] = None
+
+    def remove(self, task):
+        day = self._due.pop(task, None)
+        if day is None:
+            return
+        tasks = self._tasks[day]
+        del tasks[task]
+        if not tasks:
+            del self._tasks[day]
+            del self._days[bisect_left(self._days, day)]
+
+    def move(self, task, deadline):
+        self.remove(task)
+        self.add(task, deadline)
+
+    def rename(self, old, new):
+        day = self._due.get(old)
+        self.remove(old)
+        if day is not None:
+            self.add(new, date.fromordinal(day))
+
+    def between(self, start=None, end=None):
+        # Tasks due on start or later and strictly before end, earliest first; None means open-ended
+        days = self._days
+        first = 0 if start is None else bisect_left(days, start.toordinal())
+        last = len(days) if end is None else bisect_left(days, end.toordinal())
+        for i in range(first, last):
+            yield from self._tasks[days[i]]
+
+    def __iter__(self):
+        return self.between()
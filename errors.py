@@ -0,0 +1,13 @@
+"""Exceptions shared by the scheduler and the modules built around it.
+
+They live here rather than in PaythonDraft_01.py: run as a script, that module
+is __main__, and importing it again from executor.py or server.py would load a
+second copy with its own, different exception classes.
+"""
+
+
+class CycleError(ValueError):
+    # Raised when tasks would depend on themselves; cycle is closed, e.g. ['a', 'b', 'a']
+    def __init__(self, message, cycle):
+        super().__init__(message)
+        self.cycle = cycle
@@ -0,0 +1,130 @@
+"""Runs the actions attached to a TaskScheduler's tasks in dependency order.
+
+Each task may carry a zero-argument callable (add_task(..., action=...)).
+TaskExecutor keeps an in-degree counter per task, hands every task whose
+dependencies have finished to a thread pool, a process pool or the asyncio
+loop, and releases its successors as soon as it completes.  When more tasks are
+ready than there are free workers, the ready heap decides who goes first using
+the same priority/deadline key as TaskScheduler.iter_schedule.
+
+In "process" mode actions and their results are pickled to reach the worker
+processes, so actions have to be module-level functions (or functools.partial
+of one); a lambda or a nested function fails with "Can't pickle".  An
+`async def` action is awaited on the loop in "asyncio" mode and run with
+asyncio.run() inside the worker in the other two.
+"""
+import asyncio
+import heapq
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from errors import CycleError
+
+
+def _call(action):
+    # Runs one action in a pool worker; an async one gets an event loop of its own there
+    result = action()
+    if asyncio.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+class TaskExecutor:
+    def __init__(self, scheduler, mode="thread", max_workers=None, by="priority"):
+        if mode not in ("thread", "process", "asyncio"):
+            raise ValueError(f"Unknown executor mode '{mode}', expected 'thread', 'process' or 'asyncio'.")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be at least 1.")
+        self.scheduler = scheduler
+        self.mode = mode
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.key = scheduler.schedule_key(by)
+
+    def _start(self):
+        has_cycle, cycle = self.scheduler.detect_cycle()
+        if has_cycle:
+            raise CycleError(f"Cannot run tasks because of the cycle: {cycle}", cycle)
+        self._in_degree = dict(self.scheduler.graph.in_degree())
+        self._ready = []
+        self._counter = 0
+        self.results = {}
+        for task, degree in self._in_degree.items():
+            if degree == 0:
+                self._push(task)
+
+    def _push(self, task):
+        heapq.heappush(self._ready, (self.key(task), self._counter, task))
+        self._counter += 1
+
+    def _next_action(self):
+        # Pops the next ready task that actually has work; tasks without an action finish on the spot
+        while self._ready:
+            _, _, task = heapq.heappop(self._ready)
+            action = self.scheduler.task_details[task].get("action")
+            if action is not None:
+                return task, action
+            self._finish(task, None)
+        return None, None
+
+    def _finish(self, task, result):
+        self.results[task] = result
+        for successor in self.scheduler.graph.successors(task):
+            self._in_degree[successor] -= 1
+            if self._in_degree[successor] == 0:
+                self._push(successor)
+
+    def run(self):
+        if self.mode == "asyncio":
+            return asyncio.run(self.run_async())
+        self._start()
+        pool_class = ThreadPoolExecutor if self.mode == "thread" else ProcessPoolExecutor
+        with pool_class(max_workers=self.max_workers) as pool:
+            running = {}
+            while True:
+                while len(running) < self.max_workers:
+                    task, action = self._next_action()
+                    if task is None:
+                        break
+                    running[pool.submit(_call, action)] = task
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        for pending in running:
+                            pending.cancel()
+                        raise RuntimeError(f"Task '{task}' failed: {e}") from e
+                    self._finish(task, result)
+        return self.results
+
+    async def run_async(self):
+        # Coroutine functions are awaited on the loop, plain callables go to the loop's default executor
+        self._start()
+        loop = asyncio.get_running_loop()
+        running = {}
+        while True:
+            while len(running) < self.max_workers:
+                task, action = self._next_action()
+                if task is None:
+                    break
+                if asyncio.iscoroutinefunction(action):
+                    future = asyncio.ensure_future(action())
+                else:
+                    future = loop.run_in_executor(None, _call, action)
+                running[future] = task
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    for pending in running:
+                        pending.cancel()
+                    raise RuntimeError(f"Task '{task}' failed: {e}") from e
+                self._finish(task, result)
+        return self.results
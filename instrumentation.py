@@ -0,0 +1,204 @@
+"""Optional call counters, latency histograms and graph-size gauges for a TaskScheduler.
+
+Instrumentation is off by default and then costs nothing: Metrics.attach()
+shadows the scheduler's public methods with timing wrappers on that one
+instance, and detach() deletes them again, so an uninstrumented scheduler runs
+exactly the class's own methods.  Calls a public method makes to another one
+(critical_path -> topological_sort, say) are counted for both.
+
+Latencies go into fixed log-spaced buckets, so recording a call is a few integer
+operations and the memory used does not grow with the number of calls.
+Gauges (tasks, dependencies, index sizes) are read from the scheduler when the
+stats are exported, as JSON (to_dict / to_json) or in the Prometheus text
+exposition format (to_prometheus).
+
+profile_call() runs any call under cProfile and dumps the stats to a file for
+pstats / snakeviz, or prints the most expensive functions.
+"""
+import json
+import math
+import sys
+import time
+
+# Latencies are bucketed by powers of 4 nanoseconds, 1 us (4^5 ns) up to 17 s (4^17 ns), plus a
+# last, open-ended bucket for anything slower.  A duration of at most 4^k ns has
+# (ns - 1).bit_length() <= 2k, so SLOT maps that bit length straight to the bucket's index.
+FIRST_BUCKET_POWER = 5
+BUCKETS = tuple(4 ** power / 1e9 for power in range(FIRST_BUCKET_POWER, 18))  # upper bounds in seconds
+SLOT = tuple(min(max((bit_length + 1) // 2 - FIRST_BUCKET_POWER, 0), len(BUCKETS)) for bit_length in range(65))
+METHODS = ("add_task", "bulk_add", "update_task", "set_priority", "set_description", "set_deadline",
+           "set_duration", "delete_task", "edit_dependencies", "ETN", "transitive_reduction",
+           "detect_cycle", "topological_sort", "STBP", "sort_by_deadline", "due_before", "overdue",
+           "next_due", "depends_on", "ancestors", "descendants", "critical_path", "schedule",
+           "sharded_schedule", "visualize")
+
+
+class Histogram:
+    __slots__ = ("counts", "sum")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0  # nanoseconds
+
+    def observe(self, nanoseconds):
+        self.counts[SLOT[(nanoseconds - 1).bit_length()]] += 1
+        self.sum += nanoseconds
+
+    def clear(self):
+        self.counts[:] = [0] * len(self.counts)
+        self.sum = 0
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th call (coarse, but free to keep);
+        # None when that is the open-ended bucket
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (math.inf,), self.counts):
+            seen += count
+            if count and seen >= rank:
+                return bound if bound != math.inf else None
+        return 0.0
+
+
+class Metrics:
+    def __init__(self, methods=METHODS):
+        self.methods = tuple(methods)
+        self.errors = dict.fromkeys(self.methods, 0)
+        self.latency = {name: Histogram() for name in self.methods}
+        self.scheduler = None
+
+    def calls(self, name):
+        return self.latency[name].count
+
+    def attach(self, scheduler):
+        if self.scheduler is not None:
+            raise ValueError("These metrics are already attached to a scheduler.")
+        for name in self.methods:
+            if not hasattr(scheduler, name):
+                raise ValueError(f"TaskScheduler has no method '{name}' to instrument.")
+        for name in self.methods:
+            # Bound method of the class, looked up once; the wrapper shadows it on this instance
+            setattr(scheduler, name, self._wrap(name, getattr(scheduler, name)))
+        self.scheduler = scheduler
+        return self
+
+    def detach(self):
+        if self.scheduler is not None:
+            for name in self.methods:
+                self.scheduler.__dict__.pop(name, None)
+            self.scheduler = None
+
+    def _wrap(self, name, method):
+        # Histogram.observe inlined: on a call that takes a microsecond, a second Python call
+        # to record it would be a good part of the overhead
+        errors = self.errors
+        histogram = self.latency[name]
+        counts = histogram.counts
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            except BaseException:
+                errors[name] += 1
+                raise
+            finally:
+                elapsed = clock() - start
+                counts[SLOT[(elapsed - 1).bit_length()]] += 1
+                histogram.sum += elapsed
+
+        timed.__name__ = timed.__qualname__ = name
+        timed.__doc__ = method.__doc__
+        timed.__wrapped__ = method
+        return timed
+
+    def reset(self):
+        # In place: the wrappers hold on to these dicts and histograms
+        for name in self.methods:
+            self.errors[name] = 0
+            self.latency[name].clear()
+
+    def gauges(self):
+        scheduler = self.scheduler
+        if scheduler is None:
+            return {}
+        reachability = scheduler._reachability
+        deadlines = scheduler._deadlines
+        return {
+            "tasks": scheduler.graph.number_of_nodes(),
+            "dependencies": scheduler.graph.number_of_edges(),
+            "order_known": int(scheduler._order is not None),
+            "reachability_index_tasks": len(reachability) if reachability is not None else 0,
+            "deadline_index_tasks": len(deadlines) if deadlines is not None else 0,
+            "graph_version": scheduler.version,
+            "cached_results": len(scheduler._results) + len(scheduler._queries),
+        }
+
+    def to_dict(self):
+        methods = {}
+        for name in self.methods:
+            histogram = self.latency[name]
+            calls = histogram.count
+            if not calls:
+                continue
+            methods[name] = {
+                "calls": calls,
+                "errors": self.errors[name],
+                "seconds_total": histogram.sum / 1e9,
+                "seconds_p50": histogram.quantile(0.5),
+                "seconds_p99": histogram.quantile(0.99),
+                "buckets": {_bound(bound): count for bound, count in
+                            zip(BUCKETS + (math.inf,), histogram.counts) if count},
+            }
+        return {"methods": methods, "gauges": self.gauges()}
+
+    def to_json(self, indent=None):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix="task_scheduler"):
+        lines = [f"# HELP {prefix}_calls_total Calls to each TaskScheduler method.",
+                 f"# TYPE {prefix}_calls_total counter"]
+        lines += [f'{prefix}_calls_total{{method="{name}"}} {self.calls(name)}' for name in self.methods]
+        lines += [f"# HELP {prefix}_errors_total Calls that raised an exception.",
+                  f"# TYPE {prefix}_errors_total counter"]
+        lines += [f'{prefix}_errors_total{{method="{name}"}} {self.errors[name]}' for name in self.methods]
+        lines += [f"# HELP {prefix}_call_duration_seconds Time spent in each TaskScheduler method.",
+                  f"# TYPE {prefix}_call_duration_seconds histogram"]
+        for name in self.methods:
+            histogram = self.latency[name]
+            cumulative = 0
+            for bound, count in zip(BUCKETS + (math.inf,), histogram.counts):
+                cumulative += count
+                lines.append(f'{prefix}_call_duration_seconds_bucket{{method="{name}",le="{_bound(bound)}"}} '
+                             f'{cumulative}')
+            lines.append(f'{prefix}_call_duration_seconds_sum{{method="{name}"}} {histogram.sum / 1e9!r}')
+            lines.append(f'{prefix}_call_duration_seconds_count{{method="{name}"}} {histogram.count}')
+        for gauge, value in self.gauges().items():
+            lines += [f"# TYPE {prefix}_{gauge} gauge", f"{prefix}_{gauge} {value}"]
+        return "\n".join(lines) + "\n"
+
+
+def _bound(bound):
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+def profile_call(function, *args, path=None, sort="cumulative", limit=25, **kwargs):
+    # Runs function(*args, **kwargs) under cProfile and returns its result. The stats are
+    # dumped to path (open with pstats or snakeviz) or, without one, the top `limit`
+    # functions are printed to stderr
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(function, *args, **kwargs)
+    finally:
+        if path is not None:
+            profiler.dump_stats(path)
+        else:
+            pstats.Stats(profiler, stream=sys.stderr).sort_stats(sort).print_stats(limit)
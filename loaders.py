@@ -0,0 +1,123 @@
+"""Streaming CSV / JSONL readers feeding TaskScheduler.bulk_add.
+
+Both formats carry one task per row/line, in any order:
+
+    task,dependencies,priority,deadline,description,duration
+    deploy,"build,test",8,2025-03-01,Ship it,0.5
+
+    {"task": "deploy", "dependencies": ["build", "test"], "priority": 8,
+     "deadline": "2025-03-01", "description": "Ship it", "duration": 0.5}
+
+Rows are parsed lazily, so only the graph being built is held in memory, never
+the whole file.  Every column but task is optional.
+"""
+import csv
+import json
+import os
+
+from deadlines import to_date
+
+
+def parse_priority(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value.isdigit():
+            raise ValueError(f"Priority must be a number [0, 10], got '{value}'.")
+        value = int(value)
+    if isinstance(value, bool) or not isinstance(value, int) or not 0 <= value <= 10:
+        raise ValueError(f"Priority must be a number [0, 10], got {value!r}.")
+    return value
+
+
+def parse_deadline(value):
+    # "YYYY-MM-DD" text (or a date); see deadlines.to_date
+    return to_date(value)
+
+
+def parse_duration(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValueError(f"Duration must be a non-negative number, got '{value}'.") from None
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not value >= 0:
+        raise ValueError(f"Duration must be a non-negative number, got {value!r}.")
+    return float(value)
+
+
+def parse_description(value):
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"Description must be text, got {value!r}.")
+    return value.strip()
+
+
+def parse_dependencies(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [dep.strip() for dep in value.split(",") if dep.strip()]
+    if not isinstance(value, list) or not all(isinstance(dep, str) for dep in value):
+        raise ValueError(f"Dependencies must be a list of task names, got {value!r}.")
+    return value
+
+
+def _record(row, where):
+    task = row.get("task")
+    if isinstance(task, str):
+        task = task.strip()
+    if task is None or task == "":
+        raise ValueError(f"{where}: missing task name.")
+    if not isinstance(task, str):
+        raise ValueError(f"{where}: task name must be text, got {task!r}.")
+    try:
+        return {
+            "task": task,
+            "dependencies": parse_dependencies(row.get("dependencies")),
+            "priority": parse_priority(row.get("priority")),
+            "deadline": parse_deadline(row.get("deadline")),
+            "description": parse_description(row.get("description")),
+            "duration": parse_duration(row.get("duration")),
+        }
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}") from None
+
+
+def iter_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or "task" not in reader.fieldnames:
+            raise ValueError(f"'{path}' needs a header row with at least a 'task' column.")
+        for row in reader:
+            yield _record(row, f"{path}:{reader.line_num}")
+
+
+def iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            where = f"{path}:{line_number}"
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{where}: not valid JSON ({e}).") from None
+            if not isinstance(row, dict):
+                raise ValueError(f"{where}: expected a JSON object, got {row!r}.")
+            yield _record(row, where)
+
+
+def load_tasks(scheduler, path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        records = iter_csv(path)
+    elif extension in (".jsonl", ".ndjson"):
+        records = iter_jsonl(path)
+    else:
+        raise ValueError(f"Unsupported file type '{extension}', expected .csv or .jsonl.")
+    return scheduler.bulk_add(records)
@@ -0,0 +1,316 @@
+"""Binary snapshots and an append-only mutation journal for TaskScheduler.
+
+A snapshot is a fixed header followed by 8-byte aligned sections: task names,
+CSR adjacency in both directions, the typed task columns and the maintained
+topological order.  load_snapshot() memory-maps the file; on the compact
+backend the adjacency arrays are used straight from the mapping, so loading
+costs little more than decoding the names.
+
+The journal is one JSON record per line, appended by the scheduler after every
+successful mutation.  open_journaled() restores a scheduler as snapshot +
+journal replay, and checkpoint() folds the journal back into a new snapshot.
+Snapshots carry a generation number and the journal's first line names the
+generation it extends, so a crash between writing a snapshot and resetting the
+journal never replays the same mutations twice.
+Task actions are callables and are not persisted.
+"""
+import gc
+import json
+import math
+import mmap
+import os
+import struct
+from array import array
+from datetime import date
+
+from compact_graph import CompactDiGraph, CompactTaskDetails, NO_PRIORITY, pack_deadline, unpack_deadline
+from deadlines import to_date
+
+MAGIC = b"TDSSNAP1"
+SECTIONS = ("names", "succ_offsets", "succ_targets", "pred_offsets", "pred_targets",
+            "priority", "deadline", "duration", "flags", "descriptions", "order")
+HEADER = struct.Struct("<8sQQQ" + "Q" * len(SECTIONS))
+HAS_DESCRIPTION = 1
+
+
+def _join(strings, what):
+    for string in strings:
+        if not isinstance(string, str):
+            raise ValueError(f"Snapshots only support string {what}, got {string!r}.")
+        if "\0" in string:
+            raise ValueError(f"Snapshots cannot store {what} containing NUL characters: {string!r}.")
+    return "\0".join(strings).encode("utf-8")
+
+
+def _split(blob, count):
+    if count == 0:
+        return []
+    return bytes(blob).decode("utf-8").split("\0")
+
+
+def save_snapshot(scheduler, path, generation=0):
+    graph = scheduler.graph
+    details = scheduler.task_details
+    names = list(graph)
+    ids = {name: i for i, name in enumerate(names)}
+
+    succ_offsets = array("q", [0])
+    succ_targets = array("i")
+    pred_counts = array("q", [0]) * (len(names) + 1)
+    for name in names:
+        for successor in graph.successors(name):
+            j = ids[successor]
+            succ_targets.append(j)
+            pred_counts[j + 1] += 1
+        succ_offsets.append(len(succ_targets))
+    pred_offsets = array("q", pred_counts)
+    for i in range(len(names)):
+        pred_offsets[i + 1] += pred_offsets[i]
+    pred_targets = array("i", [0]) * len(succ_targets)
+    fill = array("q", pred_offsets[:-1])
+    for i in range(len(names)):
+        for k in range(succ_offsets[i], succ_offsets[i + 1]):
+            j = succ_targets[k]
+            pred_targets[fill[j]] = i
+            fill[j] += 1
+
+    priority = array("b")
+    deadline = array("i")
+    duration = array("d")
+    flags = array("b")
+    descriptions = []
+    for name in names:
+        record = details[name]
+        value = record["priority"]
+        priority.append(NO_PRIORITY if value is None else value)
+        deadline.append(pack_deadline(record["deadline"]))
+        value = record.get("duration")
+        duration.append(math.nan if value is None else value)
+        value = record["description"]
+        flags.append(0 if value is None else HAS_DESCRIPTION)
+        descriptions.append(value or "")
+
+    order = array("i")
+    if scheduler._order is not None:
+        order = array("i", (ids[name] for name in scheduler.topological_sort()))
+
+    sections = {
+        "names": _join(names, "task names"),
+        "succ_offsets": succ_offsets.tobytes(),
+        "succ_targets": succ_targets.tobytes(),
+        "pred_offsets": pred_offsets.tobytes(),
+        "pred_targets": pred_targets.tobytes(),
+        "priority": priority.tobytes(),
+        "deadline": deadline.tobytes(),
+        "duration": duration.tobytes(),
+        "flags": flags.tobytes(),
+        "descriptions": _join(descriptions, "descriptions"),
+        "order": order.tobytes(),
+    }
+    # Write to a side file and swap it in, so a crash never leaves a half-written snapshot
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as f:
+        f.write(HEADER.pack(MAGIC, generation, len(names), len(succ_targets), *(len(sections[name]) for name in SECTIONS)))
+        for name in SECTIONS:
+            f.write(sections[name])
+            f.write(b"\0" * (-len(sections[name]) % 8))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def load_snapshot(scheduler, path):
+    if scheduler.graph.number_of_nodes():
+        raise ValueError("Snapshots can only be loaded into an empty scheduler.")
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"Snapshot '{path}' is empty.")
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buffer)
+    magic, generation, nodes, edges, *lengths = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError(f"'{path}' is not a task scheduler snapshot.")
+    sections = {}
+    offset = HEADER.size
+    for name, length in zip(SECTIONS, lengths):
+        sections[name] = view[offset:offset + length]
+        offset += length + (-length % 8)
+
+    names = _split(sections["names"], nodes)
+    succ_offsets = sections["succ_offsets"].cast("q")
+    succ_targets = sections["succ_targets"].cast("i")
+    pred_offsets = sections["pred_offsets"].cast("q")
+    pred_targets = sections["pred_targets"].cast("i")
+    priority = array("b")
+    priority.frombytes(sections["priority"])
+    deadline = array("i")
+    deadline.frombytes(sections["deadline"])
+    duration = array("d")
+    duration.frombytes(sections["duration"])
+    flags = sections["flags"].cast("b")
+    descriptions = _split(sections["descriptions"], nodes)
+    descriptions = [text if flag & HAS_DESCRIPTION else None for text, flag in zip(descriptions, flags)]
+
+    if isinstance(scheduler.graph, CompactDiGraph):
+        scheduler.graph = CompactDiGraph.from_csr(names, succ_offsets, succ_targets, pred_offsets, pred_targets,
+                                                  buffer)
+        scheduler.task_details = CompactTaskDetails.from_columns(scheduler.graph, names, priority, deadline,
+                                                                 duration, descriptions)
+    else:
+        # Plain lists index much faster than memoryviews when every entry is visited anyway
+        succ_offsets, succ_targets = succ_offsets.tolist(), succ_targets.tolist()
+        pred_offsets, pred_targets = pred_offsets.tolist(), pred_targets.tolist()
+        # Nothing allocated here can form a reference cycle, so skip the collector passes
+        # that millions of new dicts would otherwise trigger
+        collecting = gc.isenabled()
+        gc.disable()
+        try:
+            scheduler.graph.add_nodes_from(names)
+            scheduler.graph.add_edges_from((names[i], names[succ_targets[k]])
+                                           for i in range(nodes) for k in range(succ_offsets[i], succ_offsets[i + 1]))
+            for i, name in enumerate(names):
+                scheduler.task_details[name] = {
+                    "dependencies": [names[pred_targets[k]] for k in range(pred_offsets[i], pred_offsets[i + 1])],
+                    "priority": None if priority[i] == NO_PRIORITY else priority[i],
+                    "deadline": unpack_deadline(deadline[i]),
+                    "description": descriptions[i],
+                    "action": None,
+                    "duration": None if math.isnan(duration[i]) else duration[i],
+                }
+        finally:
+            if collecting:
+                gc.enable()
+
+    scheduler.invalidate_order()
+    if len(sections["order"]):
+        scheduler._seed_order([names[i] for i in sections["order"].cast("i")])
+    return generation
+
+
+def _encode(value):
+    # Deadlines are written as YYYY-MM-DD; add_task and update_task parse them back
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Cannot journal {value!r}.")
+
+
+class Journal:
+    def __init__(self, path, generation=0, sync=False):
+        self.path = path
+        self.sync = sync
+        self.file = open(path, "a", encoding="utf-8")
+        if self.file.tell() == 0:
+            self.reset(generation)
+        else:
+            self.generation = generation
+
+    def append(self, record):
+        self.file.write(json.dumps(record, default=_encode) + "\n")
+        self.file.flush()
+        if self.sync:
+            os.fsync(self.file.fileno())
+
+    def reset(self, generation):
+        self.file.truncate(0)
+        self.generation = generation
+        self.append(("snapshot", generation))
+
+    def close(self):
+        self.file.close()
+
+
+def _apply(scheduler, op, args):
+    if op == "add_task":
+        task, dependencies, priority, deadline, description, duration = args
+        scheduler.add_task(task, dependencies, priority, deadline, description, duration=duration)
+    elif op == "set":
+        task, field, value = args
+        if field == "deadline":
+            value = to_date(value)
+        scheduler._set_field(task, field, value)
+    elif op == "delete_task":
+        # With the redundant edges the live delete pruned, so the replay drops exactly those
+        task, pruned = args
+        scheduler._delete_task(task, [tuple(edge) for edge in pruned])
+    elif op in ("edit_dependencies", "ETN", "transitive_reduction"):
+        getattr(scheduler, op)(*args)
+    else:
+        raise ValueError(f"Unknown journal operation '{op}'.")
+
+
+def replay_journal(scheduler, path, generation=0):
+    # Returns the number of records applied, or None if the journal belongs to another snapshot.
+    # bulk_task records and begin..commit transactions are buffered and only applied once their
+    # closing record is read, so a batch cut short by a crash is dropped as a whole.
+    applied = 0
+    batch = None
+    transaction = None
+    with open(path, encoding="utf-8") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError:
+            return None
+        if header != ["snapshot", generation]:
+            return None
+        for line in f:
+            try:
+                op, *args = json.loads(line)
+            except ValueError:
+                break  # torn final write from a crash; everything before it is intact
+            if op == "bulk_task":
+                task, dependencies, priority, deadline, description, duration = args
+                if batch is None:
+                    batch = []
+                batch.append({"task": task, "dependencies": dependencies, "priority": priority,
+                              "deadline": deadline, "description": description, "duration": duration})
+                continue
+            if op in ("bulk_commit", "bulk_abort"):
+                if op == "bulk_commit" and batch:
+                    if transaction is not None:
+                        transaction.append(("bulk_add", [batch]))
+                    else:
+                        scheduler.bulk_add(batch)
+                        applied += len(batch)
+                batch = None
+                continue
+            if op == "begin":
+                transaction = []
+            elif op == "commit":
+                with scheduler.transaction():
+                    for op, args in transaction or []:
+                        if op == "bulk_add":
+                            scheduler.bulk_add(*args)
+                        else:
+                            _apply(scheduler, op, args)
+                applied += len(transaction or [])
+                transaction = None
+            elif transaction is not None:
+                transaction.append((op, args))
+            else:
+                _apply(scheduler, op, args)
+                applied += 1
+    return applied
+
+
+def open_journaled(scheduler, snapshot_path, journal_path, sync=False, read_only=False):
+    # Startup = mmap the snapshot + replay whatever was journaled since it was taken.
+    # read_only restores the same state but leaves the journal file untouched.
+    generation = 0
+    if os.path.exists(snapshot_path):
+        generation = load_snapshot(scheduler, snapshot_path)
+    applied = None
+    if os.path.exists(journal_path):
+        applied = replay_journal(scheduler, journal_path, generation)
+    if read_only:
+        return scheduler
+    scheduler.journal = Journal(journal_path, generation, sync)
+    if applied is None:
+        scheduler.journal.reset(generation)
+    return scheduler
+
+
+def checkpoint(scheduler, snapshot_path):
+    generation = scheduler.journal.generation + 1 if scheduler.journal is not None else 0
+    save_snapshot(scheduler, snapshot_path, generation)
+    if scheduler.journal is not None:
+        scheduler.journal.reset(generation)
@@ -0,0 +1,114 @@
+"""Bitset transitive closure behind TaskScheduler.depends_on / ancestors / descendants.
+
+Every task gets a bit number.  down[i] is an int with the bits of every task
+that transitively depends on task i, up[i] the bits of every task it
+transitively depends on, so depends_on is a single bit test.  Both are filled
+in one pass over the maintained topological order.
+
+Adding an edge u -> v is applied incrementally: the descendants of v (and v)
+are OR-ed into every ancestor of u (and u), and the other way round.  Removing a
+task keeps the closure of the remaining tasks correct on its own, because
+delete_task reconnects its dependencies to its dependents.  Any other edge
+removal cannot be undone bit by bit, so the scheduler drops the index and it is
+rebuilt on the next query.
+
+The closure takes up to 2 * n^2 bits, so the scheduler only builds it for
+graphs of up to REACHABILITY_LIMIT tasks and answers bigger ones by searching.
+"""
+REACHABILITY_LIMIT = 20_000
+
+
+def bits(row):
+    # Indices of the set bits of row, lowest first
+    text = format(row, "b")[::-1]
+    index = text.find("1")
+    while index != -1:
+        yield index
+        index = text.find("1", index + 1)
+
+
+class ReachabilityIndex:
+    def __init__(self, graph, order):
+        self.graph = graph
+        self._ids = {}
+        self._names = []
+        self._down = []
+        self._up = []
+        self._dead = 0
+        for task in order:
+            self.add_task(task)
+        ids = self._ids
+        for task in reversed(order):
+            i = ids[task]
+            row = 0
+            for successor in graph.successors(task):
+                j = ids[successor]
+                row |= self._down[j] | (1 << j)
+            self._down[i] = row
+        for task in order:
+            i = ids[task]
+            row = 0
+            for predecessor in graph.predecessors(task):
+                j = ids[predecessor]
+                row |= self._up[j] | (1 << j)
+            self._up[i] = row
+
+    def __contains__(self, task):
+        return task in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def depends_on(self, task, other):
+        # True if task transitively depends on other
+        return self._up[self._ids[task]] >> self._ids[other] & 1 == 1
+
+    def ancestors(self, task):
+        names = self._names
+        return {names[i] for i in bits(self._up[self._ids[task]]) if names[i] is not None}
+
+    def descendants(self, task):
+        names = self._names
+        return {names[i] for i in bits(self._down[self._ids[task]]) if names[i] is not None}
+
+    def redundant(self, successors):
+        # The successors of one task that are also reachable through another of them
+        ids = self._ids
+        covered = 0
+        for successor in successors:
+            covered |= self._down[ids[successor]]
+        return [successor for successor in successors if covered >> ids[successor] & 1]
+
+    def add_task(self, task):
+        self._ids[task] = len(self._names)
+        self._names.append(task)
+        self._down.append(0)
+        self._up.append(0)
+
+    def add_edge(self, u, v):
+        i, j = self._ids[u], self._ids[v]
+        if self._down[i] >> j & 1:
+            return  # v was already reachable from u
+        down = self._down[j] | (1 << j)
+        up = self._up[i] | (1 << i)
+        for k in bits(up):
+            self._down[k] |= down
+        for k in bits(down):
+            self._up[k] |= up
+
+    def remove_task(self, task):
+        # Only valid when the task's dependents were reconnected to its dependencies first.
+        # Its bit stays set in other rows; bit numbers are never reused, so it is just skipped.
+        i = self._ids.pop(task)
+        self._names[i] = None
+        self._down[i] = self._up[i] = 0
+        self._dead += 1
+
+    def rename(self, old, new):
+        i = self._ids.pop(old)
+        self._ids[new] = i
+        self._names[i] = new
+
+    def is_fragmented(self):
+        # Mostly dead bits: cheaper to rebuild than to keep dragging them through every OR
+        return self._dead * 2 > len(self._names)
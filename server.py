@@ -0,0 +1,376 @@
+"""A TaskScheduler shared by many clients over a Unix socket or localhost TCP.
+
+The protocol is one JSON object per line in each direction.  A request is
+{"id": 7, "op": "add_task", "args": {...}}; its reply carries the same id,
+{"id": 7, "ok": true, "result": ...} or {"id": 7, "ok": false, "error": "...",
+"type": "ValueError"} (plus "cycle" for a CycleError).  Clients may pipeline:
+replies to reads can overtake replies to earlier writes, so match them by id.
+
+Writes go through one queue drained by a single writer task, which applies
+everything queued so far as a batch and only then replies.  Nothing in a batch
+awaits, so no reader ever sees half of one; with durable=True the journal is
+fsynced once per batch (group commit) in a thread before the writers are
+answered.  Reads never queue behind writes: they are answered at once from the
+state as of the last applied batch.
+
+The job-queue view is kept up to date incrementally.  A task is ready when it
+has no dependencies left; completing a ready task removes it from the graph,
+which may make the tasks waiting on it ready.  Ready tasks are kept sorted by
+the schedule key (highest priority, then earliest deadline), so fetching the
+next ones is a slice.  Fetching with claim=true hides them from other clients
+for a lease; claims live in memory only and lapse if not completed in time.
+
+    python PaythonDraft_01.py serve --socket /tmp/tasks.sock
+    python PaythonDraft_01.py serve --port 8765
+"""
+import asyncio
+import json
+import os
+import signal
+from bisect import bisect_left, insort
+from datetime import date
+
+from deadlines import format_deadline
+from errors import CycleError
+
+LINE_LIMIT = 2**24   # bytes per request line; bulk_add payloads can be big
+MAX_BATCH = 1000     # writes applied per batch
+DEFAULT_LEASE = 300  # seconds a claimed task stays hidden from other clients
+READS = ("ready", "release", "get", "schedule", "stats")
+UPDATE_FIELDS = ("new_name", "dependencies", "priority", "deadline", "description", "duration")
+
+
+def _encode(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class TaskServer:
+    def __init__(self, scheduler, durable=False):
+        self.scheduler = scheduler
+        self.durable = durable
+        self.version = 0             # bumped by every applied batch that changed something
+        self._key = scheduler.schedule_key("priority")
+        self._ready = []             # sorted (key, sequence, task) of the ready tasks
+        self._entry = {}             # task -> its entry in _ready
+        self._sequence = 0
+        self._claims = {}            # task -> loop time its claim lapses
+        self._writes = None
+        self._writer = None
+        self._servers = []
+        self._connections = {}       # connection handler task -> its stream writer
+        self._path = None            # Unix socket to remove on close
+        for task in scheduler.graph:
+            self._touch(task)
+
+    # ----- the ready set -----
+
+    def _touch(self, task):
+        # Re-derives whether task is ready (and its place in line) after anything changed it
+        entry = self._entry.pop(task, None)
+        if entry is not None:
+            del self._ready[bisect_left(self._ready, entry)]
+        graph = self.scheduler.graph
+        if task in graph and graph.in_degree(task) == 0:
+            self._sequence += 1
+            entry = (self._key(task), self._sequence, task)
+            self._entry[task] = entry
+            insort(self._ready, entry)
+        elif task not in graph:
+            self._claims.pop(task, None)
+
+    def _ready_tasks(self, limit, claim, lease):
+        now = asyncio.get_running_loop().time()
+        tasks = []
+        for _, _, task in self._ready:
+            if limit is not None and len(tasks) >= limit:
+                break
+            if self._claims.get(task, 0) > now:
+                continue
+            tasks.append(task)
+        if claim:
+            for task in tasks:
+                self._claims[task] = now + lease
+        return tasks
+
+    # ----- requests -----
+
+    def _read(self, op, args):
+        scheduler = self.scheduler
+        if op == "ready":
+            limit = args.get("limit")
+            return self._ready_tasks(limit, args.get("claim", False), args.get("lease", DEFAULT_LEASE))
+        if op == "release":
+            return self._claims.pop(args["task"], None) is not None
+        if op == "get":
+            task = args["task"]
+            if task not in scheduler.graph:
+                raise ValueError(f"Task '{task}' does not exist.")
+            details = dict(scheduler.task_details[task])
+            details.pop("action", None)
+            details["dependencies"] = list(scheduler.graph.predecessors(task))
+            details["deadline"] = format_deadline(details["deadline"]) if details["deadline"] else None
+            return details
+        if op == "schedule":
+            limit = args.get("limit")
+            # Memoized by the scheduler until the next write, so polling it is cheap
+            schedule = scheduler.schedule(args.get("by", "priority"))
+            return schedule[:limit] if limit is not None else schedule
+        if op == "stats":
+            return {"version": self.version, "tasks": scheduler.graph.number_of_nodes(),
+                    "dependencies": scheduler.graph.number_of_edges(), "ready": len(self._ready),
+                    "claimed": len(self._claims)}
+        raise ValueError(f"Unknown operation '{op}'.")
+
+    def _write(self, op, args):
+        # Applies one write and returns its result; touches every task whose readiness it may change
+        scheduler = self.scheduler
+        task = args.get("task")
+        if op == "add_task":
+            scheduler.add_task(task, args.get("dependencies"), args.get("priority"), args.get("deadline"),
+                               args.get("description"), duration=args.get("duration"))
+            self._touch(task)
+        elif op == "bulk_add":
+            records = args["tasks"]
+            scheduler.bulk_add(records)
+            for record in records:
+                self._touch(record["task"])
+        elif op == "update_task":
+            fields = {field: args[field] for field in UPDATE_FIELDS if field in args}
+            scheduler.update_task(task, **fields)
+            new_name = fields.get("new_name", task)
+            if new_name != task and task in self._claims:
+                self._claims[new_name] = self._claims.pop(task)
+            self._touch(task)
+            self._touch(new_name)
+        elif op in ("set_priority", "set_deadline"):
+            getattr(scheduler, op)(task, args[op[4:]])
+            self._touch(task)
+        elif op == "edit_dependencies":
+            scheduler.edit_dependencies(task, args["dependencies"])
+            self._touch(task)
+        elif op in ("delete_task", "complete"):
+            if task not in scheduler.graph:
+                raise ValueError(f"Task '{task}' does not exist.")
+            if op == "complete" and task not in self._entry:
+                waiting = ", ".join(map(str, scheduler.graph.predecessors(task)))
+                raise ValueError(f"Task '{task}' is not ready, it still depends on: {waiting}.")
+            successors = list(scheduler.graph.successors(task))
+            scheduler.delete_task(task)
+            self._touch(task)
+            for successor in successors:
+                self._touch(successor)
+        else:
+            raise ValueError(f"Unknown operation '{op}'.")
+        return True
+
+    async def _apply_writes(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._writes.get()]
+            while len(batch) < MAX_BATCH and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+            outcomes = []
+            for op, args, _ in batch:
+                try:
+                    outcomes.append((self._write(op, args), None))
+                except Exception as e:
+                    outcomes.append((None, e))
+            if any(error is None for _, error in outcomes):
+                self.version += 1
+                journal = self.scheduler.journal
+                if self.durable and journal is not None:
+                    # Readers keep being served while the batch is made durable; the writers
+                    # are only answered once it is
+                    await loop.run_in_executor(None, os.fsync, journal.file.fileno())
+            for (_, _, future), (result, error) in zip(batch, outcomes):
+                if future.done():
+                    continue  # the client went away
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    async def _handle(self, request):
+        op = request.get("op")
+        args = request.get("args") or {}
+        if op in READS:
+            return self._read(op, args)
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((op, args, future))
+        return await future
+
+    async def _respond(self, request, writer, lock):
+        reply = {"id": request.get("id") if isinstance(request, dict) else None}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("A request must be a JSON object.")
+            reply["result"] = await self._handle(request)
+            reply["ok"] = True
+        except (ValueError, KeyError, TypeError) as e:
+            if isinstance(e, CycleError):
+                reply.update(ok=False, error=str(e), type="CycleError", cycle=e.cycle)
+            elif isinstance(e, KeyError):
+                reply.update(ok=False, error=f"Missing argument {e}.", type="KeyError")
+            else:
+                reply.update(ok=False, error=str(e), type=type(e).__name__)
+        except Exception as e:
+            reply.update(ok=False, error=f"{type(e).__name__}: {e}", type="InternalError")
+        await self._send(reply, writer, lock)
+
+    async def _send(self, reply, writer, lock):
+        line = json.dumps(reply, default=_encode).encode() + b"\n"
+        async with lock:
+            writer.write(line)
+            await writer.drain()
+
+    async def _connection(self, reader, writer):
+        lock = asyncio.Lock()
+        pending = set()
+        handler = asyncio.current_task()
+        self._connections[handler] = writer
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                if isinstance(request, dict) and request.get("op") in READS:
+                    # Reads do not wait for anything: answer in line order, no task needed
+                    await self._respond(request, writer, lock)
+                else:
+                    response = asyncio.ensure_future(self._respond(request, writer, lock))
+                    pending.add(response)
+                    response.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            del self._connections[handler]
+            writer.close()
+
+    async def start(self, path=None, host="127.0.0.1", port=None):
+        # Listens on the Unix socket at path, or on host:port (port 0 picks a free one).
+        # Returns the address clients should connect to.
+        self._writes = asyncio.Queue()
+        self._writer = asyncio.ensure_future(self._apply_writes())
+        if path is not None:
+            if os.path.exists(path):
+                os.remove(path)  # left over from a server that did not shut down cleanly
+            server = await asyncio.start_unix_server(self._connection, path, limit=LINE_LIMIT)
+            address = self._path = path
+        else:
+            server = await asyncio.start_server(self._connection, host, port or 0, limit=LINE_LIMIT)
+            address = server.sockets[0].getsockname()[:2]
+        self._servers.append(server)
+        return address
+
+    async def close(self):
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers = []
+        if self._path is not None and os.path.exists(self._path):
+            os.remove(self._path)
+            self._path = None
+        # Hang up on the clients; their handlers see end of input and finish their replies
+        handlers = list(self._connections)
+        for writer in self._connections.values():
+            writer.transport.abort()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._writer is not None:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+
+
+class ServerError(Exception):
+    def __init__(self, message, kind):
+        super().__init__(message)
+        self.kind = kind
+
+
+class TaskClient:
+    # Async client; calls may be made concurrently over the one connection (pipelined)
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = {}
+        self._next_id = 0
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    @classmethod
+    async def connect(cls, path=None, host="127.0.0.1", port=None):
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=LINE_LIMIT)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=LINE_LIMIT)
+        return cls(reader, writer)
+
+    async def _dispatch(self):
+        try:
+            while True:
+                line = await self._reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self._waiting.pop(reply["id"], None)
+                if future is None or future.done():
+                    continue
+                if reply["ok"]:
+                    future.set_result(reply["result"])
+                elif reply["type"] == "CycleError":
+                    future.set_exception(CycleError(reply["error"], reply["cycle"]))
+                elif reply["type"] == "ValueError":
+                    future.set_exception(ValueError(reply["error"]))
+                else:
+                    future.set_exception(ServerError(reply["error"], reply["type"]))
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("The server closed the connection."))
+            self._waiting.clear()
+
+    async def call(self, op, **args):
+        if self._dispatcher.done():
+            raise ConnectionError("The server closed the connection.")
+        self._next_id += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[self._next_id] = future
+        self._writer.write(json.dumps({"id": self._next_id, "op": op, "args": args}, default=_encode).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+        self._dispatcher.cancel()
+
+
+async def serve(scheduler, path=None, host="127.0.0.1", port=None, durable=False):
+    # Runs until cancelled (Ctrl+C) or sent SIGTERM
+    server = TaskServer(scheduler, durable)
+    address = await server.start(path, host, port)
+    print(f"Serving {scheduler.graph.number_of_nodes()} tasks on {address}", flush=True)
+    stop = asyncio.Event()
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, AttributeError):
+        pass  # Windows: Ctrl+C only
+    try:
+        await stop.wait()
+    finally:
+        await server.close()
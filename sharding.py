@@ -0,0 +1,234 @@
+"""Cycle detection, topological sort and priority scheduling split over processes.
+
+A task graph made of independent projects falls apart into weakly connected
+components that never constrain each other.  shard() finds them in one pass
+(or groups tasks by a user-declared partition, merging any partitions a
+dependency runs between), pack() deals them out into a few batches per worker,
+biggest first, and run_sharded() works on each batch in its own worker process:
+
+    - a cycle check and topological order (Kahn, as TaskScheduler._kahn_sort)
+    - the priority / deadline schedule (as TaskScheduler.iter_schedule)
+
+The topological orders are simply concatenated.  The schedules are merged by
+always taking the batch whose next task has the smallest key, which is exactly
+what one heap over all ready tasks would pick, since a batch's ready set only
+changes when one of its own tasks is taken.  Ties between batches go to the
+lower batch, so ties may come out in a different order than schedule().
+
+Workers are forked and read the scheduler from the memory they inherit, so
+nothing about the graph is pickled; they send back only int arrays (positions
+within their batch and packed keys).  Without fork (Windows, macOS by default),
+with one worker, or for graphs under SHARD_MIN_TASKS, the graph is not split
+at all and the same code runs once in this process, giving exactly the serial
+result.  Splitting costs a pass over the graph in this process and the merge
+another, so the speedup is bounded by those and by how evenly the projects
+divide; one giant component cannot be split.
+"""
+import heapq
+import multiprocessing
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+SHARD_MIN_TASKS = 50_000
+BATCHES_PER_WORKER = 4
+
+# What forked workers read: set by run_sharded just before the pool starts
+_scheduler = None
+_batches = None
+_by = None
+
+
+def shard(scheduler, partitions=None):
+    # Lists of tasks, biggest shard first. partitions maps a task (dict or callable) to the
+    # name of its partition; tasks it maps to None, or leaves out, each get their own.
+    graph = scheduler.graph
+    if partitions is None:
+        seen = set()
+        shards = []
+        for start in graph:
+            if start in seen:
+                continue
+            seen.add(start)
+            component = [start]
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                for neighbor in graph.successors(node):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        component.append(neighbor)
+                        stack.append(neighbor)
+                for neighbor in graph.predecessors(node):
+                    if neighbor not in seen:
+                        seen.add(neighbor)
+                        component.append(neighbor)
+                        stack.append(neighbor)
+            shards.append(component)
+    else:
+        partition_of = partitions.get if isinstance(partitions, dict) else partitions
+        # Union-find over the partitions: a dependency between two of them ties them together
+        parent = {}
+
+        def find(label):
+            root = label
+            while parent[root] != root:
+                root = parent[root]
+            while parent[label] != root:
+                parent[label], label = root, parent[label]
+            return root
+
+        label_of = {}
+        for task in graph:
+            label = partition_of(task)
+            label = ("partition", label) if label is not None else ("task", task)
+            label_of[task] = label
+            parent.setdefault(label, label)
+        for task in graph:
+            root = find(label_of[task])
+            for successor in graph.successors(task):
+                other = find(label_of[successor])
+                if other != root:
+                    parent[other] = root
+        groups = {}
+        for task in graph:
+            groups.setdefault(find(label_of[task]), []).append(task)
+        shards = list(groups.values())
+    shards.sort(key=len, reverse=True)
+    return shards
+
+
+class ShardedResult:
+    def __init__(self, shards, cycle, order, schedule):
+        self.shards = shards        # number of batches worked on separately, 1 when not split
+        self.cycle = cycle          # [] or a closed cycle, e.g. ['a', 'b', 'a']
+        self.order = order          # a topological order of every task, None with a cycle
+        self.schedule = schedule    # executable order, most urgent ready task first; None with a cycle
+
+
+def _pack_key(key):
+    # The scheduler's key is a pair of ints with |value| < 2**31 (priorities, day numbers);
+    # one int compares the same and is far cheaper to send back and merge
+    first, second = key
+    return (first + 2**31) << 32 | (second + 2**31)
+
+
+def _run_shard(scheduler, tasks, key):
+    # (cycle, order, schedule, keys); order and schedule hold positions in tasks
+    graph = scheduler.graph
+    local = {task: i for i, task in enumerate(tasks)}
+    in_degree = [0] * len(tasks)
+    successors = []
+    for task in tasks:
+        targets = [local[successor] for successor in graph.successors(task)]
+        successors.append(targets)
+        for j in targets:
+            in_degree[j] += 1
+
+    remaining = list(in_degree)
+    stack = [i for i in range(len(tasks)) if remaining[i] == 0]
+    stack.reverse()
+    order = array("i")
+    while stack:
+        i = stack.pop()
+        order.append(i)
+        for j in successors[i]:
+            remaining[j] -= 1
+            if remaining[j] == 0:
+                stack.append(j)
+    if len(order) < len(tasks):
+        # Same witness walk as TaskScheduler._kahn_sort, over the tasks never emitted
+        i = next(i for i in range(len(tasks)) if remaining[i] > 0)
+        seen = {}
+        path = []
+        while i not in seen:
+            seen[i] = len(path)
+            path.append(i)
+            i = next(local[p] for p in graph.predecessors(tasks[i]) if remaining[local[p]] > 0)
+        cycle = [tasks[j] for j in path[seen[i]:]]
+        cycle.reverse()
+        cycle.append(cycle[0])
+        return cycle, None, None, None
+
+    packed = [_pack_key(key(task)) for task in tasks]
+    ready = [(packed[i], counter, i) for counter, i in enumerate(i for i in range(len(tasks)) if in_degree[i] == 0)]
+    counter = len(ready)
+    heapq.heapify(ready)
+    schedule = array("i")
+    keys = array("Q")
+    while ready:
+        packed_key, _, i = heapq.heappop(ready)
+        schedule.append(i)
+        keys.append(packed_key)
+        for j in successors[i]:
+            in_degree[j] -= 1
+            if in_degree[j] == 0:
+                heapq.heappush(ready, (packed[j], counter, j))
+                counter += 1
+    return [], order, schedule, keys
+
+
+def _run_batch(index):
+    return _run_shard(_scheduler, _batches[index], _scheduler.schedule_key(_by))
+
+
+def pack(shards, count):
+    # Greedy: each shard, biggest first, joins the batch with the fewest tasks so far.
+    # Any union of shards is independent of the rest, so a batch is worked on as one unit.
+    heap = [(0, b, []) for b in range(count)]
+    for tasks in shards:
+        size, b, batch = heapq.heappop(heap)
+        batch.extend(tasks)
+        heapq.heappush(heap, (size + len(tasks), b, batch))
+    return [batch for _, _, batch in sorted(heap, key=lambda item: item[1]) if batch]
+
+
+def run_sharded(scheduler, by="priority", partitions=None, workers=None):
+    global _scheduler, _batches, _by
+    scheduler.schedule_key(by)  # rejects an unknown `by` before any work
+    if workers is None:
+        workers = os.cpu_count() or 1
+    parallel = (workers > 1 and scheduler.graph.number_of_nodes() >= SHARD_MIN_TASKS
+                and "fork" in multiprocessing.get_all_start_methods())
+    if parallel:
+        batches = pack(shard(scheduler, partitions), workers * BATCHES_PER_WORKER)
+    else:
+        # One batch in graph order: the same result as the serial methods, ties included
+        batches = [list(scheduler.graph)]
+
+    _scheduler, _batches, _by = scheduler, batches, by
+    try:
+        if len(batches) > 1:
+            with ProcessPoolExecutor(min(workers, len(batches)), mp_context=multiprocessing.get_context("fork")) as pool:
+                results = list(pool.map(_run_batch, range(len(batches))))
+        else:
+            results = [_run_batch(index) for index in range(len(batches))]
+    finally:
+        _scheduler = _batches = _by = None
+
+    for cycle, _, _, _ in results:
+        if cycle:
+            return ShardedResult(len(batches), cycle, None, None)
+
+    order = []
+    for tasks, (_, positions, _, _) in zip(batches, results):
+        order.extend([tasks[i] for i in positions])
+
+    # k-way merge on each batch's next key; a batch that is the only one left is copied whole
+    schedule = []
+    heads = [(results[index][3][0], index, 0) for index in range(len(batches)) if batches[index]]
+    heapq.heapify(heads)
+    while heads:
+        _, index, position = heads[0]
+        tasks = batches[index]
+        _, _, positions, keys = results[index]
+        if len(heads) == 1:
+            schedule.extend([tasks[i] for i in positions[position:]])
+            break
+        schedule.append(tasks[positions[position]])
+        position += 1
+        if position < len(positions):
+            heapq.heapreplace(heads, (keys[position], index, position))
+        else:
+            heapq.heappop(heads)
+    return ShardedResult(len(batches), [], order, schedule)
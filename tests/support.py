@@ -0,0 +1,106 @@
+"""Helpers shared by the tests: random edits through the public API and state comparisons."""
+import itertools
+import os
+import sys
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from errors import CycleError  # noqa: E402
+
+BACKENDS = ("networkx", "compact")
+FIRST_DAY = date(2030, 1, 1)
+_names = itertools.count()
+
+
+def new_name():
+    return f"task-{next(_names)}"
+
+
+def state(scheduler):
+    # Everything a snapshot and the journal keep about the tasks
+    details = scheduler.task_details
+    return {task: (sorted(scheduler.graph.predecessors(task)), details[task]["priority"],
+                   details[task]["deadline"], details[task]["description"], details[task]["duration"])
+            for task in scheduler.graph}
+
+
+def check_order(test, scheduler, order):
+    # order lists every task once, each one before everything that depends on it
+    test.assertCountEqual(order, list(scheduler.graph))
+    position = {task: index for index, task in enumerate(order)}
+    for task in scheduler.graph:
+        for successor in scheduler.graph.successors(task):
+            test.assertLess(position[task], position[successor], f"{task} -> {successor}")
+
+
+def check_maintained_order(test, scheduler):
+    # The incrementally maintained order and its position map agree with each other and the graph
+    test.assertIsNotNone(scheduler._order)
+    order = [task for task in scheduler._order if task is not None]
+    for task in order:
+        test.assertEqual(scheduler._order[scheduler._position[task]], task)
+    check_order(test, scheduler, order)
+
+
+def check_greedy(test, scheduler, schedule, key):
+    # Every step takes a task whose dependencies are done and whose key is the smallest among those
+    waiting = {task: scheduler.graph.in_degree(task) for task in scheduler.graph}
+    ready = {task for task, count in waiting.items() if count == 0}
+    for task in schedule:
+        test.assertIn(task, ready)
+        test.assertEqual(key(task), min(map(key, ready)), task)
+        ready.remove(task)
+        for successor in scheduler.graph.successors(task):
+            waiting[successor] -= 1
+            if waiting[successor] == 0:
+                ready.add(successor)
+    test.assertEqual(len(schedule), len(waiting))
+
+
+def random_deadline(rng):
+    return FIRST_DAY + timedelta(days=rng.randrange(365)) if rng.random() < 0.6 else None
+
+
+def add_random_tasks(scheduler, rng, count):
+    for _ in range(count):
+        tasks = list(scheduler.graph)
+        scheduler.add_task(new_name(), rng.sample(tasks, min(len(tasks), rng.randint(0, 3))), rng.randint(0, 10),
+                           random_deadline(rng), f"about {len(tasks)}", duration=rng.randint(0, 5))
+
+
+def random_edit(scheduler, rng):
+    # One random mutation through the public API. Only edits that would close a cycle are
+    # expected to be refused; any other error is a bug and fails the test.
+    tasks = list(scheduler.graph)
+    if len(tasks) < 4:
+        add_random_tasks(scheduler, rng, 1)
+        return
+    choice = rng.random()
+    task = rng.choice(tasks)
+    try:
+        if choice < 0.25:
+            add_random_tasks(scheduler, rng, 1)
+        elif choice < 0.35:
+            scheduler.delete_task(task)
+        elif choice < 0.55:
+            scheduler.edit_dependencies(task, rng.sample(tasks, rng.randint(0, 3)))
+        elif choice < 0.6:
+            scheduler.ETN(task, new_name())
+        elif choice < 0.7:
+            scheduler.set_priority(task, rng.randint(0, 10))
+        elif choice < 0.8:
+            scheduler.set_deadline(task, random_deadline(rng))
+        elif choice < 0.85:
+            scheduler.set_duration(task, rng.randint(0, 5))
+        elif choice < 0.9:
+            scheduler.update_task(task, new_name(), priority=rng.randint(0, 10), description="updated")
+        elif choice < 0.95:
+            first = new_name()
+            scheduler.bulk_add([{"task": new_name(), "dependencies": [first, rng.choice(tasks)], "priority": 3},
+                                {"task": first, "dependencies": rng.sample(tasks, 2)}])
+        else:
+            scheduler.transitive_reduction()
+    except CycleError:
+        pass
@@ -0,0 +1,118 @@
+"""Derived results memoized against the graph version."""
+import random
+import unittest
+from datetime import date
+from unittest import mock
+
+from support import BACKENDS, FIRST_DAY, add_random_tasks, check_order, random_edit
+
+import PaythonDraft_01
+from PaythonDraft_01 import TaskScheduler
+
+
+def reads(scheduler):
+    # Every memoized read; a cycle leaves only detect_cycle answerable
+    has_cycle, cycle = scheduler.detect_cycle()
+    if has_cycle:
+        return {"cycle": cycle}
+    task = next(iter(scheduler.graph))
+    results = {
+        "order": scheduler.topological_sort(),
+        "sort_by_deadline": scheduler.sort_by_deadline(), "schedule": scheduler.schedule("deadline"),
+        "ancestors": scheduler.ancestors(task), "descendants": scheduler.descendants(task),
+        "due_before": scheduler.due_before(date(2030, 6, 1)), "next_due": scheduler.next_due(3, FIRST_DAY),
+        "critical_path": scheduler.critical_path(FIRST_DAY),
+    }
+    if all(scheduler.get_priority(task) is not None for task in scheduler.graph):
+        results["STBP"] = scheduler.STBP()  # sorts the priorities themselves, so it needs all of them
+    return results
+
+
+class CacheTest(unittest.TestCase):
+    def test_repeated_reads_are_not_recomputed(self):
+        scheduler = TaskScheduler()
+        add_random_tasks(scheduler, random.Random(1), 100)
+        with mock.patch.object(scheduler, "iter_schedule", wraps=scheduler.iter_schedule) as computed:
+            first = scheduler.schedule()
+            self.assertEqual(scheduler.schedule(), first)
+            self.assertEqual(computed.call_count, 1)
+            scheduler.schedule("deadline")
+            self.assertEqual(computed.call_count, 2)
+            scheduler.set_priority(first[-1], 10)
+            scheduler.schedule()
+            self.assertEqual(computed.call_count, 3)
+
+    def test_callers_get_copies(self):
+        scheduler = TaskScheduler()
+        add_random_tasks(scheduler, random.Random(2), 100)
+        before = reads(scheduler)
+        for value in reads(scheduler).values():
+            if isinstance(value, tuple):  # critical_path
+                value[1].reverse()
+                value[2].clear()
+            elif isinstance(value, set):
+                value.add("x")
+            else:
+                value.reverse()
+        self.assertEqual(reads(scheduler), before)
+
+    def test_every_mutation_refreshes_the_results(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(3)
+                scheduler = TaskScheduler(backend)
+                add_random_tasks(scheduler, rng, 60)
+                for _ in range(150):
+                    version = scheduler.version
+                    reads(scheduler)
+                    random_edit(scheduler, rng)
+                    cached = reads(scheduler)
+                    # Nothing memoized: a fresh result cache for the same graph. A rejected edit may
+                    # reshuffle the maintained order without changing the graph, so the cached order
+                    # only has to stay valid.
+                    scheduler._cache_version = -1
+                    fresh = reads(scheduler)
+                    if "order" in cached:
+                        check_order(self, scheduler, cached.pop("order"))
+                        fresh.pop("order")
+                    self.assertEqual(cached, fresh)
+                    self.assertGreaterEqual(scheduler.version, version)
+
+    def test_every_mutation_bumps_the_version(self):
+        scheduler = TaskScheduler()
+        mutations = [
+            lambda: scheduler.add_task("a", priority=1),
+            lambda: scheduler.bulk_add([{"task": "b", "dependencies": ["a"], "priority": 3},
+                                        {"task": "c", "dependencies": ["a"], "priority": 5}]),
+            lambda: scheduler.set_priority("b", 4),
+            lambda: scheduler.set_deadline("b", "2030-01-01"),
+            lambda: scheduler.set_duration("b", 2),
+            lambda: scheduler.edit_dependencies("c", ["a", "b"]),
+            lambda: scheduler.transitive_reduction(),
+            lambda: scheduler.ETN("c", "d"),
+            lambda: scheduler.update_task("d", priority=2),
+            lambda: scheduler.delete_task("b"),
+            lambda: scheduler.invalidate_order(),
+        ]
+        for mutate in mutations:
+            version = scheduler.version
+            scheduler.STBP()
+            mutate()
+            self.assertGreater(scheduler.version, version)
+        self.assertEqual(scheduler.STBP(), ["d", "a"])
+
+    def test_query_cache_is_bounded(self):
+        scheduler = TaskScheduler()
+        add_random_tasks(scheduler, random.Random(4), 50)
+        tasks = list(scheduler.graph)
+        with mock.patch.object(PaythonDraft_01, "QUERY_CACHE_SIZE", 5):
+            for task in tasks[:20]:
+                scheduler.ancestors(task)
+            self.assertEqual([key[1] for key in scheduler._queries], tasks[15:20])
+            scheduler.ancestors(tasks[15])  # a hit moves it to the back
+            scheduler.ancestors(tasks[0])  # evicts the least recently used, tasks[16]
+            self.assertEqual([key[1] for key in scheduler._queries], tasks[17:20] + [tasks[15], tasks[0]])
+
+
+if __name__ == "__main__":
+    unittest.main()
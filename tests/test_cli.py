@@ -0,0 +1,99 @@
+"""The one-shot commands and the server, run as `python PaythonDraft_01.py ...`."""
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from support import ROOT, CycleError
+
+from server import TaskClient
+
+SCRIPT = os.path.join(ROOT, "PaythonDraft_01.py")
+
+
+class CommandTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write_jsonl(self, *rows):
+        path = os.path.join(self.directory, "tasks.jsonl")
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(row) + "\n" for row in rows)
+        return path
+
+    def run_script(self, *args):
+        return subprocess.run([sys.executable, SCRIPT, *args], cwd=self.directory, capture_output=True, text=True,
+                              timeout=60)
+
+    def test_sort_and_schedule(self):
+        path = self.write_jsonl({"task": "deploy", "dependencies": ["build", "test"], "priority": 9},
+                                {"task": "test", "dependencies": ["build"], "priority": 1},
+                                {"task": "docs", "priority": 5},
+                                {"task": "build", "priority": 2})
+        result = self.run_script("sort", "--file", path)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        order = result.stdout.split()
+        self.assertCountEqual(order, ["build", "test", "deploy", "docs"])
+        self.assertLess(order.index("build"), order.index("test"))
+        self.assertLess(order.index("test"), order.index("deploy"))
+        result = self.run_script("schedule", "--file", path)
+        self.assertEqual(result.stdout.split(), ["docs", "build", "test", "deploy"])
+        result = self.run_script("detect-cycle", "--file", path)
+        self.assertEqual((result.returncode, result.stdout), (0, "No cycle detected.\n"))
+
+    def test_exit_status(self):
+        cyclic = self.write_jsonl({"task": "a", "dependencies": ["b"]}, {"task": "b", "dependencies": ["a"]})
+        result = self.run_script("detect-cycle", "--file", cyclic)
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Cycle detected: ", result.stdout)
+        self.assertEqual(self.run_script("sort", "--file", cyclic).returncode, 1)
+        missing = self.write_jsonl({"task": "a", "dependencies": ["nowhere"]})
+        result = self.run_script("sort", "--file", missing)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("Error: Dependency 'nowhere' of task 'a' does not exist.", result.stderr)
+        self.assertEqual(self.run_script("sort", "--file", os.path.join(self.directory, "none.csv")).returncode, 2)
+
+    def test_saved_tasks_are_read_not_written(self):
+        self.assertEqual(self.run_script("sort").stdout, "")
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_import_leaves_heavy_modules_unloaded(self):
+        code = "import sys, PaythonDraft_01; print(sorted({'networkx', 'matplotlib', 'argparse'} & set(sys.modules)))"
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.stdout.strip(), "[]", result.stderr)
+
+
+class ScriptServerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cycle_reply_from_a_server_run_as_a_script(self):
+        # Run as a script the scheduler is __main__; its CycleError has to be the one clients catch
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.sock")
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, SCRIPT, "--snapshot", os.path.join(directory, "tasks.snap"),
+                "--journal", os.path.join(directory, "tasks.journal"), "serve", "--socket", path,
+                stdout=asyncio.subprocess.PIPE)
+            try:
+                line = await asyncio.wait_for(process.stdout.readline(), 60)
+                self.assertTrue(line.startswith(b"Serving 0 tasks"), line)
+                client = await TaskClient.connect(path)
+                await client.call("add_task", task="a")
+                await client.call("add_task", task="b", dependencies=["a"])
+                with self.assertRaises(CycleError) as caught:
+                    await client.call("edit_dependencies", task="a", dependencies=["b"])
+                self.assertEqual(caught.exception.cycle, ["b", "a", "b"])
+                await client.close()
+            finally:
+                process.send_signal(signal.SIGTERM)
+                await asyncio.wait_for(process.wait(), 60)
+            self.assertEqual(process.returncode, 0)
+            self.assertTrue(os.path.exists(os.path.join(directory, "tasks.snap")))
+
+
+if __name__ == "__main__":
+    unittest.main()
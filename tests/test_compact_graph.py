@@ -0,0 +1,100 @@
+"""The compact backend behaves like the networkx one, and its arrays stay consistent."""
+import itertools
+import random
+import unittest
+from datetime import date
+from unittest import mock
+
+import networkx as nx
+
+import support
+from support import BACKENDS, FIRST_DAY, random_edit, state
+
+from PaythonDraft_01 import TaskScheduler
+from compact_graph import CompactDiGraph, pack_deadline, unpack_deadline
+
+
+def random_edits(backend, seed, count):
+    # The same edits for either backend, down to the names new_name() hands out
+    rng = random.Random(seed)
+    scheduler = TaskScheduler(backend)
+    with mock.patch.object(support, "_names", itertools.count()):
+        for _ in range(count):
+            random_edit(scheduler, rng)
+    return scheduler
+
+
+class CompactDiGraphTest(unittest.TestCase):
+    def test_matches_a_networkx_digraph(self):
+        rng = random.Random(12)
+        compact = CompactDiGraph()
+        reference = nx.DiGraph()
+        for step in range(3000):
+            nodes = list(reference)
+            choice = rng.random()
+            if choice < 0.2 or len(nodes) < 2:
+                for graph in (compact, reference):
+                    graph.add_node(f"n{step}")
+            elif choice < 0.6:
+                u, v = rng.sample(nodes, 2)
+                for graph in (compact, reference):
+                    graph.add_edge(u, v)
+            elif choice < 0.8:
+                u = rng.choice(nodes)
+                successors = list(reference.successors(u))
+                if successors:
+                    v = rng.choice(successors)
+                    for graph in (compact, reference):
+                        graph.remove_edge(u, v)
+            elif choice < 0.9:
+                node = rng.choice(nodes)
+                for graph in (compact, reference):
+                    graph.remove_node(node)
+            else:
+                old = rng.choice(nodes)
+                compact.rename_node(old, f"r{step}")
+                nx.relabel_nodes(reference, {old: f"r{step}"}, copy=False)
+            if step % 100 == 0:
+                compact.compact()  # folds the delta back into the CSR arrays
+        self.assertEqual(compact.number_of_nodes(), reference.number_of_nodes())
+        self.assertEqual(compact.number_of_edges(), reference.number_of_edges())
+        self.assertCountEqual(compact.edges(), reference.edges())
+        for node in reference:
+            self.assertCountEqual(compact.successors(node), reference.successors(node))
+            self.assertCountEqual(compact.predecessors(node), reference.predecessors(node))
+            self.assertEqual(compact.in_degree(node), reference.in_degree(node))
+        self.assertTrue(nx.utils.graphs_equal(compact.to_networkx(), reference))
+
+    def test_deadlines_pack_to_epoch_days(self):
+        self.assertEqual(pack_deadline(date(1970, 1, 2)), 1)
+        for day in (date(1, 1, 1), date(1969, 12, 31), FIRST_DAY, date(9999, 12, 31)):
+            self.assertEqual(unpack_deadline(pack_deadline(day)), day)
+
+
+class BackendTest(unittest.TestCase):
+    def test_same_edits_same_state(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                compact = random_edits("compact", seed, 300)
+                reference = random_edits("networkx", seed, 300)
+                self.assertEqual(state(compact), state(reference))
+
+    def test_task_details(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                scheduler.add_task("a", priority=0, deadline="2030-01-01", description="first", duration=1.5)
+                scheduler.add_task("b", ["a"])
+                self.assertEqual(dict(scheduler.task_details["a"]), {
+                    "dependencies": [], "priority": 0, "deadline": date(2030, 1, 1), "description": "first",
+                    "action": None, "duration": 1.5})
+                self.assertEqual(scheduler.task_details["b"]["dependencies"], ["a"])
+                self.assertIsNone(scheduler.task_details["b"]["priority"])
+                with self.assertRaises(ValueError):
+                    scheduler.add_task("c", priority=200)
+                self.assertNotIn("c", scheduler.graph)
+                self.assertNotIn("c", scheduler.task_details)
+
+
+if __name__ == "__main__":
+    unittest.main()
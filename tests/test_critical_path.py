@@ -0,0 +1,92 @@
+"""Critical path, makespan, slack and lateness from per-task durations."""
+import random
+import unittest
+from datetime import date
+
+from support import BACKENDS, FIRST_DAY, CycleError, add_random_tasks
+
+from PaythonDraft_01 import TaskScheduler
+
+
+def longest_finish(scheduler):
+    # Earliest finish of every task by plain recursion over the dependencies, for comparison
+    finish = {}
+
+    def visit(task):
+        if task not in finish:
+            start = max((visit(predecessor) for predecessor in scheduler.graph.predecessors(task)), default=0)
+            finish[task] = start + scheduler.get_duration(task)
+        return finish[task]
+
+    for task in scheduler.graph:
+        visit(task)
+    return finish
+
+
+class CriticalPathTest(unittest.TestCase):
+    def build(self, backend):
+        #   design(2) -> build(5) -> test(3) -> ship(1)
+        #   design(2) -> docs(1) -------------> ship(1)
+        scheduler = TaskScheduler(backend)
+        scheduler.add_task("design", duration=2)
+        scheduler.add_task("build", ["design"], duration=5)
+        scheduler.add_task("docs", ["design"], duration=1, deadline="2030-01-02")
+        scheduler.add_task("test", ["build"], duration=3)
+        scheduler.add_task("ship", ["test", "docs"], duration=1, deadline="2030-01-10")
+        scheduler.add_task("milestone")
+        return scheduler
+
+    def test_path_makespan_and_slack(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                makespan, path, timings = self.build(backend).critical_path(date(2030, 1, 1))
+                self.assertEqual(makespan, 11)
+                self.assertEqual(path, ["design", "build", "test", "ship"])
+                self.assertEqual(timings["docs"], {"earliest_start": 2, "earliest_finish": 3, "latest_start": 9,
+                                                   "latest_finish": 10, "slack": 7, "late": True})
+                self.assertTrue(all(timings[task]["slack"] == 0 for task in path))
+                self.assertTrue(timings["ship"]["late"])  # finishes after day 11, Jan 12 > Jan 10
+                self.assertEqual(timings["milestone"]["slack"], 11)
+
+    def test_lateness_follows_the_start_date(self):
+        scheduler = self.build("networkx")
+        _, _, timings = scheduler.critical_path(date(2029, 12, 20))
+        self.assertFalse(timings["docs"]["late"])
+        self.assertFalse(timings["ship"]["late"])
+        _, _, timings = scheduler.critical_path(date(2030, 1, 5))
+        self.assertTrue(timings["ship"]["late"])
+
+    def test_edits_change_the_answer(self):
+        scheduler = self.build("compact")
+        scheduler.critical_path(FIRST_DAY)
+        scheduler.set_duration("docs", 20)
+        makespan, path, _ = scheduler.critical_path(FIRST_DAY)
+        self.assertEqual((makespan, path), (23, ["design", "docs", "ship"]))
+
+    def test_matches_the_longest_path_on_random_graphs(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                add_random_tasks(scheduler, random.Random(7), 200)
+                makespan, path, timings = scheduler.critical_path(FIRST_DAY)
+                finish = longest_finish(scheduler)
+                self.assertEqual(makespan, max(finish.values()))
+                self.assertEqual(timings[path[-1]]["earliest_finish"], makespan)
+                self.assertEqual(sum(scheduler.get_duration(task) for task in path), makespan)
+                for u, v in zip(path, path[1:]):
+                    self.assertTrue(scheduler.graph.has_edge(u, v))
+                for task, timing in timings.items():
+                    self.assertEqual(timing["earliest_finish"], finish[task])
+                    self.assertGreaterEqual(timing["slack"], 0)
+
+    def test_empty_and_cyclic_graphs(self):
+        self.assertEqual(TaskScheduler().critical_path(FIRST_DAY), (0, [], {}))
+        scheduler = self.build("networkx")
+        scheduler.graph.add_edge("ship", "design")
+        scheduler.invalidate_order()
+        with self.assertRaises(CycleError):
+            scheduler.critical_path(FIRST_DAY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""Cycle detection and topological sort in one iterative pass."""
+import contextlib
+import io
+import random
+import unittest
+
+from support import BACKENDS, add_random_tasks, check_order
+
+from PaythonDraft_01 import TaskScheduler
+
+
+def check_cycle(test, scheduler, cycle):
+    # A closed walk along existing dependencies, every task on it once
+    test.assertGreater(len(cycle), 1)
+    test.assertEqual(cycle[0], cycle[-1])
+    test.assertEqual(len(set(cycle[:-1])), len(cycle) - 1)
+    for u, v in zip(cycle, cycle[1:]):
+        test.assertTrue(scheduler.graph.has_edge(u, v), f"{u} -> {v}")
+
+
+class CycleDetectionTest(unittest.TestCase):
+    def test_deep_chain(self):
+        # Far deeper than the recursion limit
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                scheduler.bulk_add({"task": f"t{i}", "dependencies": [f"t{i - 1}"] if i else []}
+                                   for i in range(20_000))
+                self.assertEqual(scheduler.detect_cycle(), (False, []))
+                self.assertEqual(scheduler.topological_sort(), [f"t{i}" for i in range(20_000)])
+                scheduler.graph.add_edge("t19999", "t0")
+                scheduler.invalidate_order()
+                has_cycle, cycle = scheduler.detect_cycle()
+                self.assertTrue(has_cycle)
+                self.assertEqual(len(cycle), 20_001)
+                check_cycle(self, scheduler, cycle)
+
+    def test_cycle_witness_on_random_graphs(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(11)
+                for _ in range(20):
+                    scheduler = TaskScheduler(backend)
+                    add_random_tasks(scheduler, rng, 60)
+                    check_order(self, scheduler, scheduler.topological_sort())
+                    tasks = list(scheduler.graph)
+                    for _ in range(3):
+                        u, v = rng.sample(tasks, 2)
+                        scheduler.graph.add_edge(v, u)  # bypasses the checks, as a direct edit would
+                    scheduler.invalidate_order()
+                    has_cycle, cycle = scheduler.detect_cycle()
+                    if has_cycle:
+                        check_cycle(self, scheduler, cycle)
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            self.assertIsNone(scheduler.topological_sort())
+                    else:
+                        check_order(self, scheduler, scheduler.topological_sort())
+
+    def test_self_loop(self):
+        scheduler = TaskScheduler()
+        scheduler.add_task("a")
+        scheduler.add_task("b", ["a"])
+        scheduler.graph.add_edge("b", "b")
+        scheduler.invalidate_order()
+        self.assertEqual(scheduler.detect_cycle(), (True, ["b", "b"]))
+
+    def test_empty_graph(self):
+        scheduler = TaskScheduler()
+        self.assertEqual(scheduler.detect_cycle(), (False, []))
+        self.assertEqual(scheduler.topological_sort(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
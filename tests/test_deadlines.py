@@ -0,0 +1,71 @@
+"""Deadlines as dates and the index behind due_before / next_due / sort_by_deadline."""
+import random
+import unittest
+from datetime import date
+
+from support import BACKENDS, FIRST_DAY, random_edit
+
+from PaythonDraft_01 import TaskScheduler
+from deadlines import to_date
+
+
+def due_before(scheduler, day):
+    # The same answer worked out from task_details, without the index
+    due = [task for task in scheduler.graph
+           if scheduler.task_details[task]["deadline"] is not None and scheduler.task_details[task]["deadline"] < day]
+    return sorted(due, key=scheduler.get_deadline_key)
+
+
+class DeadlineIndexTest(unittest.TestCase):
+    def build(self, backend):
+        scheduler = TaskScheduler(backend)
+        scheduler.add_task("a", deadline="2030-03-01")
+        scheduler.add_task("b", deadline=date(2030, 5, 1))
+        scheduler.add_task("c")
+        return scheduler
+
+    def test_range_queries(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = self.build(backend)
+                self.assertEqual(scheduler.task_details["a"]["deadline"], date(2030, 3, 1))
+                self.assertEqual(scheduler.sort_by_deadline(), ["a", "b", "c"])
+                self.assertEqual(scheduler.due_before("2030-05-01"), ["a"])
+                self.assertEqual(scheduler.overdue(date(2031, 1, 1)), ["a", "b"])
+                self.assertEqual(scheduler.next_due(1, "2030-04-01"), ["b"])
+                scheduler.set_deadline("c", "2030-01-15")
+                scheduler.set_deadline("a", None)
+                self.assertEqual(scheduler.sort_by_deadline(), ["c", "b", "a"])
+                self.assertEqual(scheduler.due_before("2030-05-01"), ["c"])
+
+    def test_direct_edit_then_invalidate_order(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = self.build(backend)
+                self.assertEqual(scheduler.due_before("2030-06-01"), ["a", "b"])
+                scheduler.task_details["a"]["deadline"] = date(2031, 1, 1)
+                scheduler.invalidate_order()
+                self.assertEqual(scheduler.due_before("2030-06-01"), ["b"])
+                self.assertEqual(scheduler.sort_by_deadline(), ["b", "a", "c"])
+
+    def test_index_follows_random_edits(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(6)
+                scheduler = TaskScheduler(backend)
+                day = FIRST_DAY.replace(month=7)
+                for _ in range(400):
+                    random_edit(scheduler, rng)
+                    self.assertEqual(scheduler.due_before(day), due_before(scheduler, day))
+
+    def test_to_date(self):
+        self.assertEqual(to_date(" 2030-02-03 "), date(2030, 2, 3))
+        self.assertIsNone(to_date(""))
+        for bad in ("2030-02-30", "tomorrow", 20300203, {"year": 2030, "month": 2, "day": 3}):
+            with self.subTest(value=bad):
+                with self.assertRaises(ValueError):
+                    to_date(bad)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""TaskExecutor: dependency order, priority among ready tasks, failures, and the three modes."""
+import asyncio
+import functools
+import threading
+import unittest
+import warnings
+
+from support import CycleError
+
+from PaythonDraft_01 import TaskScheduler
+from executor import TaskExecutor
+
+MODES = ("thread", "process", "asyncio")
+
+
+async def double_later(value):
+    await asyncio.sleep(0)
+    return value * 2
+
+
+class ExecutorTest(unittest.TestCase):
+    def recording_scheduler(self):
+        # Every action appends its task to self.ran, so the order they ran in can be checked
+        self.ran = []
+        lock = threading.Lock()
+
+        def action(task):
+            with lock:
+                self.ran.append(task)
+            return task.upper()
+
+        scheduler = TaskScheduler()
+        for task, dependencies, priority in (("setup", [], 1), ("low", ["setup"], 2), ("high", ["setup"], 9),
+                                             ("mid", ["setup"], 5), ("report", ["low", "high", "mid"], 0)):
+            scheduler.add_task(task, dependencies, priority, action=functools.partial(action, task))
+        return scheduler
+
+    def test_one_worker_runs_the_schedule(self):
+        for mode in ("thread", "asyncio"):
+            with self.subTest(mode=mode):
+                scheduler = self.recording_scheduler()
+                results = TaskExecutor(scheduler, mode, max_workers=1).run()
+                self.assertEqual(self.ran, ["setup", "high", "mid", "low", "report"])
+                self.assertEqual(self.ran, scheduler.schedule())
+                self.assertEqual(results["report"], "REPORT")
+
+    def test_dependencies_finish_first_with_many_workers(self):
+        scheduler = self.recording_scheduler()
+        TaskExecutor(scheduler, "thread", max_workers=4).run()
+        self.assertEqual(self.ran[0], "setup")
+        self.assertEqual(self.ran[-1], "report")
+
+    def test_failure_stops_the_run(self):
+        for mode in ("thread", "asyncio"):
+            with self.subTest(mode=mode):
+                scheduler = self.recording_scheduler()
+                scheduler.task_details["high"]["action"] = functools.partial(int, "not a number")
+                with self.assertRaisesRegex(RuntimeError, "^Task 'high' failed: ") as caught:
+                    TaskExecutor(scheduler, mode, max_workers=1).run()
+                self.assertIsInstance(caught.exception.__cause__, ValueError)
+                self.assertNotIn("report", self.ran)
+
+    def test_tasks_without_an_action_only_pass_on(self):
+        scheduler = TaskScheduler()
+        scheduler.add_task("milestone")
+        scheduler.add_task("after", ["milestone"], action=functools.partial(pow, 2, 10))
+        self.assertEqual(TaskExecutor(scheduler, "thread").run(), {"milestone": None, "after": 1024})
+
+    def test_async_actions_are_awaited_in_every_mode(self):
+        for mode in MODES:
+            with self.subTest(mode=mode):
+                scheduler = TaskScheduler()
+                scheduler.add_task("first", action=functools.partial(double_later, 2))
+                scheduler.add_task("second", ["first"], action=functools.partial(double_later, 5))
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error", RuntimeWarning)  # "coroutine ... was never awaited"
+                    results = TaskExecutor(scheduler, mode, max_workers=2).run()
+                self.assertEqual(results, {"first": 4, "second": 10})
+
+    def test_process_mode_needs_picklable_actions(self):
+        scheduler = TaskScheduler()
+        scheduler.add_task("square", action=functools.partial(pow, 7, 2))
+        self.assertEqual(TaskExecutor(scheduler, "process", max_workers=1).run(), {"square": 49})
+        scheduler.add_task("lambda", action=lambda: 1)
+        with self.assertRaisesRegex(RuntimeError, "^Task 'lambda' failed: "):
+            TaskExecutor(scheduler, "process", max_workers=1).run()
+
+    def test_cycle_is_refused_before_anything_runs(self):
+        scheduler = self.recording_scheduler()
+        scheduler.graph.add_edge("report", "setup")
+        scheduler.invalidate_order()
+        with self.assertRaises(CycleError) as caught:
+            TaskExecutor(scheduler).run()
+        self.assertEqual(caught.exception.cycle[0], caught.exception.cycle[-1])
+        self.assertEqual(self.ran, [])
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            TaskExecutor(TaskScheduler(), mode="fiber")
+        with self.assertRaises(ValueError):
+            TaskExecutor(TaskScheduler(), max_workers=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
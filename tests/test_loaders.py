@@ -0,0 +1,108 @@
+"""Streaming CSV / JSONL loading into bulk_add, and how bad rows are reported."""
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from support import BACKENDS
+
+from PaythonDraft_01 import CycleError, TaskScheduler, build_parser, run_command
+from loaders import iter_jsonl, load_tasks
+
+CSV = """task,dependencies,priority,deadline,description,duration
+deploy,"build,test",8,2030-03-01, Ship it ,0.5
+test,build,,,,
+build,,3,,,2
+"""
+
+
+class LoaderTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, name, text):
+        path = os.path.join(self.directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def write_jsonl(self, *rows):
+        return self.write("tasks.jsonl", "".join((row if isinstance(row, str) else json.dumps(row)) + "\n"
+                                                 for row in rows))
+
+    def test_csv_and_jsonl_load_the_same_tasks(self):
+        jsonl = self.write_jsonl(
+            {"task": "deploy", "dependencies": ["build", "test"], "priority": 8, "deadline": "2030-03-01",
+             "description": "Ship it", "duration": 0.5},
+            {"task": "test", "dependencies": "build"},
+            "",
+            {"task": "build", "priority": 3, "duration": 2})
+        for backend in BACKENDS:
+            for path in (self.write("tasks.csv", CSV), jsonl):
+                with self.subTest(backend=backend, path=os.path.basename(path)):
+                    scheduler = TaskScheduler(backend)
+                    self.assertEqual(load_tasks(scheduler, path), 3)
+                    self.assertEqual(scheduler.topological_sort(), ["build", "test", "deploy"])
+                    details = scheduler.task_details["deploy"]
+                    self.assertEqual((details["priority"], details["deadline"], details["description"],
+                                      details["duration"]), (8, date(2030, 3, 1), "Ship it", 0.5))
+                    self.assertEqual(scheduler.task_details["build"]["duration"], 2)
+
+    def test_bad_rows_name_their_line(self):
+        bad = {
+            "priority list": {"task": "a", "priority": [1]},
+            "priority out of range": {"task": "a", "priority": 11},
+            "priority float": {"task": "a", "priority": 5.5},
+            "description number": {"task": "a", "description": 7},
+            "duration text": {"task": "a", "duration": "soon"},
+            "duration list": {"task": "a", "duration": [1]},
+            "dependencies number": {"task": "a", "dependencies": 3},
+            "dependencies of numbers": {"task": "a", "dependencies": [1, 2]},
+            "deadline dict": {"task": "a", "deadline": {"year": 2030, "month": 1, "day": 1}},
+            "task number": {"task": 5},
+            "missing task": {"priority": 1},
+            "not an object": [1, 2],
+            "not json": '{"task": "a"',
+        }
+        for name, row in bad.items():
+            with self.subTest(name):
+                path = self.write_jsonl({"task": "first"}, row)
+                with self.assertRaises(ValueError) as caught:
+                    list(iter_jsonl(path))
+                self.assertTrue(str(caught.exception).startswith(f"{path}:2: "), caught.exception)
+
+    def test_bad_csv_value(self):
+        path = self.write("tasks.csv", "task,priority\na,1\nb,high\n")
+        with self.assertRaisesRegex(ValueError, f"^{path}:3: Priority"):
+            load_tasks(TaskScheduler(), path)
+
+    def test_failed_load_adds_nothing(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                with self.assertRaises(ValueError):
+                    load_tasks(scheduler, self.write_jsonl({"task": "a"}, {"task": "b", "priority": "x"}))
+                with self.assertRaises(CycleError):
+                    load_tasks(scheduler, self.write_jsonl({"task": "a", "dependencies": ["b"]},
+                                                           {"task": "b", "dependencies": ["a"]}))
+                self.assertEqual(scheduler.graph.number_of_nodes(), 0)
+
+    def test_cli_reports_bad_rows_as_errors(self):
+        # Exit status 1 means a cycle, so bad input has to come out as 2 with a message
+        for row in ({"task": "a", "priority": [1]}, {"task": "a", "description": 7}, [1, 2]):
+            with self.subTest(row=row):
+                path = self.write_jsonl(row)
+                stderr = io.StringIO()
+                with contextlib.redirect_stderr(stderr):
+                    status = run_command(build_parser().parse_args(["sort", "--file", path]))
+                self.assertEqual(status, 2)
+                self.assertIn(f"Error: {path}:1: ", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
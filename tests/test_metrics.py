@@ -0,0 +1,72 @@
+"""Call metrics: counting, timing, export, and the CLI's --metrics switch."""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from support import ROOT
+
+from PaythonDraft_01 import TaskScheduler
+from instrumentation import BUCKETS, Histogram
+
+
+class MetricsTest(unittest.TestCase):
+    def test_calls_and_errors_are_counted(self):
+        scheduler = TaskScheduler()
+        metrics = scheduler.enable_metrics()
+        scheduler.add_task("a")
+        scheduler.add_task("b", ["a"])
+        with self.assertRaises(ValueError):
+            scheduler.add_task("a")
+        scheduler.schedule()
+        self.assertEqual(metrics.calls("add_task"), 3)
+        self.assertEqual(metrics.errors["add_task"], 1)
+        self.assertEqual(metrics.calls("schedule"), 1)
+        exported = metrics.to_dict()
+        self.assertEqual(set(exported["methods"]), {"add_task", "schedule", "detect_cycle"})
+        self.assertEqual(exported["gauges"]["tasks"], 2)
+        self.assertEqual(exported["gauges"]["dependencies"], 1)
+        self.assertIn('task_scheduler_calls_total{method="add_task"} 3', metrics.to_prometheus())
+        metrics.reset()
+        self.assertEqual(metrics.calls("add_task"), 0)
+
+    def test_disabled_metrics_leave_the_class_methods(self):
+        scheduler = TaskScheduler()
+        scheduler.enable_metrics(["add_task"])
+        self.assertIn("add_task", vars(scheduler))
+        scheduler.disable_metrics()
+        self.assertNotIn("add_task", vars(scheduler))
+        self.assertIsNone(scheduler.metrics)
+
+    def test_unknown_method_is_refused(self):
+        with self.assertRaises(ValueError):
+            TaskScheduler().enable_metrics(["no_such_method"])
+
+    def test_histogram_buckets(self):
+        histogram = Histogram()
+        for nanoseconds in (1, 1000, 1024, 4000, 10**12):
+            histogram.observe(nanoseconds)
+        self.assertEqual(histogram.count, 5)
+        self.assertEqual(histogram.counts[0], 3)  # up to 4^5 ns
+        self.assertEqual(histogram.counts[1], 1)  # up to 4^6 ns
+        self.assertEqual(histogram.quantile(0.5), BUCKETS[0])
+        self.assertIsNone(histogram.quantile(1.0))  # the open-ended bucket
+
+    def test_cli_schedule_is_measured(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tasks.jsonl")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write('{"task": "a"}\n{"task": "b", "dependencies": ["a"]}\n')
+            result = subprocess.run([sys.executable, os.path.join(ROOT, "PaythonDraft_01.py"), "--metrics", "json",
+                                     "schedule", "--file", path], cwd=directory, capture_output=True, text=True,
+                                    timeout=60)
+        self.assertEqual(result.stdout.split(), ["a", "b"])
+        methods = json.loads(result.stderr)["methods"]
+        self.assertEqual(methods["schedule"]["calls"], 1)
+        self.assertEqual(methods["bulk_add"]["calls"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
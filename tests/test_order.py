@@ -0,0 +1,98 @@
+"""The incrementally maintained topological order and cycle rejection."""
+import random
+import unittest
+
+from support import BACKENDS, CycleError, check_maintained_order, check_order, random_edit, state
+
+from PaythonDraft_01 import TaskScheduler
+
+
+class MaintainedOrderTest(unittest.TestCase):
+    def test_new_dependency_reorders_tasks(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                for task in ("a", "b", "c", "d"):
+                    scheduler.add_task(task)
+                scheduler.add_task("e", ["d"])
+                self.assertEqual(scheduler.topological_sort(), ["a", "b", "c", "d", "e"])
+                # a now has to come after e: the affected span is reordered, not recomputed
+                scheduler.edit_dependencies("a", ["e"])
+                check_maintained_order(self, scheduler)
+                order = scheduler.topological_sort()
+                self.assertLess(order.index("d"), order.index("e"))
+                self.assertLess(order.index("e"), order.index("a"))
+
+    def test_order_stays_valid_across_random_edits(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(1)
+                scheduler = TaskScheduler(backend)
+                scheduler.topological_sort()  # from here on the order is maintained, never rebuilt
+                for _ in range(600):
+                    random_edit(scheduler, rng)
+                    check_maintained_order(self, scheduler)
+
+    def test_order_of_a_graph_built_without_reads(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(2)
+                scheduler = TaskScheduler(backend)
+                for _ in range(300):
+                    random_edit(scheduler, rng)
+                check_order(self, scheduler, scheduler.topological_sort())
+
+
+class CycleRejectionTest(unittest.TestCase):
+    def build(self, backend):
+        scheduler = TaskScheduler(backend)
+        scheduler.add_task("a")
+        scheduler.add_task("b", ["a"])
+        scheduler.add_task("c", ["b"])
+        scheduler.add_task("d", ["c"])
+        scheduler.add_task("x")
+        return scheduler
+
+    def test_cycle_closing_edit_is_rejected_with_its_path(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = self.build(backend)
+                before = state(scheduler)
+                version = scheduler.version
+                with self.assertRaises(CycleError) as caught:
+                    scheduler.edit_dependencies("a", ["x", "d"])
+                cycle = caught.exception.cycle
+                self.assertEqual(cycle[0], cycle[-1])
+                self.assertCountEqual(cycle[:-1], ["a", "b", "c", "d"])
+                edges = {(u, v) for u in scheduler.graph for v in scheduler.graph.successors(u)} | {("d", "a")}
+                for u, v in zip(cycle, cycle[1:]):
+                    self.assertIn((u, v), edges)
+                # Nothing changed, not even the dependency on x that was accepted first
+                self.assertEqual(state(scheduler), before)
+                self.assertEqual(scheduler.version, version)
+                self.assertFalse(scheduler.detect_cycle()[0])
+                check_maintained_order(self, scheduler)
+
+    def test_self_dependency_is_rejected(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = self.build(backend)
+                before = state(scheduler)
+                with self.assertRaises(CycleError) as caught:
+                    scheduler.edit_dependencies("b", ["b"])
+                self.assertEqual(caught.exception.cycle, ["b", "b"])
+                self.assertEqual(state(scheduler), before)
+
+    def test_cycle_in_the_graph_is_reported(self):
+        scheduler = self.build("networkx")
+        scheduler.graph.add_edge("d", "b")
+        scheduler.invalidate_order()
+        has_cycle, cycle = scheduler.detect_cycle()
+        self.assertTrue(has_cycle)
+        self.assertCountEqual(cycle[:-1], ["b", "c", "d"])
+        with self.assertRaises(CycleError):
+            scheduler.schedule()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Snapshot plus journal replay: restarts come back to the live state, crash leftovers are dropped."""
+import json
+import os
+import random
+import tempfile
+import unittest
+
+from support import BACKENDS, add_random_tasks, check_order, random_edit, state
+
+from PaythonDraft_01 import TaskScheduler
+from persistence import checkpoint, open_journaled
+
+
+class PersistenceTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.snapshot = os.path.join(directory.name, "tasks.snap")
+        self.journal = os.path.join(directory.name, "tasks.journal")
+
+    def open(self, backend, read_only=False):
+        return open_journaled(TaskScheduler(backend), self.snapshot, self.journal, read_only=read_only)
+
+    def reopen(self, scheduler, backend):
+        scheduler.journal.close()
+        restored = self.open(backend)
+        self.addCleanup(restored.journal.close)
+        return restored
+
+    def append(self, text):
+        with open(self.journal, "a", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_snapshot_and_replay_equal_live_state(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                for path in (self.snapshot, self.journal):
+                    if os.path.exists(path):
+                        os.remove(path)
+                rng = random.Random(4)
+                scheduler = self.open(backend)
+                for _ in range(150):
+                    random_edit(scheduler, rng)
+                checkpoint(scheduler, self.snapshot)
+                for _ in range(150):
+                    random_edit(scheduler, rng)
+                with self.assertRaises(RuntimeError):
+                    with scheduler.transaction():  # never reaches the journal
+                        random_edit(scheduler, rng)
+                        raise RuntimeError("abandon the block")
+                with scheduler.transaction():
+                    for _ in range(5):
+                        random_edit(scheduler, rng)
+                expected = state(scheduler)
+                read_only = self.open(backend, read_only=True)
+                self.assertEqual(state(read_only), expected)
+                restored = self.reopen(scheduler, backend)
+                self.assertEqual(state(restored), expected)
+                check_order(self, restored, restored.topological_sort())
+                # The restored scheduler keeps journaling where the old one stopped
+                random_edit(restored, rng)
+                expected = state(restored)
+                self.assertEqual(state(self.reopen(restored, backend)), expected)
+
+    def test_torn_tail_is_dropped(self):
+        scheduler = self.open("networkx")
+        scheduler.add_task("a")
+        scheduler.add_task("b", ["a"], priority=2)
+        expected = state(scheduler)
+        scheduler.journal.close()
+        self.append('["add_task", "c", ["b"], 1')  # the write a crash cut short
+        self.assertEqual(state(self.open("networkx", read_only=True)), expected)
+
+    def test_uncommitted_transaction_is_dropped(self):
+        scheduler = self.open("compact")
+        scheduler.add_task("a")
+        expected = state(scheduler)
+        scheduler.journal.close()
+        self.append(json.dumps(["begin"]) + "\n")
+        self.append(json.dumps(["add_task", "b", ["a"], 1, None, None, None]) + "\n")
+        self.append(json.dumps(["set", "a", "priority", 9]) + "\n")
+        self.assertEqual(state(self.open("compact", read_only=True)), expected)
+
+    def test_unfinished_bulk_add_is_dropped(self):
+        scheduler = self.open("networkx")
+        scheduler.add_task("a")
+        scheduler.bulk_add([{"task": "b", "dependencies": ["a"]}])
+        expected = state(scheduler)
+        scheduler.journal.close()
+        self.append(json.dumps(["bulk_task", "c", ["b"], 1, "2030-01-01", None, None]) + "\n")
+        self.append(json.dumps(["bulk_task", "d", ["c"], 2, None, None, None]) + "\n")
+        self.assertEqual(state(self.open("networkx", read_only=True)), expected)
+
+    def test_journal_from_an_older_snapshot_is_ignored(self):
+        scheduler = self.open("networkx")
+        add_random_tasks(scheduler, random.Random(5), 10)
+        checkpoint(scheduler, self.snapshot)
+        expected = state(scheduler)
+        scheduler.journal.close()
+        with open(self.journal, "w", encoding="utf-8") as f:
+            f.write(json.dumps(["snapshot", 0]) + "\n")
+            f.write(json.dumps(["add_task", "stale", [], 1, None, None, None]) + "\n")
+        self.assertEqual(state(self.open("networkx", read_only=True)), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
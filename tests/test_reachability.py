@@ -0,0 +1,93 @@
+"""depends_on / ancestors / descendants and transitive reduction, with and without the closure index."""
+import random
+import unittest
+from unittest import mock
+
+import networkx as nx
+
+from support import BACKENDS, CycleError, add_random_tasks, random_edit
+
+import PaythonDraft_01
+from PaythonDraft_01 import TaskScheduler
+
+
+def as_networkx(scheduler):
+    return nx.DiGraph(list(scheduler.graph.edges())) if scheduler.graph.number_of_edges() else nx.DiGraph()
+
+
+class ReachabilityTest(unittest.TestCase):
+    def check_queries(self, scheduler, rng):
+        reference = as_networkx(scheduler)
+        reference.add_nodes_from(scheduler.graph)
+        tasks = list(scheduler.graph)
+        for task in rng.sample(tasks, min(len(tasks), 15)):
+            ancestors = nx.ancestors(reference, task)
+            self.assertEqual(scheduler.ancestors(task), ancestors, task)
+            self.assertEqual(scheduler.descendants(task), nx.descendants(reference, task), task)
+            for other in rng.sample(tasks, min(len(tasks), 10)):
+                self.assertEqual(scheduler.depends_on(task, other), other in ancestors, (task, other))
+
+    def test_queries_follow_random_edits(self):
+        for backend in BACKENDS:
+            for indexed in (True, False):
+                with self.subTest(backend=backend, indexed=indexed), \
+                        mock.patch.object(PaythonDraft_01, "REACHABILITY_LIMIT", 10**6 if indexed else 0):
+                    rng = random.Random(6)
+                    scheduler = TaskScheduler(backend)
+                    add_random_tasks(scheduler, rng, 80)
+                    for step in range(200):
+                        random_edit(scheduler, rng)
+                        if step % 10 == 0:
+                            self.check_queries(scheduler, rng)
+                    self.check_queries(scheduler, rng)  # an edge removal drops the index until the next query
+                    self.assertEqual(scheduler._reachability is not None, indexed)
+
+    def test_transitive_reduction(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(3)
+                scheduler = TaskScheduler(backend)
+                add_random_tasks(scheduler, rng, 150)
+                for task in rng.sample(list(scheduler.graph), 20):
+                    scheduler.delete_task(task)  # reconnects dependencies, leaving redundant edges behind
+                closure = nx.transitive_closure_dag(as_networkx(scheduler))
+                edges = set(scheduler.graph.edges())
+                removed = scheduler.transitive_reduction()
+                self.assertEqual(set(removed), edges - set(scheduler.graph.edges()))
+                self.assertEqual(set(scheduler.graph.edges()),
+                                 set(nx.transitive_reduction(as_networkx(scheduler)).edges()))
+                self.assertTrue(nx.utils.edges_equal(nx.transitive_closure_dag(as_networkx(scheduler)).edges(),
+                                                     closure.edges()))
+                for task in scheduler.graph:
+                    self.assertCountEqual(scheduler.task_details[task]["dependencies"],
+                                          scheduler.graph.predecessors(task))
+                self.assertEqual(scheduler.transitive_reduction(), [])
+
+    def test_reduction_is_undone_with_its_transaction(self):
+        scheduler = TaskScheduler()
+        scheduler.add_task("a")
+        scheduler.add_task("b", ["a"])
+        scheduler.add_task("c", ["a", "b"])
+        with self.assertRaises(RuntimeError):
+            with scheduler.transaction():
+                self.assertEqual(scheduler.transitive_reduction(), [("a", "c")])
+                raise RuntimeError
+        self.assertTrue(scheduler.graph.has_edge("a", "c"))
+        self.assertCountEqual(scheduler.task_details["c"]["dependencies"], ["a", "b"])
+
+    def test_errors(self):
+        scheduler = TaskScheduler()
+        scheduler.add_task("a")
+        with self.assertRaises(ValueError):
+            scheduler.depends_on("a", "missing")
+        with self.assertRaises(ValueError):
+            scheduler.ancestors("missing")
+        scheduler.add_task("b", ["a"])
+        scheduler.graph.add_edge("b", "a")
+        scheduler.invalidate_order()
+        with self.assertRaises(CycleError):
+            scheduler.depends_on("a", "b")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Headless rendering: the layered layout, the file formats and the render command."""
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from support import BACKENDS, ROOT
+
+from PaythonDraft_01 import TaskScheduler
+from rendering import layered_layout, neighborhood
+
+
+def pipeline(backend="networkx"):
+    # build/x and build/y collapse into one "build" box with --collapse /
+    scheduler = TaskScheduler(backend)
+    scheduler.add_task("fetch")
+    scheduler.add_task("build/x", ["fetch"])
+    scheduler.add_task("build/y", ["fetch"])
+    scheduler.add_task("test", ["build/x", "build/y"])
+    scheduler.add_task("docs")
+    return scheduler
+
+
+def collapse(task):
+    return task.split("/", 1)[0] if "/" in task else None
+
+
+class LayoutTest(unittest.TestCase):
+    def test_edges_run_left_to_right(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = pipeline(backend)
+                layout = layered_layout(scheduler)
+                self.assertEqual(len(layout.position), 5)
+                for u, v in layout.edges:
+                    self.assertLess(layout.position[u][0], layout.position[v][0])
+
+    def test_collapsed_groups(self):
+        layout = layered_layout(pipeline(), groups=collapse)
+        self.assertEqual(layout.sizes[("group", "build")], 2)
+        self.assertEqual(layout.labels[("group", "build")], "build (2 tasks)")
+        self.assertCountEqual(layout.edges, [(("task", "fetch"), ("group", "build")),
+                                             (("group", "build"), ("task", "test"))])
+
+    def test_neighborhood(self):
+        scheduler = pipeline()
+        self.assertEqual(neighborhood(scheduler, "test", "ancestors"), {"test", "build/x", "build/y", "fetch"})
+        self.assertEqual(neighborhood(scheduler, "fetch", "descendants", depth=1), {"fetch", "build/x", "build/y"})
+        self.assertEqual(neighborhood(scheduler, "docs"), {"docs"})
+        with self.assertRaises(ValueError):
+            neighborhood(scheduler, "missing")
+
+
+class RenderTest(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_formats(self):
+        scheduler = pipeline()
+        self.assertEqual(scheduler.visualize(self.path("tasks.svg")), 5)
+        with open(self.path("tasks.svg"), encoding="utf-8") as f:
+            svg = f.read()
+        self.assertEqual(svg.count("<rect "), 5)
+        self.assertEqual(svg.count("<line "), 4)
+        self.assertEqual(scheduler.visualize(self.path("tasks.dot"), around="test", direction="ancestors"), 4)
+        with open(self.path("tasks.dot"), encoding="utf-8") as f:
+            self.assertEqual(f.read().count(" -> "), 4)
+        self.assertEqual(scheduler.visualize(self.path("tasks.png")), 5)
+        with open(self.path("tasks.png"), "rb") as f:
+            self.assertEqual(f.read(8), b"\x89PNG\r\n\x1a\n")
+
+    def test_collapsed_render_counts_tasks(self):
+        scheduler = pipeline()
+        self.assertEqual(scheduler.visualize(self.path("tasks.svg"), groups=collapse), 5)
+        with open(self.path("tasks.svg"), encoding="utf-8") as f:
+            self.assertEqual(f.read().count("<rect "), 4)
+
+    def test_refused(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported output format"):
+            pipeline().visualize(self.path("tasks.pdf"))
+        with self.assertRaisesRegex(ValueError, "empty graph"):
+            TaskScheduler().visualize(self.path("tasks.svg"))
+
+    def test_render_command(self):
+        tasks = self.path("tasks.jsonl")
+        with open(tasks, "w", encoding="utf-8") as f:
+            f.write('{"task": "fetch"}\n{"task": "build/x", "dependencies": ["fetch"]}\n'
+                    '{"task": "build/y", "dependencies": ["fetch"]}\n')
+        result = subprocess.run([sys.executable, os.path.join(ROOT, "PaythonDraft_01.py"), "render",
+                                 self.path("tasks.svg"), "--file", tasks, "--collapse", "/"],
+                                cwd=self.directory, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, f"Wrote 3 tasks to '{self.path('tasks.svg')}'.\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+"""Dependency-aware scheduling by priority or deadline, from a heap of ready tasks."""
+import itertools
+import random
+import unittest
+
+from support import BACKENDS, CycleError, add_random_tasks, check_greedy, check_order
+
+from PaythonDraft_01 import TaskScheduler
+
+
+class ScheduleTest(unittest.TestCase):
+    def build(self, backend="networkx"):
+        scheduler = TaskScheduler(backend)
+        scheduler.add_task("fetch", priority=2, deadline="2030-03-01")
+        scheduler.add_task("lint", priority=7)
+        scheduler.add_task("build", ["fetch"], priority=9, deadline="2030-02-01")
+        scheduler.add_task("docs", priority=1, deadline="2030-01-15")
+        scheduler.add_task("ship", ["build", "lint"], priority=10)
+        return scheduler
+
+    def test_priority_and_deadline_orders(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = self.build(backend)
+                # build outranks lint but has to wait for fetch
+                self.assertEqual(scheduler.schedule(), ["lint", "fetch", "build", "ship", "docs"])
+                self.assertEqual(scheduler.schedule("deadline"), ["docs", "fetch", "build", "lint", "ship"])
+                # The global sorts ignore dependencies
+                self.assertEqual(scheduler.STBP()[:2], ["ship", "build"])
+                self.assertEqual(scheduler.sort_by_deadline()[:3], ["docs", "build", "fetch"])
+
+    def test_ties_break_on_the_other_key(self):
+        scheduler = TaskScheduler()
+        scheduler.add_task("late", priority=5, deadline="2030-06-01")
+        scheduler.add_task("undated", priority=5)
+        scheduler.add_task("soon", priority=5, deadline="2030-01-01")
+        scheduler.add_task("low", priority=1, deadline="2029-01-01")
+        scheduler.add_task("none")
+        self.assertEqual(scheduler.schedule(), ["soon", "late", "undated", "low", "none"])
+        self.assertEqual(scheduler.schedule("deadline"), ["low", "soon", "late", "undated", "none"])
+
+    def test_greedy_on_random_graphs(self):
+        for backend in BACKENDS:
+            for by in ("priority", "deadline"):
+                with self.subTest(backend=backend, by=by):
+                    scheduler = TaskScheduler(backend)
+                    add_random_tasks(scheduler, random.Random(4), 400)
+                    schedule = scheduler.schedule(by)
+                    check_order(self, scheduler, schedule)
+                    check_greedy(self, scheduler, schedule, scheduler.schedule_key(by))
+
+    def test_iter_schedule_streams(self):
+        scheduler = TaskScheduler()
+        add_random_tasks(scheduler, random.Random(5), 200)
+        stream = scheduler.iter_schedule()
+        first = list(itertools.islice(stream, 3))
+        self.assertEqual(first, scheduler.schedule()[:3])
+        self.assertEqual(first + list(stream), scheduler.schedule())
+
+    def test_cycle_and_unknown_key(self):
+        scheduler = self.build()
+        with self.assertRaises(ValueError):
+            scheduler.schedule("size")
+        scheduler.graph.add_edge("ship", "fetch")
+        scheduler.invalidate_order()
+        with self.assertRaises(CycleError) as caught:
+            scheduler.schedule()
+        self.assertEqual(caught.exception.cycle[0], caught.exception.cycle[-1])
+
+    def test_empty_graph(self):
+        self.assertEqual(TaskScheduler().schedule(), [])
+        self.assertEqual(list(TaskScheduler("compact").iter_schedule("deadline")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""The task server, driven through TaskClient over a Unix socket."""
+import asyncio
+import os
+import random
+import tempfile
+import unittest
+
+from support import BACKENDS, CycleError, state
+
+from PaythonDraft_01 import TaskScheduler
+from persistence import open_journaled
+from server import ServerError, TaskClient, TaskServer
+
+
+class ServerTest(unittest.IsolatedAsyncioTestCase):
+    async def start(self, backend="networkx", scheduler=None, durable=False):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.scheduler = scheduler or TaskScheduler(backend)
+        self.server = TaskServer(self.scheduler, durable)
+        self.path = await self.server.start(os.path.join(directory.name, "tasks.sock"))
+        self.addAsyncCleanup(self.server.close)
+        return await self.connect()
+
+    async def connect(self):
+        client = await TaskClient.connect(self.path)
+        self.addAsyncCleanup(client.close)
+        return client
+
+    def check_ready(self, ready):
+        # The tasks without dependencies, most urgent first; equal keys keep the order they became ready in
+        graph = self.scheduler.graph
+        key = self.scheduler.schedule_key("priority")
+        self.assertCountEqual(ready, [task for task in graph if graph.in_degree(task) == 0])
+        self.assertEqual([key(task) for task in ready], sorted(map(key, ready)))
+
+    async def test_job_queue(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                client = await self.start(backend)
+                await client.call("add_task", task="fetch", priority=2)
+                await client.call("add_task", task="lint", priority=7)
+                await client.call("bulk_add", tasks=[{"task": "build", "dependencies": ["fetch"], "priority": 9},
+                                                     {"task": "ship", "dependencies": ["build", "lint"]}])
+                self.assertEqual(await client.call("ready"), ["lint", "fetch"])
+                # A claimed task is hidden from everyone until it is released or its lease runs out
+                other = await self.connect()
+                self.assertEqual(await client.call("ready", limit=1, claim=True), ["lint"])
+                self.assertEqual(await other.call("ready"), ["fetch"])
+                self.assertTrue(await other.call("release", task="lint"))
+                self.assertEqual(await other.call("ready", claim=True, lease=0), ["lint", "fetch"])
+                self.assertEqual(await client.call("ready"), ["lint", "fetch"])  # the lease has lapsed
+                with self.assertRaisesRegex(ValueError, "is not ready"):
+                    await client.call("complete", task="build")
+                await client.call("complete", task="fetch")
+                self.assertEqual(await client.call("ready"), ["build", "lint"])
+                await client.call("complete", task="build")
+                await client.call("complete", task="lint")
+                self.assertEqual(await client.call("ready"), ["ship"])
+                self.assertEqual(await client.call("stats"), {"version": 6, "tasks": 1, "dependencies": 0,
+                                                              "ready": 1, "claimed": 0})
+                self.assertEqual(list(self.scheduler.graph), ["ship"])
+
+    async def test_reads(self):
+        client = await self.start()
+        await client.call("add_task", task="a", priority=1, deadline="2030-05-01", description="first")
+        await client.call("add_task", task="b", dependencies=["a"], priority=9, duration=2)
+        await client.call("add_task", task="c", priority=5)
+        self.assertEqual(await client.call("get", task="b"), {"dependencies": ["a"], "priority": 9, "deadline": None,
+                                                               "description": None, "duration": 2})
+        self.assertEqual((await client.call("get", task="a"))["deadline"], "2030-05-01")
+        self.assertEqual(await client.call("schedule"), ["c", "a", "b"])
+        self.assertEqual(await client.call("schedule", by="deadline", limit=2), ["a", "b"])
+        await client.call("update_task", task="c", new_name="z", dependencies=["b"])
+        self.assertEqual(await client.call("schedule"), ["a", "b", "z"])
+
+    async def test_errors(self):
+        client = await self.start()
+        await client.call("add_task", task="a")
+        await client.call("add_task", task="b", dependencies=["a"])
+        with self.assertRaises(CycleError) as caught:
+            await client.call("edit_dependencies", task="a", dependencies=["b"])
+        self.assertEqual(caught.exception.cycle, ["b", "a", "b"])
+        with self.assertRaisesRegex(ValueError, "Unknown operation 'nope'"):
+            await client.call("nope")
+        with self.assertRaises(ServerError) as caught:
+            await client.call("get")
+        self.assertEqual(caught.exception.kind, "KeyError")
+        with self.assertRaisesRegex(ValueError, "does not exist"):
+            await client.call("delete_task", task="missing")
+        self.assertEqual(await client.call("ready"), ["a"])  # still serving
+
+    async def test_ready_set_follows_random_writes(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                client = await self.start(backend)
+                rng = random.Random(10)
+                for step in range(300):
+                    names = list(self.scheduler.graph)
+                    choice = rng.random()
+                    try:
+                        if choice < 0.4 or not names:
+                            await client.call("add_task", task=f"t{step}", priority=rng.choice([None, 1, 5, 9]),
+                                              dependencies=rng.sample(names, min(len(names), rng.randint(0, 2))))
+                        elif choice < 0.55:
+                            ready = await client.call("ready")
+                            await client.call("complete", task=rng.choice(ready))
+                        elif choice < 0.65:
+                            await client.call("delete_task", task=rng.choice(names))
+                        elif choice < 0.75:
+                            await client.call("set_priority", task=rng.choice(names), priority=rng.randint(0, 10))
+                        elif choice < 0.85:
+                            await client.call("edit_dependencies", task=rng.choice(names),
+                                              dependencies=rng.sample(names, min(len(names), 2)))
+                        else:
+                            task = rng.choice(names)
+                            await client.call("update_task", task=task, new_name=f"{task}r", deadline="2031-02-02")
+                    except CycleError:
+                        pass
+                    self.check_ready(await client.call("ready"))
+
+    async def test_pipelined_writes_and_reads(self):
+        client = await self.start()
+        other = await self.connect()
+        writes = [client.call("add_task", task=f"x{i}", priority=i % 10) for i in range(500)]
+        reads = [other.call("stats") for _ in range(50)]
+        results = await asyncio.gather(*writes, *reads)
+        self.assertEqual(results[:500], [True] * 500)
+        counts = [stats["tasks"] for stats in results[500:]]
+        self.assertEqual(counts, sorted(counts))  # reads see whole batches, in order
+        self.assertEqual((await client.call("stats"))["tasks"], 500)
+        self.assertEqual(len(await client.call("ready", limit=10)), 10)
+
+    async def test_durable_writes_are_journaled(self):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot = os.path.join(directory, "tasks.snap")
+            journal = os.path.join(directory, "tasks.journal")
+            scheduler = open_journaled(TaskScheduler(), snapshot, journal)
+            client = await self.start(scheduler=scheduler, durable=True)
+            await asyncio.gather(*[client.call("add_task", task=f"t{i}") for i in range(20)])
+            await client.call("complete", task="t0")
+            restored = open_journaled(TaskScheduler(), snapshot, journal, read_only=True)
+            self.assertEqual(state(restored), state(scheduler))
+            scheduler.journal.close()
+
+    async def test_invalid_writes_are_rejected_before_any_change(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                client = await self.start(backend)
+                await client.call("add_task", task="a")
+                await client.call("add_task", task="b")
+                before = state(self.scheduler)
+                invalid = [
+                    ("add_task", {"task": "c", "dependencies": "ab"}),
+                    ("add_task", {"task": "c", "dependencies": ["a", 1]}),
+                    ("add_task", {"task": "c", "priority": 11}),
+                    ("add_task", {"task": "c", "duration": -1}),
+                    ("add_task", {"task": 5}),
+                    ("bulk_add", {"tasks": [{"task": "c"}, {"task": "d", "dependencies": "c"}]}),
+                    ("edit_dependencies", {"task": "b", "dependencies": "a"}),
+                    ("update_task", {"task": "b", "dependencies": "a", "priority": 3}),
+                ]
+                for op, args in invalid:
+                    with self.assertRaises(ValueError, msg=f"{op} {args}"):
+                        await client.call(op, **args)
+                self.assertEqual(state(self.scheduler), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
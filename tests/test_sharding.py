@@ -0,0 +1,84 @@
+"""Sharded scheduling: split results agree with the serial ones."""
+import random
+import unittest
+from unittest import mock
+
+from support import BACKENDS, add_random_tasks, check_greedy, check_order
+
+import sharding
+from PaythonDraft_01 import TaskScheduler
+from sharding import pack, run_sharded, shard
+
+
+def projects(backend, count=6, size=40, seed=8):
+    # count independent projects, each a random DAG of size tasks named "<project>/<n>"
+    rng = random.Random(seed)
+    scheduler = TaskScheduler(backend)
+    for project in range(count):
+        names = []
+        for n in range(size):
+            name = f"p{project}/{n}"
+            scheduler.add_task(name, rng.sample(names, min(len(names), rng.randint(0, 2))), rng.randint(0, 10),
+                               f"2030-0{rng.randint(1, 9)}-01" if rng.random() < 0.5 else None)
+            names.append(name)
+    return scheduler
+
+
+class ShardTest(unittest.TestCase):
+    def test_components_and_partitions(self):
+        scheduler = TaskScheduler()
+        for task, dependencies in (("a", []), ("b", ["a"]), ("c", []), ("d", ["c"]), ("e", [])):
+            scheduler.add_task(task, dependencies)
+        self.assertEqual(sorted(map(sorted, shard(scheduler))), [["a", "b"], ["c", "d"], ["e"]])
+        # A dependency between two partitions joins them; tasks without one stand alone
+        partitions = {"a": "x", "b": "y", "c": "y", "d": "z"}
+        self.assertEqual(sorted(map(sorted, shard(scheduler, partitions))), [["a", "b", "c", "d"], ["e"]])
+
+    def test_pack_balances_batches(self):
+        batches = pack([list(range(size)) for size in (5, 4, 3, 3, 1)], 2)
+        self.assertEqual(sorted(map(len, batches)), [8, 8])
+        self.assertEqual(pack([[1]], 3), [[1]])
+
+
+class RunShardedTest(unittest.TestCase):
+    def test_split_results_match_serial(self):
+        for backend in BACKENDS:
+            for by in ("priority", "deadline"):
+                with self.subTest(backend=backend, by=by):
+                    scheduler = projects(backend)
+                    with mock.patch.object(sharding, "SHARD_MIN_TASKS", 0):
+                        result = run_sharded(scheduler, by, workers=2)
+                    self.assertGreater(result.shards, 1)
+                    self.assertEqual(result.cycle, [])
+                    check_order(self, scheduler, result.order)
+                    # Ties may break differently between batches, so the schedule is checked step by step
+                    check_greedy(self, scheduler, result.schedule, scheduler.schedule_key(by))
+                    check_greedy(self, scheduler, scheduler.schedule(by), scheduler.schedule_key(by))
+
+    def test_unsplit_run_is_the_serial_result(self):
+        scheduler = TaskScheduler("compact")
+        add_random_tasks(scheduler, random.Random(9), 300)
+        result = scheduler.sharded_schedule(workers=2)  # under SHARD_MIN_TASKS: not split
+        self.assertEqual(result.shards, 1)
+        self.assertEqual(result.schedule, scheduler.schedule())
+        self.assertEqual(result.order, scheduler.topological_sort())
+
+    def test_cycle_in_one_project(self):
+        scheduler = projects("networkx")
+        scheduler.graph.add_edge("p3/39", "p3/0")
+        scheduler.graph.add_edge("p3/0", "p3/39")
+        scheduler.invalidate_order()
+        with mock.patch.object(sharding, "SHARD_MIN_TASKS", 0):
+            result = run_sharded(scheduler, workers=2)
+        self.assertIsNone(result.schedule)
+        self.assertEqual(result.cycle[0], result.cycle[-1])
+        for u, v in zip(result.cycle, result.cycle[1:]):
+            self.assertTrue(scheduler.graph.has_edge(u, v))
+
+    def test_unknown_key_is_refused(self):
+        with self.assertRaises(ValueError):
+            run_sharded(projects("networkx", count=1), by="size")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Transactions: a failed block is undone completely, a committed one is kept."""
+import json
+import os
+import random
+import tempfile
+import unittest
+from datetime import date
+
+from support import (BACKENDS, FIRST_DAY, CycleError, add_random_tasks, check_maintained_order, check_order,
+                     random_edit, state)
+
+from PaythonDraft_01 import TaskScheduler
+from persistence import open_journaled
+
+
+def reads(scheduler):
+    # The reads backed by an index or a memoized result, so a rollback that misses one shows up.
+    # A task restored by the undo is re-added at the end of the graph, so ties are compared as sets.
+    tasks = sorted(scheduler.graph)
+    by_deadline = scheduler.sort_by_deadline()
+    return (sorted(scheduler.topological_sort()), sorted(scheduler.schedule()),
+            [scheduler.get_deadline_key(task) for task in by_deadline], sorted(by_deadline),
+            scheduler.due_before(FIRST_DAY.replace(month=7)), scheduler.next_due(5, FIRST_DAY),
+            {task: (scheduler.ancestors(task), scheduler.descendants(task)) for task in tasks},
+            scheduler.depends_on(tasks[-1], tasks[0]))
+
+
+class RollbackTest(unittest.TestCase):
+    def test_failed_block_restores_graph_order_and_indexes(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                rng = random.Random(3)
+                scheduler = TaskScheduler(backend)
+                add_random_tasks(scheduler, rng, 40)
+                for _ in range(30):
+                    before = state(scheduler)
+                    expected = reads(scheduler)
+                    with self.assertRaises(RuntimeError):
+                        with scheduler.transaction():
+                            for _ in range(rng.randint(1, 8)):
+                                random_edit(scheduler, rng)
+                            raise RuntimeError("abandon the block")
+                    self.assertEqual(state(scheduler), before)
+                    self.assertEqual(reads(scheduler), expected)
+                    check_order(self, scheduler, scheduler.topological_sort())
+                    check_order(self, scheduler, scheduler.schedule())
+                    self.assertEqual(scheduler.schedule(), list(scheduler.iter_schedule()))
+                    check_maintained_order(self, scheduler)
+                    random_edit(scheduler, rng)  # the indexes keep working after the rollback
+
+    def test_cycle_found_at_commit_rolls_back(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                scheduler.add_task("a", priority=1)
+                scheduler.add_task("b", priority=2)
+                scheduler.add_task("c", ["b"])
+                before = state(scheduler)
+                expected = reads(scheduler)
+                with self.assertRaises(CycleError) as caught:
+                    with scheduler.transaction():
+                        scheduler.edit_dependencies("a", ["c"])
+                        scheduler.edit_dependencies("b", ["a"])  # only a cycle together with the edit above
+                        scheduler.set_priority("a", 9)
+                self.assertCountEqual(caught.exception.cycle[:-1], ["a", "b", "c"])
+                self.assertEqual(state(scheduler), before)
+                self.assertEqual(reads(scheduler), expected)
+                check_maintained_order(self, scheduler)
+
+    def test_committed_block_is_kept(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                scheduler.add_task("a")
+                scheduler.add_task("b")
+                with scheduler.transaction():
+                    scheduler.edit_dependencies("b", ["a"])
+                    with scheduler.transaction():  # nested blocks join the outer one
+                        scheduler.add_task("c", ["b"], priority=4)
+                    scheduler.ETN("a", "first")
+                self.assertEqual(scheduler.topological_sort(), ["first", "b", "c"])
+                self.assertEqual(scheduler.task_details["c"]["priority"], 4)
+                self.assertEqual(scheduler.ancestors("c"), {"first", "b"})
+                check_maintained_order(self, scheduler)
+
+    def test_failed_nested_block_undoes_the_outer_one(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                scheduler.add_task("a")
+                before = state(scheduler)
+                with self.assertRaises(RuntimeError):
+                    with scheduler.transaction():
+                        scheduler.add_task("b", ["a"])
+                        with scheduler.transaction():
+                            scheduler.set_priority("a", 7)
+                            raise RuntimeError("abandon the block")
+                self.assertEqual(state(scheduler), before)
+                self.assertEqual(scheduler.topological_sort(), ["a"])
+
+
+class UpdateTaskTest(unittest.TestCase):
+    def test_rejected_update_changes_nothing(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                scheduler = TaskScheduler(backend)
+                scheduler.add_task("a")
+                scheduler.add_task("b", ["a"])
+                scheduler.topological_sort()
+                before = state(scheduler)
+                with self.assertRaises(CycleError):
+                    scheduler.update_task("a", "first", dependencies=["b"], priority=5)
+                self.assertEqual(state(scheduler), before)
+                scheduler.update_task("b", "second", dependencies=[], priority=5, deadline="2030-01-01")
+                self.assertEqual(state(scheduler)["second"], ([], 5, date(2030, 1, 1), None, None))
+                check_maintained_order(self, scheduler)  # kept up to date, not dropped
+
+    def test_update_is_journaled_as_one_block(self):
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot = os.path.join(directory, "tasks.snap")
+            journal = os.path.join(directory, "tasks.journal")
+            scheduler = open_journaled(TaskScheduler(), snapshot, journal)
+            scheduler.add_task("a")
+            scheduler.add_task("b")
+            expected = state(scheduler)
+            scheduler.update_task("b", "c", dependencies=["a"], priority=4, description="renamed")
+            scheduler.journal.close()
+            with open(journal, encoding="utf-8") as f:
+                records = [json.loads(line) for line in f][3:]
+            self.assertEqual([record[0] for record in records],
+                             ["begin", "edit_dependencies", "set", "set", "ETN", "commit"])
+            # Cut short before the commit, none of the update is replayed
+            with open(journal, "r+", encoding="utf-8") as f:
+                lines = f.readlines()
+                f.seek(0)
+                f.truncate()
+                f.writelines(lines[:-2])
+            restored = open_journaled(TaskScheduler(), snapshot, journal, read_only=True)
+            self.assertEqual(state(restored), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""The benchmark workloads and the baseline comparison of bench_suite.py."""
+import os
+import sys
+import unittest
+
+import networkx as nx
+
+from support import BACKENDS, ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from bench_suite import compare, run_workload
+from workloads import WORKLOADS, chain, fan_out, layered, plant_cycles, planted_edges, random_dag
+
+from PaythonDraft_01 import TaskScheduler
+
+
+def as_networkx(records):
+    graph = nx.DiGraph()
+    for record in records:
+        graph.add_node(record["task"])
+        graph.add_edges_from((dependency, record["task"]) for dependency in record["dependencies"])
+    return graph
+
+
+class WorkloadTest(unittest.TestCase):
+    def test_generators_are_deterministic_dags_in_dependency_order(self):
+        for name, generate in WORKLOADS.items():
+            with self.subTest(workload=name):
+                records = generate(500, seed=3)
+                self.assertEqual(records, generate(500, seed=3))
+                self.assertNotEqual(records, generate(500, seed=4))
+                self.assertEqual(len({record["task"] for record in records}), 500)
+                seen = set()
+                for record in records:
+                    self.assertLessEqual(set(record["dependencies"]), seen, record["task"])
+                    self.assertEqual(len(record["dependencies"]), len(set(record["dependencies"])))
+                    seen.add(record["task"])
+
+    def test_shapes(self):
+        self.assertEqual(nx.dag_longest_path_length(as_networkx(chain(300))), 299)
+        fan = as_networkx(fan_out(300))
+        self.assertEqual(fan.out_degree("task-0"), 299)
+        self.assertEqual(nx.dag_longest_path_length(fan), 1)
+        pipeline = as_networkx(layered(400))
+        self.assertEqual(nx.dag_longest_path_length(pipeline), 19)  # 20 stages of 20
+        self.assertTrue(all(degree >= 1 for task, degree in pipeline.in_degree() if int(task[5:]) >= 20))
+
+    def test_planted_edges_close_cycles(self):
+        records = random_dag(1000, seed=2)
+        edges = planted_edges(records, cycles=10, seed=2)
+        self.assertEqual(len(edges), 10)
+        graph = as_networkx(records)
+        for task, ancestor in edges:
+            self.assertIn(ancestor, nx.ancestors(graph, task))
+        scheduler = TaskScheduler()
+        scheduler.bulk_add(records)
+        plant_cycles(scheduler, edges)
+        has_cycle, cycle = scheduler.detect_cycle()
+        self.assertTrue(has_cycle)
+        for u, v in zip(cycle, cycle[1:]):
+            self.assertTrue(scheduler.graph.has_edge(u, v))
+
+
+class SuiteTest(unittest.TestCase):
+    def test_every_operation_is_timed(self):
+        for backend in BACKENDS:
+            with self.subTest(backend=backend):
+                timings = run_workload("layered", 200, backend, repeat=1, seed=0)
+                self.assertEqual(set(timings), {"add_task", "detect_cycle", "topological_sort", "STBP",
+                                                "sort_by_deadline", "ETN", "delete_task", "delete_task_unread"})
+                self.assertEqual(timings["add_task"][1], 200)
+                self.assertEqual(timings["delete_task"][1], 100)
+                cyclic = run_workload("cyclic", 200, backend, repeat=1, seed=0)
+                self.assertEqual(set(cyclic), {"add_task", "reject_cycle", "detect_cycle"})
+
+    def test_compare_flags_slowdowns_over_the_floor(self):
+        def result(operation, seconds):
+            return {"workload": "chain", "size": 1000, "backend": "networkx", "operation": operation,
+                    "calls": 1, "seconds": seconds, "seconds_per_call": seconds}
+
+        baseline = {"results": [result("STBP", 0.010), result("ETN", 0.010), result("noise", 0.0001)]}
+        results = [result("STBP", 0.020), result("ETN", 0.011), result("noise", 0.0005), result("new", 1.0)]
+        regressions = compare(results, baseline, tolerance=0.25, floor=0.001)
+        self.assertEqual([entry["operation"] for entry in regressions], ["STBP"])
+        self.assertAlmostEqual(regressions[0]["ratio"], 2.0)
+        self.assertAlmostEqual(results[1]["ratio"], 1.1)
+        self.assertNotIn("ratio", results[2])
+
+
+if __name__ == "__main__":
+    unittest.main()